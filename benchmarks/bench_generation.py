@@ -0,0 +1,217 @@
+"""Benchmark del camino de generación con umbral de regresión.
+
+Mide PasswordBuilder.build y PasswordGenerator.generate para varias longitudes
+y las 16 combinaciones de clases, los bytes del CSPRNG usados por contraseña,
+la memoria máxima de las generaciones masivas y el rendimiento masivo con
+cada generador aleatorio (reserva del SO y SeededStream, ver utils.rng). Escribe los resultados en JSON
+y, si hay una línea base, falla cuando el rendimiento cae más del umbral.
+
+Uso: python -m benchmarks.bench_generation [--output resultados.json]
+     [--baseline benchmarks/baseline.json] [--threshold 0.25] [--update-baseline]
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from utils.entropy_pool import EntropyPool, get_default_pool
+from utils.password_generator import PasswordBuilder, PasswordGenerator
+from utils.rng import SeededStream
+
+DEFAULT_LENGTHS = (4, 16, 64, 256, 1024, 4096)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+BULK_COUNT = 100_000
+BULK_LENGTH = 16
+# Mediciones de cada caso; se informa la más rápida
+REPEAT = 3
+
+# (símbolos, números, mayúsculas, minúsculas) en el orden de generate()
+COMBINATIONS = list(itertools.product((True, False), repeat=4))
+
+
+def combination_name(flags) -> str:
+    """Nombre corto de una combinación, p. ej. 'S-U-' para símbolos y mayúsculas."""
+    return "".join(letter if used else "-" for letter, used in zip("SNUL", flags))
+
+
+def measure_rate(func: Callable[[], object], min_time: float, repeat: int = REPEAT) -> float:
+    """Devuelve las llamadas por segundo de func, la mejor de repeat mediciones de al menos min_time.
+
+    Como timeit, se toma la más rápida: las más lentas solo miden
+    interrupciones de otros procesos y harían saltar el umbral sin motivo.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        batch = 1
+        start = time.perf_counter()
+        while True:
+            for _ in range(batch):
+                func()
+            calls += batch
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+            batch *= 2
+        best = max(best, calls / elapsed)
+    return best
+
+
+def bench_build(length: int, flags, min_time: float) -> Dict[str, float]:
+    use_symbols, use_numbers, use_uppercase, use_lowercase = flags
+    pool = EntropyPool()
+
+    def build():
+        builder = PasswordBuilder(length, pool)
+        if use_lowercase:
+            builder.add_lowercase()
+        if use_uppercase:
+            builder.add_uppercase()
+        if use_numbers:
+            builder.add_numbers()
+        if use_symbols:
+            builder.add_symbols()
+        return builder.build()
+
+    rate = measure_rate(build, min_time)
+    return {"ops_per_sec": rate, "bytes_per_password": pool.stats()["bytes_per_password"]}
+
+
+def bench_generate(length: int, flags, min_time: float) -> Dict[str, float]:
+    pool = get_default_pool()
+    pool.reset_stats()
+    rate = measure_rate(lambda: PasswordGenerator.generate(length, *flags), min_time)
+    return {"ops_per_sec": rate, "bytes_per_password": pool.stats()["bytes_per_password"]}
+
+
+def bench_memory(count: int, length: int) -> Dict[str, float]:
+    """Memoria máxima (en bytes) de una generación masiva en lista y en streaming."""
+    results = {}
+    runs = {
+        "generate_batch": lambda: PasswordGenerator.generate_batch(count, length, True, True, True, True),
+        "iter_chunks": lambda: sum(len(chunk) for chunk in PasswordGenerator.iter_chunks(
+            count, length, True, True, True, True)),
+    }
+    for name, run in runs.items():
+        tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {"peak_bytes": peak, "passwords_per_sec": count / elapsed}
+    return results
+
+
+def bench_backends(count: int, length: int) -> Dict[str, Dict[str, float]]:
+    """Contraseñas por segundo de una generación masiva con cada generador aleatorio.
+
+    "bulk" lee bytes en bloques grandes; "no_repeat" pide un randbelow() por
+    carácter, donde más se nota el coste de cada llamada al generador.
+    """
+    results = {}
+    backends = {"system": EntropyPool, "seeded": lambda: SeededStream(0)}
+    runs = {
+        "bulk": lambda pool: PasswordGenerator.generate_arena(
+            count, length, True, True, True, True, pool=pool).wipe(),
+        "no_repeat": lambda pool: sum(len(chunk) for chunk in PasswordGenerator.iter_chunks(
+            count, length, True, True, True, True, pool=pool, no_repeat=True)),
+    }
+    for backend, create in backends.items():
+        results[backend] = {}
+        for name, run in runs.items():
+            start = time.perf_counter()
+            run(create())
+            results[backend][f"{name}_passwords_per_sec"] = count / (time.perf_counter() - start)
+    return results
+
+
+def run_benchmarks(lengths: List[int], min_time: float, bulk_count: int) -> Dict:
+    throughput = {}
+    for length in lengths:
+        for flags in COMBINATIONS:
+            if not any(flags):
+                # Sin clases no hay contraseña posible; se comprueba que siga fallando
+                try:
+                    PasswordGenerator.generate(length, *flags)
+                except ValueError:
+                    continue
+                raise AssertionError("generate() aceptó una combinación sin clases")
+            key = f"{length}/{combination_name(flags)}"
+            throughput[f"build/{key}"] = bench_build(length, flags, min_time)
+            throughput[f"generate/{key}"] = bench_generate(length, flags, min_time)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "min_time": min_time,
+        },
+        "throughput": throughput,
+        "memory": bench_memory(bulk_count, BULK_LENGTH),
+        "backends": bench_backends(bulk_count, BULK_LENGTH),
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Devuelve las mediciones cuyo rendimiento cayó más de threshold respecto a la base."""
+    regressions = []
+    for key, base in baseline.get("throughput", {}).items():
+        current = results["throughput"].get(key)
+        if current is None:
+            continue
+        if current["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{key}: {current['ops_per_sec']:,.0f} ops/s "
+                               f"(base {base['ops_per_sec']:,.0f} ops/s)")
+    for key, base in baseline.get("memory", {}).items():
+        current = results["memory"].get(key)
+        if current is not None and current["peak_bytes"] > base["peak_bytes"] * (1 + threshold):
+            regressions.append(f"memoria {key}: {current['peak_bytes']:,} bytes "
+                               f"(base {base['peak_bytes']:,} bytes)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(DEFAULT_LENGTHS))
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="segundos mínimos por medición (por defecto: 0.05)")
+    parser.add_argument("--bulk-count", type=int, default=BULK_COUNT)
+    parser.add_argument("--output", help="archivo JSON de resultados (por defecto: salida estándar)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="caída relativa tolerada (por defecto: 0.25)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="guardar los resultados como nueva línea base")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.lengths, args.min_time, args.bulk_count)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            f.write(text + "\n")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No hay línea base; no se comprueban regresiones.", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print(f"REGRESIÓN {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""Mide cómo escala la generación en paralelo de 1 a N procesos.
+
+Uso: python -m benchmarks.bench_parallel [--count 10000000] [--length 16] [--max-workers N]
+"""
+import argparse
+import os
+import time
+
+from utils.parallel_generator import iter_parallel_blocks
+
+
+def measure(count: int, length: int, workers: int) -> float:
+    """Devuelve las contraseñas por segundo generadas con workers procesos."""
+    start = time.perf_counter()
+    for _ in iter_parallel_blocks(count, length, True, True, True, True, workers=workers):
+        pass
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10_000_000)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'procesos':>8} {'contraseñas/s':>14} {'aceleración':>12}")
+    for workers in range(1, args.max_workers + 1):
+        rate = measure(args.count, args.length, workers)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>14,.0f} {rate / baseline:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Cliente de carga para utils.service: mide latencias p50/p99 y peticiones por segundo.
+
+Uso: python -m benchmarks.service_load [--unix RUTA | --port PUERTO]
+     [--clients 50] [--requests 200] [--length 16] [--count 1]
+
+Sin --unix ni --port arranca el servicio en el mismo proceso, sobre un
+puerto local libre.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from utils.service import GenerationService
+
+
+async def run_client(open_connection, requests: int, payload: bytes, latencies: List[float]) -> None:
+    reader, writer = await open_connection()
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            writer.write(payload)
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            if "error" in response:
+                raise RuntimeError(response["error"])
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = None
+    if args.unix:
+        open_connection = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        port = args.port
+        if port is None:
+            server = await GenerationService().start(port=0)
+            port = server.sockets[0].getsockname()[1]
+        open_connection = lambda: asyncio.open_connection("127.0.0.1", port)
+
+    payload = json.dumps({"length": args.length, "count": args.count}).encode() + b"\n"
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(open_connection, args.requests, payload, latencies)
+                           for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    print(f"peticiones: {len(latencies)}  en {elapsed:.2f} s")
+    print(f"peticiones/s: {len(latencies) / elapsed:,.0f}")
+    print(f"p50: {percentile(latencies, 0.50) * 1000:.2f} ms  "
+          f"p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--unix")
+    target.add_argument("--port", type=int)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--count", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
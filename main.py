@@ -1,5 +1,13 @@
-from ui.password_generator_ui import PasswordGeneratorUI
+import sys
 
 if __name__ == "__main__":
-    app = PasswordGeneratorUI()
+    if "--profile-startup" in sys.argv:
+        from ui.startup_profiler import profile_startup
+        profile_startup(json_output="--json" in sys.argv)
+        sys.exit(0)
+
+    # Importación diferida: la medición del arranque debe incluir la interfaz
+    from ui.password_generator_ui import PasswordGeneratorUI
+
+    app = PasswordGeneratorUI(deferred=True)
     app.run()
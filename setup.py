@@ -2,7 +2,15 @@ from cx_Freeze import setup, Executable
 
 # Opciones de construcción
 build_exe_options = {
-    "packages": ["customtkinter", "ui", "utils"],  # Agrega las bibliotecas necesarias
+    # customtkinter carga sus temas desde archivos del paquete; ui y utils se
+    # detectan a partir de main.py, incluidas las importaciones diferidas
+    "packages": ["customtkinter"],
+    # Módulos que arrastra el análisis pero que la aplicación no usa
+    "excludes": ["unittest", "pydoc", "doctest", "pdb", "test", "tkinter.test",
+                 "lib2to3", "distutils", "setuptools", "pytest", "benchmarks"],
+    # Los módulos comprimidos en library.zip arrancan antes en discos lentos
+    "zip_include_packages": ["*"],
+    "zip_exclude_packages": ["customtkinter"],
     "include_files": [],  # Agrega archivos adicionales si es necesario
 }
 
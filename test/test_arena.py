@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from utils.arena import PasswordArena, wipe
+from utils.password_generator import PasswordGenerator
+
+
+class TestPasswordArena(unittest.TestCase):
+
+    def test_fixed_slots(self):
+        """Verifies that fixed-stride slots are exposed as views without the separator."""
+        arena = PasswordArena.fixed(3, 4)
+        arena.write_block(0, bytearray(b"abcdefghijkl"), 4)
+        self.assertEqual(bytes(arena.buffer), b"abcd\nefgh\nijkl\n")
+        self.assertEqual([bytes(view) for view in arena], [b"abcd", b"efgh", b"ijkl"])
+        self.assertEqual(bytes(arena[-1]), b"ijkl")
+        with self.assertRaises(IndexError):
+            arena[3]
+        with self.assertRaises(IndexError):
+            arena.write_block(2, b"abcdefgh", 4)
+
+    def test_views_share_the_buffer(self):
+        """Verifies that wiping zeroes the buffer seen through previously returned views."""
+        arena = PasswordArena.fixed(2, 3, separator=b"\r\n")
+        arena.write_block(0, b"abcdef", 3)
+        view = arena[1]
+        with arena:
+            self.assertEqual(bytes(view), b"def")
+        self.assertEqual(bytes(view), bytes(3))
+        self.assertEqual(arena.buffer, bytearray(10))
+
+    def test_wipe_other_buffers(self):
+        """Verifies that wipe() accepts any writable buffer and keeps its size."""
+        buffer = bytearray(b"x" * 100000)
+        wipe(buffer)
+        self.assertEqual(buffer, bytearray(100000))
+
+
+class TestGenerateArena(unittest.TestCase):
+
+    def test_passwords_follow_the_policy(self):
+        """Verifies that arena passwords have the requested length and classes."""
+        arena = PasswordGenerator.generate_arena(500, 10, False, True, True, False,
+                                                 chunk_size=64, min_numbers=3)
+        self.assertEqual(len(arena), 500)
+        self.assertEqual(len(arena.buffer), 500 * 11)
+        for view in arena:
+            password = bytes(view).decode("ascii")
+            self.assertEqual(len(password), 10)
+            self.assertGreaterEqual(sum(c.isdigit() for c in password), 3)
+            self.assertTrue(any(c.isupper() for c in password))
+        self.assertEqual(len(set(bytes(view) for view in arena)), 500)
+
+    def test_passphrase_offsets(self):
+        """Verifies that passphrases of different lengths get offset-indexed slots."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, "w") as f:
+                f.write("a\nbb\nccc\ndddd\n")
+            arena = PasswordGenerator.generate_passphrase_arena(20, 3, "-", path)
+            lines = bytes(arena.view()).decode("utf-8").splitlines()
+            self.assertEqual([bytes(view).decode("utf-8") for view in arena], lines)
+            for line in lines:
+                self.assertEqual(len(line.split("-")), 3)
+                self.assertTrue(set(line.split("-")) <= {"a", "bb", "ccc", "dddd"})
+            arena.wipe()
+            self.assertFalse(any(arena.buffer))
+
+    def test_empty_arena(self):
+        """Verifies that zero passwords produce an empty arena and negatives are rejected."""
+        self.assertEqual(len(PasswordGenerator.generate_arena(0, 8, True, True, True, True)), 0)
+        with self.assertRaises(ValueError):
+            PasswordGenerator.generate_arena(-1, 8, True, True, True, True)
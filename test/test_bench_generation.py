@@ -0,0 +1,35 @@
+import unittest
+from benchmarks.bench_generation import COMBINATIONS, combination_name, compare, run_benchmarks
+
+
+class TestBenchGeneration(unittest.TestCase):
+
+    def test_all_sixteen_combinations_are_covered(self):
+        """Verifies that every character-class combination is enumerated."""
+        self.assertEqual(len(COMBINATIONS), 16)
+        self.assertEqual(combination_name((True, False, True, False)), "S-U-")
+
+    def test_run_benchmarks_reports_throughput_bytes_and_memory(self):
+        """Verifies the shape of a minimal benchmark run."""
+        results = run_benchmarks([4], min_time=0.001, bulk_count=100)
+        self.assertEqual(len(results["throughput"]), 2 * 15)
+        entry = results["throughput"]["generate/4/SNUL"]
+        self.assertGreater(entry["ops_per_sec"], 0)
+        self.assertGreater(entry["bytes_per_password"], 0)
+        self.assertGreater(results["memory"]["generate_batch"]["peak_bytes"], 0)
+        self.assertEqual(set(results["backends"]), {"system", "seeded"})
+        self.assertGreater(results["backends"]["seeded"]["no_repeat_passwords_per_sec"], 0)
+
+    def test_compare_flags_only_regressions_beyond_threshold(self):
+        """Verifies that slowdowns within the threshold pass and larger ones fail."""
+        baseline = {"throughput": {"a": {"ops_per_sec": 100}, "b": {"ops_per_sec": 100}},
+                    "memory": {"m": {"peak_bytes": 1000}}}
+        results = {"throughput": {"a": {"ops_per_sec": 80}, "b": {"ops_per_sec": 60}},
+                   "memory": {"m": {"peak_bytes": 1100}}}
+        regressions = compare(results, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("b:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+from utils.breach import BreachCorpus, build_index, main, password_hash
+from utils.password_generator import PasswordGenerator
+from utils.password_generator import main as generator_main
+
+
+def write_corpus(path, counts):
+    """Writes a corpus in HIBP 'ordered by hash' format."""
+    lines = sorted(f"{password_hash(p).decode()}:{n}" for p, n in counts.items())
+    with open(path, "w", newline="") as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+
+class TestBreachCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "pwned.txt")
+        self.counts = {f"pass{i}": i + 1 for i in range(500)}
+        write_corpus(self.path, self.counts)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookup_without_index(self):
+        """Verifies that binary search finds every listed password and rejects others."""
+        with BreachCorpus(self.path) as corpus:
+            self.assertFalse(corpus.indexed)
+            for password, count in self.counts.items():
+                self.assertEqual(corpus.count(password), count)
+            self.assertNotIn("not-in-corpus", corpus)
+
+    def test_lookup_with_prefix_index(self):
+        """Verifies that the prefix index gives the same answers."""
+        build_index(self.path, digits=2)
+        with BreachCorpus(self.path) as corpus:
+            self.assertTrue(corpus.indexed)
+            self.assertEqual(corpus.count("pass42"), 43)
+            self.assertEqual(corpus.count("pass-42"), 0)
+            self.assertEqual(corpus.count_hash(password_hash("pass7").decode().lower()), 8)
+
+    def test_stale_index_is_ignored(self):
+        """Verifies that an index built for another version of the file is not used."""
+        build_index(self.path, digits=1)
+        write_corpus(self.path, {"other": 1})
+        with BreachCorpus(self.path) as corpus:
+            self.assertFalse(corpus.indexed)
+            self.assertIn("other", corpus)
+
+    def test_bulk_lookup_keeps_input_order(self):
+        """Verifies that the sorted single-pass bulk lookup matches single lookups."""
+        build_index(self.path, digits=2)
+        candidates = ["pass3", "nope", "pass499", "pass0", "also-nope", "pass3"]
+        with BreachCorpus(self.path) as corpus:
+            self.assertEqual(corpus.count_many(candidates), [4, 0, 500, 1, 0, 4])
+            self.assertEqual(corpus.filter_safe(candidates), ["nope", "also-nope"])
+
+    def test_command_line(self):
+        """Verifies that the CLI prints the breach count of each input line."""
+        output = io.StringIO()
+        with patch("sys.stdin", io.StringIO("pass1\nfresh\n")), redirect_stdout(output):
+            self.assertEqual(main([self.path]), 0)
+        self.assertEqual(output.getvalue().splitlines(), ["2\tpass1", "0\tfresh"])
+
+
+class TestGeneratorBlocklist(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "pins.txt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_breached_passwords_are_regenerated(self):
+        """Verifies that only passwords outside the corpus are returned."""
+        allowed = {f"{i:04d}" for i in range(0, 10000, 10)}
+        write_corpus(self.path, {f"{i:04d}": 1 for i in range(10000) if f"{i:04d}" not in allowed})
+        with BreachCorpus(self.path) as corpus:
+            passwords = PasswordGenerator.generate_batch(20, 4, False, True, False, False,
+                                                         blocklist=corpus)
+            self.assertTrue(set(passwords) <= allowed)
+            self.assertIn(PasswordGenerator.generate(4, False, True, False, False,
+                                                     blocklist=corpus), allowed)
+
+    def test_single_password_checks_one_candidate(self):
+        """Verifies that a single password only hashes and looks up the candidates it needs."""
+        write_corpus(self.path, {"0000": 1})
+        with BreachCorpus(self.path) as corpus, \
+                patch.object(corpus, "count_many", wraps=corpus.count_many) as count_many:
+            PasswordGenerator.generate(16, True, True, True, True, blocklist=corpus)
+        self.assertEqual(len(count_many.call_args.args[0]), 1)
+
+    def test_fully_breached_policy_fails(self):
+        """Verifies that a policy whose every password is breached raises ValueError."""
+        write_corpus(self.path, {f"{i:02d}": 1 for i in range(100)})
+        with BreachCorpus(self.path) as corpus:
+            with self.assertRaises(ValueError):
+                PasswordGenerator.generate(2, False, True, False, False, blocklist=corpus)
+
+    def test_other_modes_reject_breach_corpus(self):
+        """Verifies that --breach-corpus is refused where it would not be applied."""
+        write_corpus(self.path, {"0000": 1})
+        for mode in (["--template", "9999"], ["--passphrase"], ["--pronounceable"]):
+            with self.subTest(mode=mode[0]):
+                stderr = io.StringIO()
+                with self.assertRaises(SystemExit), redirect_stderr(stderr):
+                    generator_main(mode + ["--breach-corpus", self.path])
+                self.assertIn("--breach-corpus", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import threading
+import unittest
+from unittest.mock import patch
+from utils.entropy_pool import EntropyPool, get_default_pool
+
+
+class TestEntropyPool(unittest.TestCase):
+
+    def test_read_returns_requested_size(self):
+        """Verifies that reads return exactly the requested number of bytes, also across refills."""
+        pool = EntropyPool(block_size=128, refill_threshold=16)
+        for n in (1, 50, 100, 500):
+            self.assertEqual(len(pool.read(n)), n)
+
+    def test_small_reads_share_one_syscall(self):
+        """Verifies that many small reads are served from a single OS block."""
+        pool = EntropyPool(block_size=4096)
+        for _ in range(100):
+            pool.read(8)
+        stats = pool.stats()
+        self.assertEqual(stats["syscalls"], 1)
+        self.assertEqual(stats["syscalls_saved"], 99)
+        self.assertEqual(stats["bytes_consumed"], 800)
+
+    def test_bytes_per_password(self):
+        """Verifies that consumption is reported per recorded password."""
+        pool = EntropyPool()
+        pool.read(30)
+        pool.record_passwords(3)
+        self.assertEqual(pool.stats()["bytes_per_password"], 10)
+        pool.reset_stats()
+        self.assertEqual(pool.stats()["bytes_consumed"], 0)
+
+    def test_randbelow_and_choice_stay_in_range(self):
+        """Verifies that bounded draws never leave their range."""
+        pool = EntropyPool()
+        self.assertTrue(all(0 <= pool.randbelow(7) < 7 for _ in range(1000)))
+        self.assertEqual(pool.randbelow(1), 0)
+        self.assertIn(pool.choice("abc"), "abc")
+        with self.assertRaises(ValueError):
+            pool.randbelow(0)
+        with self.assertRaises(IndexError):
+            pool.choice("")
+
+    def test_refill_keeps_overlapping_tail(self):
+        """Verifies that a refill moves the unread bytes intact even when they overlap their destination."""
+        pool = EntropyPool(block_size=16, refill_threshold=8)
+        blocks = iter([bytes(range(16)), bytes(range(100, 102)), bytes(7)])
+        with patch("utils.entropy_pool.os.urandom", lambda n: next(blocks)[:n]):
+            self.assertEqual(pool.read(2), bytes([0, 1]))
+            # Quedan 14 bytes; se copian de [2:16] a [0:14] antes de la recarga
+            self.assertEqual(pool.read(7), bytes(range(2, 9)))
+            self.assertEqual(pool.read(7), bytes(range(9, 16)))
+
+    def test_shuffle_is_a_permutation(self):
+        """Verifies that Fisher-Yates keeps every element."""
+        items = list(range(50))
+        EntropyPool().shuffle(items)
+        self.assertEqual(sorted(items), list(range(50)))
+
+    def test_concurrent_reads(self):
+        """Verifies that concurrent threads never lose counted bytes."""
+        pool = EntropyPool(block_size=256)
+
+        def worker():
+            for _ in range(500):
+                pool.read(3)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(pool.stats()["bytes_consumed"], 4 * 500 * 3)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork()")
+    def test_child_does_not_repeat_parent_bytes(self):
+        """Verifies that a forked child reseeds instead of reusing the inherited buffer."""
+        pool = get_default_pool()
+        pool.read(1)
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            os.write(write_end, pool.read(32))
+            os._exit(0)
+        os.close(write_end)
+        child_bytes = os.read(read_end, 32)
+        os.close(read_end)
+        os.waitpid(pid, 0)
+        self.assertEqual(len(child_bytes), 32)
+        self.assertNotEqual(child_bytes, pool.read(32))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import contextlib
+import csv
+import gzip
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+from utils.export import export_credentials, infer_output, main, read_identifiers, read_vault
+
+HAS_CRYPTOGRAPHY = importlib.util.find_spec("cryptography") is not None
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.users = [f"user{i}" for i in range(300)] + ['quoted, "name"']
+
+    def test_csv_round_trip(self):
+        """Verifies that CSV output quotes symbols and pairs every identifier with a password."""
+        output = io.BytesIO()
+        rows = export_credentials(self.users, output, "csv", length=16, chunk_size=64)
+        self.assertEqual(rows, len(self.users))
+        records = list(csv.DictReader(io.StringIO(output.getvalue().decode("utf-8"))))
+        self.assertEqual([r["username"] for r in records], self.users)
+        self.assertTrue(all(len(r["password"]) == 16 for r in records))
+
+    def test_jsonl_gzip(self):
+        """Verifies that JSON Lines output survives gzip compression."""
+        output = io.BytesIO()
+        export_credentials(self.users, output, "jsonl", length=10, use_symbols=False,
+                           compression="gzip", id_column="email")
+        lines = gzip.decompress(output.getvalue()).decode("utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([r["email"] for r in records], self.users)
+        self.assertTrue(all(r["password"].isalnum() for r in records))
+
+    def test_read_identifiers(self):
+        """Verifies that the requested column is read lazily and a missing one is rejected."""
+        rows = io.StringIO("id,username\n1,ana\n\n2,luis\n")
+        self.assertEqual(list(read_identifiers(rows)), ["ana", "luis"])
+        with self.assertRaises(ValueError):
+            read_identifiers(io.StringIO("id\n1\n"))
+        with self.assertRaisesRegex(ValueError, "fila 3"):
+            list(read_identifiers(io.StringIO("id,username\n1,ana\n2\n")))
+
+    def test_infer_output(self):
+        """Verifies that the file name selects format, compression and encryption."""
+        self.assertEqual(infer_output("out.csv"), ("csv", None, False))
+        self.assertEqual(infer_output("out.jsonl.zst"), ("jsonl", "zstd", False))
+        self.assertEqual(infer_output("out.jsonl.gz.vault"), ("jsonl", "gzip", True))
+
+    def test_command_line(self):
+        """Verifies the export entry point end to end."""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "users.csv")
+            target = os.path.join(tmp, "out.jsonl")
+            with open(source, "w") as f:
+                f.write("username\nana\nluis\n")
+            main([source, "-o", target, "--length", "8", "--min-numbers", "3"])
+            with open(target) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([r["username"] for r in records], ["ana", "luis"])
+        self.assertTrue(all(sum(c.isdigit() for c in r["password"]) >= 3 for r in records))
+
+    def test_invalid_input_keeps_existing_output(self):
+        """Verifies that a missing input or column is reported before the output is truncated."""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "users.csv")
+            target = os.path.join(tmp, "out.csv")
+            with open(source, "w") as f:
+                f.write("email\nana@example.com\n")
+            with open(target, "w") as f:
+                f.write("previous\n")
+            for argv in ([os.path.join(tmp, "missing.csv"), "-o", target], [source, "-o", target]):
+                with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                    main(argv)
+            with open(target) as f:
+                self.assertEqual(f.read(), "previous\n")
+
+    @unittest.skipUnless(HAS_CRYPTOGRAPHY, "cryptography is not installed")
+    def test_interrupted_vault_is_rejected(self):
+        """Verifies that a vault whose export fails midway never decrypts as complete."""
+        def identifiers():
+            yield from self.users
+            raise ValueError("entrada dañada")
+
+        output = io.BytesIO()
+        with self.assertRaises(ValueError):
+            export_credentials(identifiers(), output, passphrase="clave", chunk_size=64)
+        with self.assertRaisesRegex(ValueError, "truncada"):
+            list(read_vault(io.BytesIO(output.getvalue()), "clave"))
+
+    @unittest.skipUnless(HAS_CRYPTOGRAPHY, "cryptography is not installed")
+    def test_vault_round_trip(self):
+        """Verifies that the encrypted vault decrypts only with the right key and detects truncation."""
+        output = io.BytesIO()
+        export_credentials(self.users, output, compression="gzip", passphrase="clave")
+        data = output.getvalue()
+        plain = b"".join(read_vault(io.BytesIO(data), "clave"))
+        self.assertIn(b"user299", gzip.decompress(plain))
+        with self.assertRaises(ValueError):
+            list(read_vault(io.BytesIO(data), "otra"))
+        with self.assertRaises(ValueError):
+            list(read_vault(io.BytesIO(data[:-5]), "clave"))
+
+    @unittest.skipIf(HAS_CRYPTOGRAPHY, "cryptography is installed")
+    def test_vault_requires_cryptography(self):
+        """Verifies that a missing optional dependency is reported as ValueError."""
+        with self.assertRaises(ValueError):
+            export_credentials(self.users, io.BytesIO(), passphrase="clave")
@@ -0,0 +1,83 @@
+import itertools
+import math
+import os
+import tempfile
+import unittest
+from utils.entropy_pool import EntropyPool
+from utils.markov import MarkovModel, build_model, load_model, train
+from utils.password_generator import PasswordGenerator, main
+
+
+class TestMarkovModel(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.corpus = os.path.join(self.tmp.name, "corpus.txt")
+        with open(self.corpus, "w") as f:
+            f.write("abba\nbaba, cab!\nAcab\n")
+        self.path = build_model(self.corpus, os.path.join(self.tmp.name, "m.bin"),
+                                order=1, alphabet="abc")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def probability(self, model, password):
+        """Probabilidad de password según los recuentos del modelo, paso a paso."""
+        size = len(model.alphabet)
+        context, p = 0, 1.0
+        for c in password:
+            context, total = model._row(context)
+            i = model.alphabet.index(c)
+            count = model._rows[context * size + i] - (model._rows[context * size + i - 1] if i else 0)
+            p *= count / total
+            context = (context * (size + 1) + i + 1) % model.contexts
+        return p
+
+    def test_train_counts_transitions(self):
+        """Verifies the cumulative transition counts for a tiny corpus."""
+        counts = train(["ab", "b-a"], order=1, alphabet="ab")
+        # Inicio: a, b y a (el guion empieza otra palabra); tras a: b; tras b: nada
+        self.assertEqual(list(counts), [2, 3, 0, 1, 0, 0])
+        with self.assertRaises(ValueError):
+            train(["123"], order=1, alphabet="ab")
+
+    def test_statistics_match_brute_force(self):
+        """Verifies that entropy, min-entropy and keyspace match enumerating every password."""
+        with MarkovModel(self.path) as model:
+            for length in (1, 3, 5):
+                probabilities = [self.probability(model, "".join(p))
+                                 for p in itertools.product(model.alphabet, repeat=length)]
+                probabilities = [p for p in probabilities if p > 0]
+                self.assertAlmostEqual(sum(probabilities), 1.0)
+                self.assertEqual(model.keyspace(length), len(probabilities))
+                self.assertAlmostEqual(model.entropy_bits(length),
+                                       -sum(p * math.log2(p) for p in probabilities))
+                self.assertAlmostEqual(model.min_entropy_bits(length),
+                                       -math.log2(max(probabilities)))
+
+    def test_samples_follow_the_model(self):
+        """Verifies that every sample is a password the model can produce."""
+        with MarkovModel(self.path) as model:
+            samples = [model.sample(EntropyPool(), 4) for _ in range(500)]
+            self.assertTrue(all(self.probability(model, s) > 0 for s in samples))
+            self.assertEqual({s[0] for s in samples}, {"a", "b", "c"})
+
+    def test_invalid_and_missing_model(self):
+        """Verifies that a foreign file or a missing model raise ValueError."""
+        with self.assertRaises(ValueError):
+            MarkovModel(self.corpus)
+        with self.assertRaises(ValueError):
+            load_model(os.path.join(self.tmp.name, "missing.bin"))
+
+    def test_generator_and_command_line(self):
+        """Verifies pronounceable passwords through the generator and the --pronounceable option."""
+        passwords = [p for chunk in PasswordGenerator.iter_pronounceable_chunks(
+            50, 6, self.path, chunk_size=16) for p in chunk]
+        self.assertEqual(len(passwords), 50)
+        self.assertTrue(all(len(p) == 6 and set(p) <= set("abc") for p in passwords))
+        output = os.path.join(self.tmp.name, "out.txt")
+        main(["--pronounceable", "--markov-model", self.path, "-n", "5", "-l", "7", "-o", output])
+        with open(output) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(len(line) == 7 for line in lines))
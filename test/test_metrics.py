@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+from utils.metrics import MetricsRegistry, export, registry, serve, to_prometheus
+from utils.password_generator import PasswordGenerator, main
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_disabled_registry_records_nothing(self):
+        """Verifies that a disabled registry ignores counters, timers and timed calls."""
+        metrics = MetricsRegistry()
+        metrics.inc("calls_total")
+        with metrics.timer("block"):
+            pass
+        self.assertEqual(metrics.timed("call")(lambda: 7)(), 7)
+        snapshot = metrics.snapshot()
+        self.assertNotIn("calls_total", snapshot["counters"])
+        self.assertEqual(snapshot["histograms"], {})
+
+    def test_counters_and_histograms(self):
+        """Verifies that enabled metrics accumulate counts and latency buckets."""
+        metrics = MetricsRegistry(enabled=True)
+        metrics.inc("calls_total")
+        metrics.inc("calls_total", 2)
+        metrics.observe("call", 0.002)
+        metrics.timed("call")(lambda: None)()
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"]["calls_total"], 3)
+        self.assertEqual(snapshot["histograms"]["call"]["count"], 2)
+        self.assertIn("entropy_bytes_drawn_total", snapshot["counters"])
+
+    def test_prometheus_format(self):
+        """Verifies the exposition format: cumulative buckets ending in +Inf."""
+        metrics = MetricsRegistry(enabled=True)
+        metrics.inc("calls_total")
+        metrics.observe("call", 0.5)
+        metrics.observe("call", 10.0)
+        text = to_prometheus(metrics.snapshot())
+        self.assertIn("password_generator_calls_total 1", text)
+        self.assertIn('password_generator_call_seconds_bucket{le="0.5"} 1', text)
+        self.assertIn('password_generator_call_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn("password_generator_call_seconds_count 2", text)
+
+    def test_http_endpoint(self):
+        """Verifies that the local endpoint serves both formats."""
+        metrics = MetricsRegistry(enabled=True)
+        metrics.inc("calls_total")
+        server = serve(0, metrics=metrics)
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(base + "/metrics") as response:
+                self.assertIn("password_generator_calls_total 1", response.read().decode())
+            with urllib.request.urlopen(base + "/metrics.json") as response:
+                self.assertEqual(json.load(response)["counters"]["calls_total"], 1)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestGenerationMetrics(unittest.TestCase):
+
+    def setUp(self):
+        registry.reset()
+        registry.enable()
+
+    def tearDown(self):
+        registry.disable()
+        registry.reset()
+
+    def test_generation_is_instrumented(self):
+        """Verifies that generation records latencies, counts and rejections."""
+        PasswordGenerator.generate(16, True, True, True, True)
+        PasswordGenerator.generate_batch(200, 4, False, True, False, False, unique=True)
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["histograms"]["generate"]["count"], 1)
+        self.assertGreaterEqual(snapshot["histograms"]["sample"]["count"], 2)
+        self.assertEqual(snapshot["counters"]["passwords_generated_total"], 201)
+        self.assertIn("duplicate_rejections_total", snapshot["counters"])
+
+    def test_cli_export_never_contains_passwords(self):
+        """Verifies that the exported snapshot holds numbers only, never password material."""
+        with tempfile.TemporaryDirectory() as tmp:
+            out, prom = os.path.join(tmp, "out.txt"), os.path.join(tmp, "metrics.prom")
+            self.assertEqual(main(["-n", "50", "-o", out, "--metrics", prom]), 0)
+            with open(out) as f:
+                passwords = f.read().split()
+            with open(prom) as f:
+                text = f.read()
+            export(os.path.join(tmp, "metrics.json"))
+            with open(os.path.join(tmp, "metrics.json")) as f:
+                text += f.read()
+        self.assertIn("password_generator_passwords_generated_total 50", text)
+        for password in passwords:
+            self.assertNotIn(password, text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import string
+from utils.parallel_generator import generate_parallel, iter_parallel_blocks
+
+
+class TestParallelGenerator(unittest.TestCase):
+
+    def test_generate_parallel_with_several_workers(self):
+        """Verifies that a multi-process run returns every password with the selected classes."""
+        passwords = generate_parallel(300, 12, True, True, True, True, workers=2)
+        self.assertEqual(len(passwords), 300)
+        for password in passwords:
+            self.assertEqual(len(password), 12)
+            self.assertTrue(any(c in string.punctuation for c in password))
+
+    def test_unordered_blocks_cover_the_whole_job(self):
+        """Verifies that unordered merging still yields exactly the requested count."""
+        blocks = list(iter_parallel_blocks(250, 8, False, True, False, False,
+                                           workers=2, ordered=False, chunk_size=40))
+        self.assertEqual(len(blocks), 7)
+        lines = b"".join(blocks).splitlines()
+        self.assertEqual(len(lines), 250)
+        self.assertTrue(all(line.isdigit() for line in lines))
+
+    def test_workers_produce_independent_output(self):
+        """Verifies that forked workers do not share random state."""
+        blocks = list(iter_parallel_blocks(64, 32, True, True, True, True,
+                                           workers=2, chunk_size=16))
+        self.assertEqual(len(set(map(bytes, blocks))), len(blocks))
+
+    def test_invalid_arguments(self):
+        """Verifies that invalid parameters are rejected before any process is started."""
+        with self.assertRaises(ValueError):
+            list(iter_parallel_blocks(10, 8, False, False, False, False, workers=2))
+        with self.assertRaises(ValueError):
+            list(iter_parallel_blocks(10, 8, True, True, True, True, chunk_size=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
 import unittest
+import os
 import string
 import secrets
-from utils.password_generator import PasswordBuilder, PasswordGenerator  # Replace with your actual module name.
+import subprocess
+import sys
+import tempfile
+from utils.entropy_pool import EntropyPool
+from utils.password_generator import PasswordBuilder, PasswordGenerator, main  # Replace with your actual module name.
 
 class TestPasswordBuilder(unittest.TestCase):
     
@@ -15,25 +20,33 @@ class TestPasswordBuilder(unittest.TestCase):
         """Verifies that lowercase characters are added correctly."""
         builder = PasswordBuilder(8).add_lowercase()
         self.assertIn('a', builder.character_set)  # Check if lowercase letters are present.
-        self.assertEqual(len(builder.forced_chars), 1)  # There should be one forced character.
+        self.assertEqual(sum(builder.minimums.values()), 1)  # The class is required once.
 
     def test_add_uppercase(self):
         """Verifies that uppercase characters are added correctly."""
         builder = PasswordBuilder(8).add_uppercase()
         self.assertIn('A', builder.character_set)  # Check if uppercase letters are present.
-        self.assertEqual(len(builder.forced_chars), 1)  # There should be one forced character.
+        self.assertEqual(sum(builder.minimums.values()), 1)  # The class is required once.
 
     def test_add_numbers(self):
         """Verifies that digits are added correctly."""
         builder = PasswordBuilder(8).add_numbers()
         self.assertIn('0', builder.character_set)  # Check if digits are present.
-        self.assertEqual(len(builder.forced_chars), 1)  # There should be one forced character.
+        self.assertEqual(sum(builder.minimums.values()), 1)  # The class is required once.
 
     def test_add_symbols(self):
         """Verifies that symbols are added correctly."""
         builder = PasswordBuilder(8).add_symbols()
         self.assertIn('!', builder.character_set)  # Check if symbols are present.
-        self.assertEqual(len(builder.forced_chars), 1)  # There should be one forced character.
+        self.assertEqual(sum(builder.minimums.values()), 1)  # The class is required once.
+
+    def test_build_draws_from_entropy_pool(self):
+        """Verifies that the builder takes its randomness from the given entropy pool."""
+        pool = EntropyPool()
+        password = PasswordBuilder(16, pool).add_lowercase().add_numbers().build()
+        self.assertEqual(len(password), 16)
+        self.assertGreater(pool.stats()["bytes_consumed"], 0)
+        self.assertEqual(pool.stats()["passwords"], 1)
 
     def test_build_without_characters(self):
         """Verifies that a ValueError is raised if no characters are selected."""
@@ -52,13 +65,29 @@ class TestPasswordBuilder(unittest.TestCase):
         self.assertTrue(any(c.isdigit() for c in password))  # At least one digit.
         self.assertTrue(any(c in string.punctuation for c in password))  # At least one symbol.
 
-    def test_build_with_excessive_forced_characters(self):
-        """Verifies that a password is constructed even if there are more forced characters than length."""
-        builder = PasswordBuilder(4).add_lowercase().add_uppercase()
-        builder.forced_chars = ['a', 'B', 'c', 'D', '1']  # Forcing more characters than needed.
+    def test_build_with_more_classes_than_length(self):
+        """Verifies that only as many classes are required as there are positions."""
+        builder = PasswordBuilder(2).add_lowercase().add_uppercase().add_numbers()
+        self.assertEqual(list(builder.minimums.values()), [1, 1, 0])
         password = builder.build()
-        self.assertEqual(len(password), 4)  # Should truncate password to specified length.
-        self.assertTrue(all(c in builder.character_set for c in password))  # All chars must be in the set.
+        self.assertEqual(len(password), 2)
+        self.assertTrue(any(c.islower() for c in password))
+        self.assertTrue(any(c.isupper() for c in password))
+
+    def test_build_with_constraints(self):
+        """Verifies minimum counts, ambiguous-character exclusion and the no-repeat rule."""
+        builder = (PasswordBuilder(12).add_lowercase().add_numbers(minimum=5)
+                   .exclude_ambiguous().forbid_repeats())
+        for _ in range(50):
+            password = builder.build()
+            self.assertGreaterEqual(sum(c.isdigit() for c in password), 5)
+            self.assertFalse(set(password) & set("0O1lI"))
+            self.assertTrue(all(a != b for a, b in zip(password, password[1:])))
+
+    def test_build_rejects_impossible_minimums(self):
+        """Verifies that minimums longer than the password raise ValueError."""
+        with self.assertRaises(ValueError):
+            PasswordBuilder(4).add_numbers(minimum=3).add_symbols(minimum=2).build()
 
 class TestPasswordGenerator(unittest.TestCase):
     
@@ -107,5 +136,122 @@ class TestPasswordGenerator(unittest.TestCase):
         self.assertTrue(any(c.isdigit() for c in password))  # At least one digit.
         self.assertTrue(any(c in string.punctuation for c in password))  # At least one symbol.
 
+class TestPasswordGeneratorBatch(unittest.TestCase):
+
+    def test_generate_batch_count_and_length(self):
+        """Verifies that the batch returns the requested number of passwords of the right length."""
+        passwords = PasswordGenerator.generate_batch(50, 10, True, True, True, True)
+        self.assertEqual(len(passwords), 50)
+        self.assertTrue(all(len(p) == 10 for p in passwords))
+
+    def test_generate_batch_keeps_class_guarantee(self):
+        """Verifies that every password in the batch contains each selected class."""
+        for password in PasswordGenerator.generate_batch(200, 4, True, True, True, True):
+            self.assertTrue(any(c.islower() for c in password))
+            self.assertTrue(any(c.isupper() for c in password))
+            self.assertTrue(any(c.isdigit() for c in password))
+            self.assertTrue(any(c in string.punctuation for c in password))
+
+    def test_generate_batch_respects_disabled_classes(self):
+        """Verifies that disabled classes never appear in batch output."""
+        for password in PasswordGenerator.generate_batch(200, 12, False, True, False, False):
+            self.assertTrue(password.isdigit())
+
+    def test_iter_batch_spans_several_chunks(self):
+        """Verifies that lazy generation yields the full count across chunk boundaries."""
+        passwords = list(PasswordGenerator.iter_batch(25, 8, True, True, True, True, chunk_size=7))
+        self.assertEqual(len(passwords), 25)
+
+    def test_generate_batch_invalid_arguments(self):
+        """Verifies that invalid counts, lengths and empty character sets raise ValueError."""
+        with self.assertRaises(ValueError):
+            PasswordGenerator.generate_batch(-1, 8, True, True, True, True)
+        with self.assertRaises(ValueError):
+            PasswordGenerator.generate_batch(1, 0, True, True, True, True)
+        with self.assertRaises(ValueError):
+            PasswordGenerator.generate_batch(1, 8, False, False, False, False)
+
+class TestPassphrase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.wordlist = os.path.join(cls.tmp.name, "words.txt")
+        with open(cls.wordlist, "w") as f:
+            f.write("\n".join(f"word{i}" for i in range(1000)) + "\n")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_generate_passphrase(self):
+        """Verifies that a passphrase has the requested number of words from the list."""
+        phrase = PasswordGenerator.generate_passphrase(5, ".", self.wordlist)
+        words = phrase.split(".")
+        self.assertEqual(len(words), 5)
+        self.assertTrue(all(w.startswith("word") and 0 <= int(w[4:]) < 1000 for w in words))
+
+    def test_generate_passphrase_batch(self):
+        """Verifies that the batch path returns count distinct-looking passphrases."""
+        phrases = PasswordGenerator.generate_passphrase_batch(50, 4, "-", self.wordlist)
+        self.assertEqual(len(phrases), 50)
+        self.assertGreater(len(set(phrases)), 45)
+
+    def test_missing_wordlist(self):
+        """Verifies that a missing word list raises ValueError."""
+        with self.assertRaises(ValueError):
+            PasswordGenerator.generate_passphrase(4, "-", os.path.join(self.tmp.name, "nope.txt"))
+
+    def test_cli_passphrase_mode(self):
+        """Verifies that the CLI writes passphrases when --passphrase is given."""
+        path = os.path.join(self.tmp.name, "phrases.txt")
+        main(["--passphrase", "--words", "3", "--wordlist", self.wordlist, "-n", "7", "-o", path])
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertTrue(all(len(line.split("-")) == 3 for line in lines))
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def test_main_writes_one_password_per_line(self):
+        """Verifies that the CLI writes the requested passwords to the output file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.txt")
+            self.assertEqual(main(["--count", "20", "--length", "24", "--no-symbols", "-o", path]), 0)
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), 20)
+        self.assertTrue(all(len(line) == 24 and line.isalnum() for line in lines))
+
+    def test_main_applies_constraints(self):
+        """Verifies that the constraint flags reach the generated passwords."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.txt")
+            main(["-n", "50", "-l", "8", "--min-numbers", "4", "--no-ambiguous", "--no-repeat",
+                  "-o", path])
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), 50)
+        for line in lines:
+            self.assertGreaterEqual(sum(c.isdigit() for c in line), 4)
+            self.assertFalse(set(line) & set("0O1lI"))
+            self.assertTrue(all(a != b for a, b in zip(line, line[1:])))
+
+    def test_main_rejects_length_outside_slider_range(self):
+        """Verifies that lengths outside the UI slider range are rejected."""
+        with self.assertRaises(SystemExit):
+            main(["--length", "2"])
+
+    def test_cli_does_not_import_customtkinter(self):
+        """Verifies that running the CLI never imports the GUI toolkit."""
+        code = ("import sys, runpy; sys.argv = ['x', '-n', '1'];"
+                "sys.modules['customtkinter'] = None;"
+                "runpy.run_module('utils.password_generator', run_name='__main__')")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(len(result.stdout.splitlines()), 1)
+
 if __name__ == "__main__":
     unittest.main()
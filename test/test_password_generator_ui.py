@@ -14,6 +14,15 @@ class TestPasswordGeneratorUI(unittest.TestCase):
         self.assertIsNotNone(self.ui.length_var)
         self.assertEqual(self.ui.length_var.get(), 12)  # Check the expected default value
 
+    def test_deferred_startup_builds_options_after_first_frame(self):
+        """Test that a deferred UI only builds the options once the first frame is shown."""
+        ui = PasswordGeneratorUI(deferred=True)
+        self.assertFalse(hasattr(ui, "password_entry"))
+        ui.show_first_frame()
+        self.assertTrue(hasattr(ui, "password_entry"))
+        self.assertFalse(ui.deferred_pending)
+        ui.window.destroy()
+
     def test_update_length_label(self):
         """Test that the length label updates correctly."""
         self.ui.length_var.set(16)
@@ -36,6 +45,72 @@ class TestPasswordGeneratorUI(unittest.TestCase):
         self.assertEqual(self.ui.password_entry.get(), "TestPassword123!")
         self.assertEqual(self.ui.message_label.cget("text"), "¡Contraseña generada exitosamente!")
 
+    def test_strength_is_shown_for_generated_password(self):
+        """Test that the strength label reflects the displayed password."""
+        self.ui.current_password = "password"
+        self.ui.update_password_display()
+        self.assertTrue(self.ui.strength_label.cget("text").startswith("Fortaleza: Muy débil"))
+
+    def test_breached_password_is_flagged(self):
+        """Test that a password found in the breach corpus is flagged in the strength label."""
+        self.ui.breach_corpus = MagicMock()
+        self.ui.breach_corpus.count.return_value = 3
+        self.ui.current_password = "Tr0ub4dor&3"
+        self.ui.update_password_display()
+        self.assertIn("Filtrada 3 veces", self.ui.strength_label.cget("text"))
+
+    def test_passphrase_mode_generates_words(self):
+        """Test that the passphrase mode calls the passphrase generator with the word count."""
+        self.ui.password_generator.generate_passphrase = MagicMock(return_value="uno-dos-tres")
+        self.ui.mode_var.set("Frase")
+        self.ui.words_var.set(3)
+
+        self.ui.generate_password_command.execute()
+        self.ui.password_generator.generate_passphrase.assert_called_once_with(3)
+        self.assertEqual(self.ui.password_entry.get(), "uno-dos-tres")
+
+    def test_pronounceable_mode_uses_markov_model(self):
+        """Test that the pronounceable option calls the Markov generator with the length."""
+        self.ui.password_generator.generate_pronounceable = MagicMock(return_value="tralomendi")
+        self.ui.pronounceable_entropies[10] = 31.0  # como si ya la hubiera calculado el pregenerador
+        self.ui.pronounceable_var.set(True)
+        self.ui.length_var.set(10)
+
+        self.ui.generate_password_command.execute()
+        self.ui.password_generator.generate_pronounceable.assert_called_once_with(10)
+        self.assertEqual(self.ui.password_entry.get(), "tralomendi")
+        self.assertIn("Entropía real: 31 bits", self.ui.strength_label.cget("text"))
+
+    def test_pronounceable_entropy_is_computed_once_per_length(self):
+        """Test that the model entropy is computed while generating and cached per length."""
+        self.ui.password_generator.generate_pronounceable = MagicMock(return_value="tralomendi")
+        model = MagicMock()
+        model.entropy_bits.return_value = 31.0
+        with patch("utils.markov.load_model", return_value=model):
+            self.ui.generate_for_settings("Pronunciable", 10)
+            self.ui.generate_for_settings("Pronunciable", 10)
+        model.entropy_bits.assert_called_once_with(10)
+        self.assertEqual(self.ui.pronounceable_entropies, {10: 31.0})
+
+    def test_generate_password_uses_prefetched_queue(self):
+        """Test that a running prefetcher serves the password without generating on click."""
+        self.ui.prefetcher = MagicMock(running=True)
+        self.ui.prefetcher.take.return_value = "Prefetched123!"
+        self.ui.password_generator.generate = MagicMock()
+
+        self.ui.generate_password_command.execute()
+        self.ui.password_generator.generate.assert_not_called()
+        self.assertEqual(self.ui.password_entry.get(), "Prefetched123!")
+
+    def test_generate_password_waits_for_empty_queue(self):
+        """Test that an empty queue schedules a retry through window.after."""
+        self.ui.prefetcher = MagicMock(running=True)
+        self.ui.prefetcher.take.return_value = None
+
+        self.ui.generate_password_command.execute()
+        self.ui.generate_password_command.execute()
+        self.ui.window.after.assert_called_once()
+
     @patch('ui.clipboard_manager.ClipboardManager.copy_text')
     def test_copy_to_clipboard(self, mock_copy_text):
         """Test the copy to clipboard functionality."""
@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+from ui.password_prefetcher import PasswordPrefetcher
+
+
+def wait_for(prefetcher, timeout=2.0):
+    """Polls take() until a password is available or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        password = prefetcher.take()
+        if password is not None:
+            return password
+        time.sleep(0.001)
+    return None
+
+
+class TestPasswordPrefetcher(unittest.TestCase):
+
+    def test_take_is_empty_until_started(self):
+        """Verifies that nothing is generated before the worker thread starts."""
+        prefetcher = PasswordPrefetcher(lambda *s: "x", size=4)
+        prefetcher.update_settings((8, True, True, True, True))
+        self.assertFalse(prefetcher.running)
+        self.assertIsNone(prefetcher.take())
+
+    def test_queue_is_filled_for_current_settings(self):
+        """Verifies that the worker pre-generates passwords with the current settings."""
+        prefetcher = PasswordPrefetcher(lambda length, *flags: "a" * length, size=4)
+        prefetcher.update_settings((6, True, True, True, True))
+        prefetcher.start()
+        try:
+            self.assertEqual(wait_for(prefetcher), "aaaaaa")
+        finally:
+            prefetcher.stop()
+
+    def test_settings_change_discards_queue(self):
+        """Verifies that passwords for old settings are never handed out after a change."""
+        prefetcher = PasswordPrefetcher(lambda length, *flags: "b" * length, size=4)
+        prefetcher.update_settings((4, True, True, True, True))
+        prefetcher.start()
+        try:
+            self.assertEqual(wait_for(prefetcher), "bbbb")
+            prefetcher.update_settings((9, True, True, True, True))
+            self.assertEqual(wait_for(prefetcher), "b" * 9)
+        finally:
+            prefetcher.stop()
+
+    def test_generator_errors_are_raised_on_take(self):
+        """Verifies that an invalid configuration surfaces its error to the caller."""
+        def generate(*settings):
+            raise ValueError("Debe seleccionar al menos un tipo de caracteres.")
+
+        prefetcher = PasswordPrefetcher(generate, size=2)
+        prefetcher.update_settings((8, False, False, False, False))
+        prefetcher.start()
+        try:
+            deadline = time.monotonic() + 2
+            with self.assertRaises(ValueError):
+                while time.monotonic() < deadline:
+                    prefetcher.take()
+                    time.sleep(0.001)
+        finally:
+            prefetcher.stop()
+
+    def test_queue_is_bounded(self):
+        """Verifies that the worker stops generating once the queue is full."""
+        calls = []
+        prefetcher = PasswordPrefetcher(lambda *s: calls.append(1) or "c", size=3)
+        prefetcher.update_settings((4, True, True, True, True))
+        prefetcher.start()
+        time.sleep(0.05)
+        prefetcher.stop()
+        self.assertLessEqual(len(calls), 4)
+        self.assertFalse(any(t.name == "password-prefetcher" for t in threading.enumerate()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+import string
+from itertools import product
+from utils.entropy_pool import EntropyPool
+from utils.policy import (MAX_FIND_MINIMUM, CompiledPolicy, SampledAlphabet, _has_at_least,
+                          compile_constraints, compile_policy)
+
+
+class FixedStream:
+    """Deterministic byte source used to exercise the sampling tables."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def read(self, n: int) -> bytes:
+        chunk = (self.data * (n // len(self.data) + 2))[self.pos % len(self.data):][:n]
+        self.pos += n
+        return chunk
+
+    def randbelow(self, n: int) -> int:
+        return 0
+
+
+class CountingStream:
+    """Returns every rank in turn so that each table entry is visited once."""
+
+    def __init__(self):
+        self.next_rank = 0
+
+    def randbelow(self, n: int) -> int:
+        rank, self.next_rank = self.next_rank, self.next_rank + 1
+        return rank
+
+
+def brute_force(length, classes, no_repeat=False):
+    alphabet = "".join(chars for chars, _ in classes)
+    return {"".join(p) for p in product(alphabet, repeat=length)
+            if all(sum(c in chars for c in p) >= minimum for chars, minimum in classes)
+            and not (no_repeat and any(a == b for a, b in zip(p, p[1:])))}
+
+
+class TestCompilePolicy(unittest.TestCase):
+
+    def test_policies_are_memoized(self):
+        """Verifies that the same options return the very same compiled policy."""
+        first = compile_policy(12, True, True, True, True)
+        self.assertIs(first, compile_policy(12, True, True, True, True))
+        self.assertIsNot(first, compile_policy(13, True, True, True, True))
+
+    def test_policy_is_immutable(self):
+        """Verifies that compiled policies cannot be modified."""
+        policy = compile_policy(8, False, True, False, True)
+        self.assertIsInstance(policy, CompiledPolicy)
+        with self.assertRaises(AttributeError):
+            policy.length = 4
+        with self.assertRaises(AttributeError):
+            policy.alphabet.threshold = 0
+
+    def test_alphabets_follow_the_selected_classes(self):
+        """Verifies that the full alphabet and the per-class alphabets match the flags."""
+        policy = compile_policy(8, False, True, False, True)
+        self.assertEqual(policy.character_set, string.ascii_lowercase + string.digits)
+        self.assertEqual([a.chars for a in policy.class_alphabets],
+                         [string.ascii_lowercase.encode(), string.digits.encode()])
+
+    def test_forced_classes_truncated_to_length(self):
+        """Verifies that no more classes are forced than there are positions."""
+        self.assertEqual(len(compile_policy(2, True, True, True, True).forced_alphabets), 2)
+
+    def test_keyspace_counts_passwords_with_every_class(self):
+        """Verifies the exact keyspace against brute-force counts for small policies."""
+        self.assertEqual(compile_policy(4, False, True, False, False).keyspace, 10 ** 4)
+        # Two-character passwords with at least one lowercase and one digit
+        self.assertEqual(compile_policy(2, False, True, False, True).keyspace, 2 * 26 * 10)
+        policy = compile_policy(3, False, True, False, True)
+        brute = sum(1 for a in policy.character_set for b in policy.character_set
+                    for c in policy.character_set
+                    if any(x.isdigit() for x in a + b + c) and any(x.isalpha() for x in a + b + c))
+        self.assertEqual(policy.keyspace, brute)
+
+    def test_invalid_options(self):
+        """Verifies that invalid lengths and empty selections raise ValueError."""
+        with self.assertRaises(ValueError):
+            compile_policy(0, True, True, True, True)
+        with self.assertRaises(ValueError):
+            compile_policy(8, False, False, False, False)
+
+
+class TestConstraints(unittest.TestCase):
+
+    def assert_tables_enumerate_valid_passwords(self, length, classes, no_repeat=False):
+        policy = compile_constraints(length, classes, no_repeat=no_repeat)
+        self.assertIsNotNone(policy._tables)  # tight enough to use the count tables
+        passwords = policy.sample(CountingStream(), policy.keyspace)
+        self.assertEqual(len(set(passwords)), len(passwords))
+        self.assertEqual(set(passwords), brute_force(length, classes, no_repeat))
+
+    def test_unranking_is_a_bijection(self):
+        """Verifies that each rank maps to a distinct valid password, hence uniform sampling."""
+        self.assert_tables_enumerate_valid_passwords(3, (("ab", 1), ("01", 2)))
+
+    def test_unranking_without_repeats(self):
+        """Verifies the bijection when adjacent characters may not repeat."""
+        self.assert_tables_enumerate_valid_passwords(4, (("abc", 1), ("01", 2)), no_repeat=True)
+
+    def test_loose_policies_use_candidates(self):
+        """Verifies that loose policies sample candidates and still count the keyspace exactly."""
+        classes = (("abc", 1), ("01", 1))
+        policy = compile_constraints(4, classes, no_repeat=True)
+        self.assertIsNone(policy._tables)
+        self.assertEqual(policy.keyspace, len(brute_force(4, classes, no_repeat=True)))
+        for password in policy.sample(EntropyPool(), 200):
+            self.assertIn(password, brute_force(4, classes, no_repeat=True))
+
+    def test_exclusions_and_minimums(self):
+        """Verifies that excluded characters never appear and minimums always hold."""
+        policy = compile_policy(10, True, True, True, True, min_numbers=6, exclude_ambiguous=True)
+        self.assertFalse(set(policy.character_set) & set("0O1lI"))
+        for password in policy.sample(EntropyPool(), 200):
+            self.assertEqual(len(password), 10)
+            self.assertGreaterEqual(sum(c.isdigit() for c in password), 6)
+
+    def test_single_and_batch_checks_agree(self):
+        """Verifies that the per-candidate and all-at-once minimum checks accept the same candidates."""
+        policy = compile_policy(12, True, True, True, True, min_numbers=3)
+        candidates = policy.alphabet.sample(EntropyPool(), 12 * 500)
+        batch = policy._accepted(candidates, 500)
+        single = b"".join(policy._accepted(candidates[i:i + 12], 1) or b"\x01"
+                          for i in range(0, len(candidates), 12))
+        self.assertEqual(batch, single)
+
+    def test_has_at_least_counts_flags(self):
+        """Verifies the minimum check with small minimums (find) and large ones (count)."""
+        flags = bytes([0, 1] * 100)
+        for minimum in (0, 1, MAX_FIND_MINIMUM, MAX_FIND_MINIMUM + 1, 100):
+            self.assertTrue(_has_at_least(flags, minimum))
+        self.assertFalse(_has_at_least(flags, 101))
+        self.assertFalse(_has_at_least(bytes(10), 1))
+        policy = compile_policy(1000, False, True, False, True, min_numbers=250)
+        for password in policy.sample(EntropyPool(), 3):
+            self.assertGreaterEqual(sum(c.isdigit() for c in password), 250)
+
+    def test_class_counts_match_brute_force(self):
+        """Verifies the per-position and per-pair counts used for expected frequencies."""
+        classes = (("ab", 1), ("012", 2))
+        passwords = brute_force(4, classes)
+        total, single, pairs = compile_constraints(4, classes).class_counts()
+        self.assertEqual(total, len(passwords))
+        self.assertEqual(single, [sum(p[2] == "a" for p in passwords),
+                                  sum(p[2] == "0" for p in passwords)])
+        self.assertEqual(pairs[0][1], sum(p[1:3] == "b2" for p in passwords))
+        with self.assertRaises(ValueError):
+            compile_constraints(4, classes, no_repeat=True).class_counts()
+
+    def test_impossible_constraints(self):
+        """Verifies that unsatisfiable policies raise ValueError when compiled."""
+        with self.assertRaises(ValueError):
+            compile_constraints(3, (("ab", 2), ("01", 2)))
+        with self.assertRaises(ValueError):
+            compile_constraints(3, (("a", 1),), no_repeat=True)
+        with self.assertRaises(ValueError):
+            compile_constraints(3, (("01", 1),), exclude="01")
+        with self.assertRaises(ValueError):
+            compile_constraints(3, (("ab", 2), ("b1", 1)))
+        with self.assertRaises(ValueError):
+            compile_policy(4096, True, True, True, True, min_symbols=2000)
+
+
+class TestSampledAlphabet(unittest.TestCase):
+
+    def test_threshold_is_largest_multiple(self):
+        """Verifies that the rejection threshold is the largest multiple of the size below 256."""
+        alphabet = SampledAlphabet(string.digits.encode())
+        self.assertEqual(alphabet.threshold, 250)
+        self.assertEqual(alphabet.rejected, bytes(range(250, 256)))
+
+    def test_sample_rejects_bytes_above_threshold(self):
+        """Verifies that bytes above the threshold are skipped instead of wrapped."""
+        alphabet = SampledAlphabet(string.digits.encode())
+        self.assertEqual(alphabet.sample(FixedStream(bytes([255, 13, 251, 7])), 4), b"3737")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import io
+import random
+import string
+import unittest
+from contextlib import redirect_stdout
+from utils.entropy_pool import EntropyPool
+from utils.policy import compile_policy
+from utils.randomness import chi2_sf, main, verify, verify_blocks
+
+ALPHA = 1e-6
+
+
+def forced_then_shuffled(count, length, classes):
+    """The former scheme: one character of each class, the rest uniform, then shuffled."""
+    rng = random.SystemRandom()
+    alphabet = "".join(classes)
+    passwords = []
+    for _ in range(count):
+        chars = [rng.choice(c) for c in classes]
+        chars += [rng.choice(alphabet) for _ in range(length - len(classes))]
+        rng.shuffle(chars)
+        passwords.append("".join(chars))
+    return "".join(passwords).encode("ascii")
+
+
+class TestRandomness(unittest.TestCase):
+
+    def test_chi2_survival_function(self):
+        """Verifies the chi-square tail against tabulated critical values."""
+        self.assertAlmostEqual(chi2_sf(3.841, 1), 0.05, places=3)
+        self.assertAlmostEqual(chi2_sf(18.307, 10), 0.05, places=3)
+        self.assertAlmostEqual(chi2_sf(8835, 8835), 0.5, places=1)
+        self.assertEqual(chi2_sf(0, 4), 1.0)
+
+    def test_generator_passes(self):
+        """Verifies that the exact-uniform generator passes every test, minimums included."""
+        policy = compile_policy(6, False, True, False, True, min_numbers=2)
+        report = verify(policy, 300000, alpha=ALPHA)
+        self.assertTrue(report["passed"], report)
+        self.assertGreaterEqual(report["characters"], 300000)
+
+    def test_detects_forced_characters(self):
+        """Verifies that the forced-char-plus-shuffle skew is detected."""
+        policy = compile_policy(6, False, True, False, True)
+        block = forced_then_shuffled(20000, 6, [string.ascii_lowercase, string.digits])
+        report = verify_blocks(policy, [block], alpha=ALPHA)
+        self.assertFalse(report["passed"])
+        failed = {t["test"] for t in report["tests"] if not t["passed"]}
+        self.assertIn("posición 0: clases", failed)
+
+    def test_detects_repeated_passwords(self):
+        """Verifies that correlation between consecutive passwords is detected."""
+        policy = compile_policy(8, False, True, False, True)
+        passwords = policy.sample(EntropyPool(), 20000)
+        block = "".join(p + p for p in passwords).encode("ascii")
+        report = verify_blocks(policy, [block[:len(block) // 2], block[len(block) // 2:]],
+                               alpha=ALPHA)
+        failed = {t["test"] for t in report["tests"] if not t["passed"]}
+        self.assertIn("pares entre contraseñas consecutivas", failed)
+        self.assertIn("correlación serie entre contraseñas consecutivas", failed)
+
+    def test_command_line(self):
+        """Verifies the exit code and report of the command-line verifier."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(["--characters", "50000", "--length", "8", "--alpha", "1e-6"])
+        self.assertEqual(code, 0)
+        self.assertIn("RESULTADO: correcto", output.getvalue())
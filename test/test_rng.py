@@ -0,0 +1,73 @@
+import io
+import unittest
+from utils.entropy_pool import EntropyPool, get_default_pool
+from utils.export import export_credentials
+from utils.parallel_generator import iter_parallel_blocks
+from utils.password_generator import PasswordGenerator
+from utils.rng import SeededStream, create_stream, require_secure
+
+
+class TestSeededStream(unittest.TestCase):
+
+    def test_same_seed_same_output(self):
+        """Verifies that a seed reproduces the same passwords and different seeds do not."""
+        def batch(seed):
+            return PasswordGenerator.generate_batch(50, 16, True, True, True, True,
+                                                    pool=SeededStream(seed))
+        self.assertEqual(batch(1), batch(1))
+        self.assertNotEqual(batch(1), batch(2))
+        self.assertTrue(all(len(p) == 16 for p in batch(3)))
+
+    def test_spawned_streams_are_independent(self):
+        """Verifies that spawned streams are reproducible and differ from each other."""
+        root = SeededStream(42)
+        self.assertEqual(root.spawn(0).read(32), SeededStream(42).spawn(0).read(32))
+        self.assertNotEqual(root.spawn(0).read(32), root.spawn(1).read(32))
+
+    def test_randbelow_range_and_stats(self):
+        """Verifies randbelow bounds and that stats use the EntropyPool keys."""
+        stream = SeededStream(0)
+        self.assertEqual({stream.randbelow(3) for _ in range(200)}, {0, 1, 2})
+        with self.assertRaises(ValueError):
+            stream.randbelow(0)
+        stream.reset_stats()
+        stream.read(10)
+        stream.record_passwords(2)
+        self.assertEqual(set(stream.stats()), set(EntropyPool().stats()))
+        self.assertEqual(stream.stats()["bytes_per_password"], 5)
+
+    def test_randbelow_is_counted_like_entropy_pool(self):
+        """Verifies that randbelow counts each attempt as a read of the same size in both backends."""
+        for stream in (SeededStream(0), EntropyPool()):
+            for _ in range(100):
+                stream.randbelow(1000)  # 10 bits: dos bytes por intento
+            stats = stream.stats()
+            attempts = stats["bytes_consumed"] // 2
+            self.assertEqual(stats["bytes_consumed"], 2 * attempts)
+            self.assertGreaterEqual(attempts, 100)
+            self.assertEqual(stats["syscalls"] + stats["syscalls_saved"], attempts)
+
+    def test_parallel_output_does_not_depend_on_workers(self):
+        """Verifies that seeded parallel output is identical with one or two processes."""
+        def run(workers):
+            return b"".join(iter_parallel_blocks(300, 12, True, True, True, True,
+                                                 workers=workers, chunk_size=64, seed=9))
+        self.assertEqual(run(1), run(2))
+        self.assertEqual(len(run(1).splitlines()), 300)
+
+
+class TestSecureGuard(unittest.TestCase):
+
+    def test_require_secure(self):
+        """Verifies that only the OS pool passes the guard."""
+        self.assertIs(require_secure(get_default_pool()), get_default_pool())
+        self.assertIs(create_stream(), get_default_pool())
+        with self.assertRaises(ValueError):
+            require_secure(create_stream(5))
+
+    def test_export_rejects_seeded_stream(self):
+        """Verifies that credential export refuses the insecure backend."""
+        output = io.BytesIO()
+        with self.assertRaises(ValueError):
+            export_credentials(["ana"], output, pool=SeededStream(1))
+        self.assertEqual(output.getvalue(), b"")
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import string
+import unittest
+from utils.password_generator import build_parser, policy_constraints
+from utils.service import GenerationService, parse_request
+
+
+class TestParseRequest(unittest.TestCase):
+
+    def test_defaults_match_generate(self):
+        """Verifies that omitted options default to every class enabled, the CLI constraints and one password."""
+        request_id, policy, count = parse_request(b'{"id": 7, "length": 12}')
+        self.assertEqual(request_id, 7)
+        self.assertEqual(policy[:5], (12, True, True, True, True))
+        self.assertEqual(dict(policy[5]), policy_constraints(build_parser().parse_args([])))
+        self.assertEqual(count, 1)
+
+    def test_constraints_are_accepted(self):
+        """Verifies that the CLI policy constraints can be set per request."""
+        _, policy, _ = parse_request(b'{"length": 12, "min_numbers": 4, "exclude_ambiguous": true,'
+                                     b' "no_repeat": true}')
+        self.assertEqual(dict(policy[5]), {"min_symbols": 1, "min_numbers": 4, "min_uppercase": 1,
+                                           "min_lowercase": 1, "exclude_ambiguous": True,
+                                           "no_repeat": True})
+
+    def test_invalid_requests(self):
+        """Verifies that malformed requests are rejected with ValueError."""
+        for line in (b"not json", b"[]", b'{"length": "12"}', b'{"length": 12, "count": 0}',
+                     b'{"length": 12, "use_symbols": 1}', b'{"length": 12, "extra": true}',
+                     b'{"length": 12, "min_numbers": -1}', b'{"length": 12, "min_numbers": 13}',
+                     b'{"length": 12, "no_repeat": 1}'):
+            with self.assertRaises(ValueError):
+                parse_request(line)
+
+
+class TestGenerationService(unittest.TestCase):
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Verifies that simultaneous requests with the same policy share one batch."""
+        async def scenario():
+            service = GenerationService(coalesce_window=0.01)
+            _, policy, _ = parse_request(b'{"length": 10, "use_symbols": false,'
+                                         b' "use_uppercase": false, "use_lowercase": false}')
+            results = await asyncio.gather(*(service.generate(policy, 2) for _ in range(20)))
+            return service, results
+
+        service, results = asyncio.run(scenario())
+        self.assertEqual(service.batches, 1)
+        self.assertEqual(service.requests, 20)
+        passwords = [p for result in results for p in result]
+        self.assertEqual(len(passwords), 40)
+        self.assertTrue(all(len(p) == 10 and p.isdigit() for p in passwords))
+
+    def test_batches_apply_constraints(self):
+        """Verifies that generated batches honour the request's constraints."""
+        _, policy, _ = parse_request(b'{"length": 8, "use_symbols": false, "min_numbers": 5,'
+                                     b' "exclude_ambiguous": true, "no_repeat": true}')
+        passwords = asyncio.run(GenerationService().generate(policy, 50))
+        self.assertEqual(len(passwords), 50)
+        for password in passwords:
+            self.assertGreaterEqual(sum(c.isdigit() for c in password), 5)
+            self.assertFalse(set(password) & set("0O1lI"))
+            self.assertTrue(all(a != b for a, b in zip(password, password[1:])))
+
+    def test_round_trip_over_tcp(self):
+        """Verifies the JSON lines protocol end to end on a local port."""
+        async def scenario():
+            server = await GenerationService().start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"id": "a", "length": 16, "count": 3}\n')
+            writer.write(b'{"id": "b", "length": 8, "use_symbols": false, "use_numbers": false,'
+                         b' "use_uppercase": false, "use_lowercase": false}\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return responses
+
+        ok, error = asyncio.run(scenario())
+        self.assertEqual(ok["id"], "a")
+        self.assertEqual(len(ok["passwords"]), 3)
+        self.assertTrue(any(c in string.punctuation for c in ok["passwords"][0]))
+        self.assertEqual(error, {"id": "b", "error": "Debe seleccionar al menos un tipo de caracteres."})
+
+
+if __name__ == "__main__":
+    unittest.main()
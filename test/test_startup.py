@@ -0,0 +1,63 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from ui.startup_profiler import ImportProfiler
+from utils.config import UIConfig
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestImportProfiler(unittest.TestCase):
+
+    def test_separates_self_and_cumulative_time(self):
+        """Verifies that a parent's cumulative time includes the modules it imports."""
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "startup_child.py"), "w") as f:
+                f.write("import time\ntime.sleep(0.02)\n")
+            with open(os.path.join(tmp, "startup_parent.py"), "w") as f:
+                f.write("import startup_child\n")
+            sys.path.insert(0, tmp)
+            try:
+                with ImportProfiler() as profiler:
+                    import startup_parent  # noqa: F401
+            finally:
+                sys.path.remove(tmp)
+                sys.modules.pop("startup_parent", None)
+                sys.modules.pop("startup_child", None)
+        timings = {t["module"]: t for t in profiler.timings}
+        self.assertGreaterEqual(timings["startup_child"]["self"], 0.02)
+        self.assertGreaterEqual(timings["startup_parent"]["cumulative"], 0.02)
+        self.assertLess(timings["startup_parent"]["self"], 0.02)
+        self.assertEqual(profiler.slowest(1)[0]["module"], "startup_parent")
+
+
+class TestStartupBudget(unittest.TestCase):
+
+    def test_generator_does_not_import_cli_or_http_modules(self):
+        """Verifies that modules only needed by the CLI or metrics server load lazily."""
+        code = ("import sys, utils.password_generator, ui.password_prefetcher;"
+                "print(' '.join(m for m in ('argparse', 'http.server') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                                text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+    @unittest.skipUnless(importlib.util.find_spec("customtkinter")
+                         and (os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin")),
+                         "requires customtkinter and a display")
+    def test_window_appears_within_budget(self):
+        """Verifies that the first window is painted within the startup budget."""
+        result = subprocess.run([sys.executable, "main.py", "--profile-startup", "--json"],
+                                cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        report = json.loads(result.stderr)
+        self.assertLessEqual(report["time_to_first_window"], UIConfig.STARTUP_BUDGET_SECONDS)
+        self.assertLessEqual(report["time_to_first_window"], report["time_to_ready"])
+
+
+if __name__ == "__main__":
+    unittest.main()
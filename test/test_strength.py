@@ -0,0 +1,76 @@
+import math
+import os
+import tempfile
+import time
+import unittest
+from utils.strength import (StrengthEstimator, character_set_entropy, estimate_strength,
+                            load_dictionary, score_for_bits)
+
+
+class TestStrengthEstimate(unittest.TestCase):
+
+    def test_common_patterns_are_weak(self):
+        """Verifies that dictionary words, sequences, repeats and keyboard walks score low."""
+        for password, pattern in (("password", "diccionario"), ("P@ssw0rd", "diccionario"),
+                                  ("abcdefgh", "secuencia"), ("aaaaaaaa", "repetición"),
+                                  ("qazwsxedc", "teclado")):
+            result = estimate_strength(password)
+            self.assertLessEqual(result.score, 1, password)
+            self.assertIn(pattern, [m.pattern for m in result.matches], password)
+
+    def test_random_password_uses_charset_entropy(self):
+        """Verifies that a patternless password is scored by its character set."""
+        result = estimate_strength("xK9#mQ2$vL7!")
+        self.assertEqual(result.matches, ())
+        self.assertAlmostEqual(result.bits, 12 * math.log2(94))
+        self.assertAlmostEqual(result.bits, result.charset_bits)
+
+    def test_character_set_entropy(self):
+        """Verifies the entropy of a uniform password over a given character set."""
+        self.assertAlmostEqual(character_set_entropy("0123456789", 4), 4 * math.log2(10))
+        self.assertEqual(character_set_entropy("a", 10), 0.0)
+
+    def test_score_thresholds(self):
+        """Verifies the mapping from bits to the 0-4 score."""
+        self.assertEqual([score_for_bits(b) for b in (0, 30, 40, 80, 200)], [0, 1, 2, 3, 4])
+
+    def test_custom_dictionary(self):
+        """Verifies that a dictionary file is loaded into the trie."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("zebra\nquokka\n")
+            trie = load_dictionary(path)
+        result = estimate_strength("xquokkax", trie)
+        self.assertEqual([m.pattern for m in result.matches], ["diccionario"])
+
+
+class TestStrengthEstimator(unittest.TestCase):
+
+    def test_incremental_matches_full_estimate(self):
+        """Verifies that incremental edits give the same result as scoring from scratch."""
+        estimator = StrengthEstimator()
+        edits = ["p", "pa", "pass", "password", "password1234", "passXword1234",
+                 "Xword1234", "qwertyXword1234", "", "zz"]
+        for text in edits:
+            self.assertEqual(estimator.estimate(text), estimate_strength(text), text)
+
+    def test_edit_rescans_only_changed_window(self):
+        """Verifies that a one-character edit does not rescan the whole password."""
+        text = "".join(chr(33 + (i * 37) % 94) for i in range(200))
+        estimator = StrengthEstimator()
+        estimator.estimate(text)
+        estimator.estimate(text[:150] + "Z" + text[151:])
+        self.assertLess(estimator.rescanned, 40)
+
+    def test_scoring_64_characters_is_fast(self):
+        """Verifies that scoring a 64-character password takes well under a millisecond."""
+        text = "".join(chr(33 + (i * 37) % 94) for i in range(64))
+        start = time.perf_counter()
+        for _ in range(100):
+            estimate_strength(text)
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import math
+import os
+import re
+import string
+import tempfile
+import unittest
+from utils.entropy_pool import EntropyPool
+from utils.password_generator import PasswordGenerator, main
+from utils.template import compile_template, parse_template
+
+
+class TestTemplate(unittest.TestCase):
+
+    def test_parse_elements(self):
+        """Verifies placeholders, classes, ranges, escapes, literals and repetitions."""
+        self.assertEqual(parse_template("Aa9$"), [string.ascii_uppercase, string.ascii_lowercase,
+                                                  string.digits, string.punctuation])
+        self.assertEqual(parse_template("[a-cx-]{2}\\A-"), ["abcx-", "abcx-", "A", "-"])
+        self.assertEqual(parse_template("[\\]0-2]"), ["]012"])
+
+    def test_keyspace_and_entropy(self):
+        """Verifies the exact keyspace and entropy of a template."""
+        compiled = compile_template("Aaaa-9999-$$")
+        self.assertEqual(compiled.length, 12)
+        self.assertEqual(compiled.keyspace, 26 ** 4 * 10 ** 4 * 32 ** 2)
+        self.assertAlmostEqual(compiled.entropy_bits, math.log2(compiled.keyspace))
+        self.assertIs(compiled, compile_template("Aaaa-9999-$$"))
+
+    def test_samples_match_the_template(self):
+        """Verifies that every sampled password has the template's structure."""
+        compiled = compile_template("[A-Z]{2}[0-9]{6}-x")
+        passwords = compiled.sample(EntropyPool(), 2000)
+        self.assertEqual(len(passwords), 2000)
+        for password in passwords:
+            self.assertRegex(password, r"^[A-Z]{2}[0-9]{6}-x$")
+        # Every allowed character shows up in a column
+        self.assertEqual({p[0] for p in passwords}, set(string.ascii_uppercase))
+        self.assertEqual({p[7] for p in passwords}, set(string.digits))
+
+    def test_invalid_templates(self):
+        """Verifies that malformed templates raise ValueError."""
+        for template in ("", "[a-", "[]", "{3}", "a{0}", "a{x}", "[z-a]", "ñ", "abc\\",
+                         "a{5000}"):
+            with self.assertRaises(ValueError, msg=template):
+                compile_template(template)
+
+
+class TestTemplateGeneration(unittest.TestCase):
+
+    def test_generator_and_arena(self):
+        """Verifies template passwords through the generator, its arena and uniqueness."""
+        self.assertRegex(PasswordGenerator.generate_from_template("99-aa"), r"^\d\d-[a-z]{2}$")
+        arena = PasswordGenerator.generate_template_arena(100, "9{3}", chunk_size=16)
+        self.assertTrue(all(re.fullmatch(rb"\d{3}", bytes(view)) for view in arena))
+        passwords = [p for chunk in PasswordGenerator.iter_template_chunks(
+            1000, "9{3}", chunk_size=64, unique=True) for p in chunk]
+        self.assertEqual(sorted(passwords), [f"{i:03}" for i in range(1000)])
+        with self.assertRaises(ValueError):
+            next(PasswordGenerator.iter_template_chunks(1001, "9{3}", unique=True))
+
+    def test_command_line(self):
+        """Verifies the --template command-line option."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.txt")
+            main(["--template", "A-9", "-n", "5", "-o", path])
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), 5)
+        for line in lines:
+            self.assertRegex(line, r"^[A-Z]-\d$")
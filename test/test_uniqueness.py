@@ -0,0 +1,60 @@
+import unittest
+from utils.password_generator import PasswordGenerator
+from utils.parallel_generator import iter_parallel_blocks
+from utils.uniqueness import UniqueFilter
+
+
+class TestUniqueFilter(unittest.TestCase):
+
+    def test_add_reports_new_items(self):
+        """Verifies that only the first occurrence of an item is accepted."""
+        seen = UniqueFilter(10)
+        self.assertTrue(seen.add("abc"))
+        self.assertFalse(seen.add("abc"))
+        self.assertTrue(seen.add(b"abd"))
+        self.assertEqual(len(seen), 2)
+
+    def test_filter_new_keeps_order(self):
+        """Verifies that duplicates are dropped while preserving order."""
+        seen = UniqueFilter(10)
+        self.assertEqual(list(seen.filter_new(["b", "a", "b", "c", "a"])), ["b", "a", "c"])
+
+    def test_memory_is_bounded_by_capacity(self):
+        """Verifies that the table uses a fixed 8 bytes per slot at most 75% full."""
+        seen = UniqueFilter(1000)
+        self.assertEqual(seen.memory_bytes, 2048 * 8)
+        for i in range(1000):
+            seen.add(str(i))
+        with self.assertRaises(OverflowError):
+            seen.add("extra")
+
+    def test_invalid_capacity(self):
+        """Verifies that a non-positive capacity is rejected."""
+        with self.assertRaises(ValueError):
+            UniqueFilter(0)
+
+
+class TestUniqueGeneration(unittest.TestCase):
+
+    def test_batch_exhausts_small_keyspace_without_duplicates(self):
+        """Verifies that unique mode can produce every 4-digit PIN exactly once."""
+        passwords = PasswordGenerator.generate_batch(10000, 4, False, True, False, False, unique=True)
+        self.assertEqual(len(set(passwords)), 10000)
+
+    def test_count_above_keyspace_fails_up_front(self):
+        """Verifies that impossible requests are rejected before generating anything."""
+        with self.assertRaises(ValueError) as context:
+            PasswordGenerator.generate_batch(10001, 4, False, True, False, False, unique=True)
+        self.assertIn("10000", str(context.exception))
+
+    def test_parallel_unique_merge(self):
+        """Verifies that duplicates across worker processes are removed at the merge."""
+        blocks = iter_parallel_blocks(900, 3, False, True, False, False,
+                                      workers=2, chunk_size=200, unique=True)
+        lines = b"".join(blocks).splitlines()
+        self.assertEqual(len(lines), 900)
+        self.assertEqual(len(set(lines)), 900)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import math
+import os
+import tempfile
+import unittest
+from utils.wordlist import INDEX_SUFFIX, MappedWordlist, build_index
+
+
+class TestMappedWordlist(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "words.txt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_words_are_read_by_position(self):
+        """Verifies O(1) lookups for plain and diceware-formatted lines."""
+        self.write("11111\tabacus\n11112\tabdomen\r\n\nzebra  \nñandú")
+        with MappedWordlist(self.path) as wordlist:
+            self.assertEqual(len(wordlist), 4)
+            self.assertEqual([wordlist[i] for i in range(4)], ["abacus", "abdomen", "zebra", "ñandú"])
+            self.assertAlmostEqual(wordlist.bits_per_word, math.log2(4))
+            with self.assertRaises(IndexError):
+                wordlist[4]
+
+    def test_index_is_built_once_and_reused(self):
+        """Verifies that the sidecar index is created and reused while the list is unchanged."""
+        self.write("uno\ndos\n")
+        MappedWordlist(self.path).close()
+        index_path = self.path + INDEX_SUFFIX
+        self.assertTrue(os.path.exists(index_path))
+        mtime = os.stat(index_path).st_mtime_ns
+        MappedWordlist(self.path).close()
+        self.assertEqual(os.stat(index_path).st_mtime_ns, mtime)
+
+    def test_stale_index_is_rebuilt(self):
+        """Verifies that changing the list invalidates its index."""
+        self.write("uno\ndos\n")
+        build_index(self.path)
+        self.write("uno\ndos\ntres\n")
+        with MappedWordlist(self.path) as wordlist:
+            self.assertEqual(len(wordlist), 3)
+            self.assertEqual(wordlist[2], "tres")
+
+    def test_empty_list_is_rejected(self):
+        """Verifies that empty word lists raise ValueError."""
+        self.write("")
+        with self.assertRaises(ValueError):
+            MappedWordlist(self.path)
+        self.write("\n\n")
+        with self.assertRaises(ValueError):
+            MappedWordlist(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import customtkinter as ctk
+from utils.metrics import registry
 
 class ClipboardManager:
     """Gestiona las operaciones del portapapeles."""
@@ -6,6 +7,7 @@ class ClipboardManager:
     def __init__(self, window: ctk.CTk):
         self.window = window
     
+    @registry.timed("clipboard_copy")
     def copy_text(self, text: str) -> None:
         """Copia el texto al portapapeles."""
         self.window.clipboard_clear()
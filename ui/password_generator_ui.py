@@ -1,9 +1,10 @@
 import customtkinter as ctk
 from ui.ui_factory import UIFactory
 from ui.clipboard_manager import ClipboardManager
-from utils.password_generator import PasswordGenerator
-from utils.config import UIConfig, UIColors, MessageColors
-from typing import List, Tuple
+from ui.password_prefetcher import PasswordPrefetcher
+from utils.config import UIConfig, UIColors, MessageColors, PassphraseConfig, MetricsConfig
+from utils import metrics
+from typing import Dict, List, Tuple
 
 
 class GeneratePasswordCommand:
@@ -11,17 +12,21 @@ class GeneratePasswordCommand:
     
     def __init__(self, ui_instance: 'PasswordGeneratorUI'):
         self.ui = ui_instance
+        self.retry_pending = False
 
+    @metrics.registry.timed("ui_generate")
     def execute(self) -> None:
         """Ejecuta el comando para generar la contraseña."""
         try:
-            self.ui.current_password = self.ui.password_generator.generate(
-                self.ui.length_var.get(),
-                self.ui.symbols_var.get(),
-                self.ui.numbers_var.get(),
-                self.ui.uppercase_var.get(),
-                self.ui.lowercase_var.get()
-            )
+            if self.ui.prefetcher.running:
+                # Toma una contraseña ya generada en segundo plano
+                password = self.ui.prefetcher.take()
+                if password is None:
+                    self.schedule_retry()
+                    return
+            else:
+                password = self.ui.generate_for_settings(*self.ui.current_settings())
+            self.ui.current_password = password
             self.ui.update_password_display()
             self.ui.show_message("¡Contraseña generada exitosamente!", MessageColors.SUCCESS)
         except ValueError as e:
@@ -29,6 +34,17 @@ class GeneratePasswordCommand:
         except Exception as e:
             self.ui.show_message(f"Error inesperado: {str(e)}", MessageColors.ERROR)
 
+    def schedule_retry(self) -> None:
+        """Vuelve a intentarlo desde el bucle de Tk mientras se rellena la cola."""
+        if not self.retry_pending:
+            self.retry_pending = True
+            self.ui.window.after(UIConfig.PREFETCH_POLL_MS, self.retry)
+
+    def retry(self) -> None:
+        """Reintenta la generación pendiente."""
+        self.retry_pending = False
+        self.execute()
+
 
 class CopyToClipboardCommand:
     """Comando para copiar la contraseña al portapapeles."""
@@ -50,9 +66,14 @@ class CopyToClipboardCommand:
 
 
 class PasswordGeneratorUI:
-    """Interfaz de usuario principal para el generador de contraseñas."""
+    """Interfaz de usuario principal para el generador de contraseñas.
+
+    Con deferred=True solo se construye el encabezado; el resto de la
+    interfaz y los módulos de generación se cargan con show_first_frame(),
+    después de que la ventana se haya dibujado por primera vez.
+    """
 
-    def __init__(self):
+    def __init__(self, deferred: bool = False):
         self.setup_window()
         self.init_variables()
         
@@ -62,7 +83,11 @@ class PasswordGeneratorUI:
         
         self.create_ui()
         self.clipboard_manager = ClipboardManager(self.window)
-        self.password_generator = PasswordGenerator()
+        self.prefetcher = PasswordPrefetcher(self.generate_for_settings, UIConfig.PREFETCH_SIZE)
+        self.trace_settings()
+        self.deferred_pending = deferred
+        if not deferred:
+            self.create_deferred_sections()
 
     def setup_window(self) -> None:
         """Configura la ventana principal."""
@@ -80,16 +105,95 @@ class PasswordGeneratorUI:
         self.numbers_var = ctk.BooleanVar(value=True)
         self.uppercase_var = ctk.BooleanVar(value=True)
         self.lowercase_var = ctk.BooleanVar(value=True)
+        self.pronounceable_var = ctk.BooleanVar(value=False)
+        self.mode_var = ctk.StringVar(value=UIConfig.MODE_CHARACTERS)
+        self.words_var = ctk.IntVar(value=PassphraseConfig.DEFAULT_WORDS)
         self.current_password = ""
+        # Entropía real de las contraseñas pronunciables por longitud; la
+        # calcula el hilo del pregenerador y el de Tk solo la lee
+        self.pronounceable_entropies: Dict[int, float] = {}
+
+    def trace_settings(self) -> None:
+        """Avisa al pregenerador cada vez que cambia una opción."""
+        for var in (self.length_var, self.symbols_var, self.numbers_var,
+                    self.uppercase_var, self.lowercase_var, self.pronounceable_var,
+                    self.mode_var, self.words_var):
+            var.trace_add("write", self.on_settings_changed)
+
+    def current_settings(self) -> Tuple:
+        """Devuelve el modo seguido de los parámetros de generación de ese modo."""
+        if self.mode_var.get() == UIConfig.MODE_PASSPHRASE:
+            return (UIConfig.MODE_PASSPHRASE, self.words_var.get())
+        if self.pronounceable_var.get():
+            return (UIConfig.MODE_PRONOUNCEABLE, self.length_var.get())
+        return (
+            UIConfig.MODE_CHARACTERS,
+            self.length_var.get(),
+            self.symbols_var.get(),
+            self.numbers_var.get(),
+            self.uppercase_var.get(),
+            self.lowercase_var.get()
+        )
+
+    def generate_for_settings(self, mode: str, *params) -> str:
+        """Genera una contraseña o una frase según el modo indicado."""
+        if mode == UIConfig.MODE_PASSPHRASE:
+            return self.password_generator.generate_passphrase(*params)
+        if mode == UIConfig.MODE_PRONOUNCEABLE:
+            password = self.password_generator.generate_pronounceable(*params)
+            self.cache_pronounceable_entropy(len(password))
+            return password
+        return self.password_generator.generate(*params, blocklist=self.breach_corpus)
+
+    def cache_pronounceable_entropy(self, length: int) -> None:
+        """Calcula una vez por longitud la entropía real de las contraseñas pronunciables.
+
+        Recorre todos los contextos del modelo, así que se llama al generar
+        (en el hilo del pregenerador) y nunca al dibujar la fortaleza.
+        """
+        if length not in self.pronounceable_entropies:
+            # Importación diferida: solo se usa en el modo pronunciable
+            from utils.markov import load_model
+
+            self.pronounceable_entropies[length] = load_model().entropy_bits(length)
+
+    def on_settings_changed(self, *_) -> None:
+        """Descarta las contraseñas pregeneradas con la configuración anterior."""
+        self.prefetcher.update_settings(self.current_settings())
 
     def create_ui(self) -> None:
-        """Crea todos los elementos de la interfaz de usuario."""
+        """Crea los elementos que se muestran en el primer fotograma."""
         self.main_frame = self.create_main_frame()
         self.create_header()
         self.card = self.create_card()
+        self.create_mode_section()
+
+    def create_deferred_sections(self) -> None:
+        """Carga los módulos de generación y crea las opciones y el resultado."""
+        # Importaciones diferidas: no hacen falta para dibujar la ventana
+        from utils.breach import default_corpus
+        from utils.password_generator import PasswordGenerator
+        from utils.strength import StrengthEstimator
+
+        self.password_generator = PasswordGenerator()
+        self.strength_estimator = StrengthEstimator()
+        try:
+            self.breach_corpus = default_corpus()
+        except (OSError, ValueError):
+            self.breach_corpus = None
+        self.characters_frame = ctk.CTkFrame(self.card, fg_color=UIColors.TRANSPARENT)
+        self.characters_frame.pack(fill="x")
         self.create_length_section()
         self.create_options_section()
+        self.create_passphrase_section()
         self.create_result_section()
+        self.deferred_pending = False
+
+    def show_first_frame(self) -> None:
+        """Dibuja la ventana y, si quedaba algo por construir, lo construye después."""
+        self.window.update()
+        if self.deferred_pending:
+            self.create_deferred_sections()
 
     def create_main_frame(self) -> ctk.CTkFrame:
         """Crea el frame principal."""
@@ -110,7 +214,7 @@ class PasswordGeneratorUI:
 
     def create_length_section(self) -> None:
         """Crea la sección de longitud de contraseña."""
-        length_frame = ctk.CTkFrame(self.card, fg_color=UIColors.TRANSPARENT)
+        length_frame = ctk.CTkFrame(self.characters_frame, fg_color=UIColors.TRANSPARENT)
         length_frame.pack(fill="x", padx=20, pady=(20, 10))
         
         self.length_label = UIFactory.create_label(length_frame, f"Longitud de la contraseña: {self.length_var.get()}", 14)
@@ -121,7 +225,7 @@ class PasswordGeneratorUI:
     def create_length_slider(self) -> None:
         """Crea el control deslizante para la longitud."""
         ctk.CTkSlider(
-            self.card,
+            self.characters_frame,
             from_=UIConfig.MIN_PASSWORD_LENGTH,
             to=UIConfig.MAX_PASSWORD_LENGTH,
             number_of_steps=UIConfig.MAX_PASSWORD_LENGTH - UIConfig.MIN_PASSWORD_LENGTH,
@@ -132,7 +236,7 @@ class PasswordGeneratorUI:
     def create_options_section(self) -> None:
         """Crea la sección de opciones de caracteres."""
         self.create_separator()
-        UIFactory.create_label(self.card, "Opciones de caracteres", 16, is_bold=True).pack(pady=(10, 20))
+        UIFactory.create_label(self.characters_frame, "Opciones de caracteres", 16, is_bold=True).pack(pady=(10, 20))
         self.create_checkboxes()
 
     def create_checkboxes(self) -> None:
@@ -141,24 +245,53 @@ class PasswordGeneratorUI:
             (self.symbols_var, "Incluir símbolos (@#$%)"),
             (self.numbers_var, "Incluir números (0-9)"),
             (self.uppercase_var, "Incluir mayúsculas (A-Z)"),
-            (self.lowercase_var, "Incluir minúsculas (a-z)")
+            (self.lowercase_var, "Incluir minúsculas (a-z)"),
+            (self.pronounceable_var, "Pronunciable (solo letras, más fácil de teclear)")
         ]
         
         for var, text in checkbox_options:
-            UIFactory.create_checkbox(self.card, text, var).pack(pady=10, padx=20, anchor="w")
+            UIFactory.create_checkbox(self.characters_frame, text, var).pack(pady=10, padx=20, anchor="w")
 
     def create_separator(self) -> None:
         """Crea una línea separadora."""
-        separator = ctk.CTkFrame(self.card, height=2, fg_color=UIColors.SEPARATOR)
+        separator = ctk.CTkFrame(self.characters_frame, height=2, fg_color=UIColors.SEPARATOR)
         separator.pack(fill="x", padx=20, pady=10)
 
+    def create_mode_section(self) -> None:
+        """Crea el selector entre contraseña de caracteres y frase de palabras."""
+        ctk.CTkSegmentedButton(
+            self.card,
+            values=[UIConfig.MODE_CHARACTERS, UIConfig.MODE_PASSPHRASE],
+            variable=self.mode_var,
+            command=self.on_mode_changed,
+            font=(UIConfig.FONT_FAMILY, 14)
+        ).pack(padx=20, pady=(20, 0))
+
+    def create_passphrase_section(self) -> None:
+        """Crea las opciones del modo frase; se muestran solo en ese modo."""
+        self.passphrase_frame = ctk.CTkFrame(self.card, fg_color=UIColors.TRANSPARENT)
+        self.words_label = UIFactory.create_label(
+            self.passphrase_frame, f"Número de palabras: {self.words_var.get()}", 14)
+        self.words_label.pack(pady=(20, 10))
+        ctk.CTkSlider(
+            self.passphrase_frame,
+            from_=PassphraseConfig.MIN_WORDS,
+            to=PassphraseConfig.MAX_WORDS,
+            number_of_steps=PassphraseConfig.MAX_WORDS - PassphraseConfig.MIN_WORDS,
+            variable=self.words_var,
+            command=self.update_words_label
+        ).pack(padx=20, pady=(0, 20))
+
     def create_result_section(self) -> None:
         """Crea la sección de resultado."""
-        result_frame = ctk.CTkFrame(self.card, fg_color=UIColors.TRANSPARENT)
-        result_frame.pack(fill="x", padx=20, pady=20)
+        self.result_frame = ctk.CTkFrame(self.card, fg_color=UIColors.TRANSPARENT)
+        self.result_frame.pack(fill="x", padx=20, pady=20)
+        
+        self.create_password_entry(self.result_frame)
+        self.create_buttons(self.result_frame)
         
-        self.create_password_entry(result_frame)
-        self.create_buttons(result_frame)
+        self.strength_label = UIFactory.create_label(self.card, "", 13)
+        self.strength_label.pack()
         
         self.message_label = UIFactory.create_label(self.card, "", 14)
         self.message_label.pack(pady=10)
@@ -173,6 +306,7 @@ class PasswordGeneratorUI:
             justify="center"
         )
         self.password_entry.pack(pady=(0, 10))
+        self.password_entry.bind("<KeyRelease>", self.on_password_edited)
 
     def create_buttons(self, parent: ctk.CTkFrame) -> None:
         """Crea los botones de acción."""
@@ -197,6 +331,19 @@ class PasswordGeneratorUI:
             hover_color=UIColors.COPY_BUTTON_HOVER
         ).pack(side="left", expand=True, padx=5)
 
+    def on_mode_changed(self, mode: str) -> None:
+        """Muestra las opciones del modo seleccionado."""
+        if mode == UIConfig.MODE_PASSPHRASE:
+            self.characters_frame.pack_forget()
+            self.passphrase_frame.pack(fill="x", before=self.result_frame)
+        else:
+            self.passphrase_frame.pack_forget()
+            self.characters_frame.pack(fill="x", before=self.result_frame)
+
+    def update_words_label(self, _: float) -> None:
+        """Actualiza la etiqueta del número de palabras."""
+        self.words_label.configure(text=f"Número de palabras: {self.words_var.get()}")
+
     def update_length_label(self, _: float) -> None:
         """Actualiza la etiqueta de longitud."""
         self.length_label.configure(text=f"Longitud de la contraseña: {self.length_var.get()}")
@@ -209,7 +356,51 @@ class PasswordGeneratorUI:
         """Actualiza el campo de entrada de la contraseña con la generada."""
         self.password_entry.delete(0, "end")
         self.password_entry.insert(0, self.current_password)
+        self.update_strength()
+
+    def on_password_edited(self, _=None) -> None:
+        """Vuelve a estimar la fortaleza cuando el usuario edita o pega una contraseña."""
+        self.update_strength()
+
+    def update_strength(self) -> None:
+        """Muestra la fortaleza estimada de la contraseña del campo de entrada."""
+        password = self.password_entry.get()
+        if not password:
+            self.strength_label.configure(text="")
+            return
+        result = self.strength_estimator.estimate(password)
+        if result.score >= 3:
+            color = MessageColors.SUCCESS
+        elif result.score == 2:
+            color = MessageColors.WARNING
+        else:
+            color = MessageColors.ERROR
+        text = f"Fortaleza: {result.label} ({result.bits:.0f} bits)"
+        entropy = self.pronounceable_entropies.get(len(password))
+        if (entropy is not None and password == self.current_password
+                and self.current_settings()[0] == UIConfig.MODE_PRONOUNCEABLE):
+            # El estimador no conoce el modelo; su entropía real es la que cuenta
+            text += f" · Entropía real: {entropy:.0f} bits"
+        breaches = self.breach_corpus.count(password) if self.breach_corpus else 0
+        if breaches:
+            # Una contraseña filtrada es débil por muy larga que sea
+            text += f" · Filtrada {breaches:,} veces"
+            color = MessageColors.ERROR
+        self.strength_label.configure(text=text, text_color=color)
 
     def run(self) -> None:
         """Inicia la aplicación."""
-        self.window.mainloop()
+        if MetricsConfig.EXPORT_PATH or MetricsConfig.HTTP_PORT:
+            metrics.registry.enable()
+        if MetricsConfig.HTTP_PORT:
+            metrics.serve(MetricsConfig.HTTP_PORT)
+        if self.deferred_pending:
+            self.show_first_frame()
+        self.prefetcher.update_settings(self.current_settings())
+        self.prefetcher.start()
+        try:
+            self.window.mainloop()
+        finally:
+            self.prefetcher.stop()
+            if MetricsConfig.EXPORT_PATH:
+                metrics.export(MetricsConfig.EXPORT_PATH)
@@ -0,0 +1,97 @@
+import threading
+from collections import deque
+from typing import Callable, Optional, Tuple
+
+Settings = Tuple[int, bool, bool, bool, bool]
+
+
+class PasswordPrefetcher:
+    """Mantiene en un hilo aparte una pequeña cola de contraseñas pregeneradas.
+
+    El hilo de trabajo nunca toca widgets: solo llena la cola, que el hilo de
+    Tk consulta con take(). Cambiar la configuración descarta la cola.
+    """
+
+    def __init__(self, generate: Callable[..., str], size: int):
+        if size <= 0:
+            raise ValueError("El tamaño de la cola debe ser mayor que 0.")
+        self.generate = generate
+        self.size = size
+        self._queue = deque()
+        self._settings: Optional[Settings] = None
+        self._generation = 0
+        self._error: Optional[Exception] = None
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        """Indica si el hilo de trabajo está activo."""
+        return self._running
+
+    def start(self) -> None:
+        """Arranca el hilo de trabajo."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="password-prefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo de trabajo y vacía la cola."""
+        with self._condition:
+            self._running = False
+            self._queue.clear()
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def update_settings(self, settings: Settings) -> None:
+        """Descarta las contraseñas pregeneradas y rellena con la nueva configuración."""
+        with self._condition:
+            if settings == self._settings:
+                return
+            self._settings = settings
+            self._generation += 1
+            self._queue.clear()
+            self._error = None
+            self._condition.notify_all()
+
+    def take(self) -> Optional[str]:
+        """Devuelve una contraseña lista o None si la cola está vacía.
+
+        Si la configuración actual no es válida, relanza el error del generador.
+        """
+        with self._condition:
+            if self._error is not None:
+                raise self._error
+            if not self._queue:
+                return None
+            password = self._queue.popleft()
+            self._condition.notify_all()
+            return password
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and (self._settings is None or self._error is not None
+                                         or len(self._queue) >= self.size):
+                    self._condition.wait()
+                if not self._running:
+                    return
+                settings, generation = self._settings, self._generation
+            try:
+                password, error = self.generate(*settings), None
+            except Exception as e:
+                password, error = None, e
+            with self._condition:
+                # Se descarta el resultado si la configuración cambió mientras tanto
+                if generation != self._generation:
+                    continue
+                if error is not None:
+                    self._error = error
+                else:
+                    self._queue.append(password)
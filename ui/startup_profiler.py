@@ -0,0 +1,80 @@
+"""Medición del arranque de la interfaz: tiempo hasta la primera ventana e importaciones.
+
+Uso: python main.py --profile-startup [--json]
+"""
+import builtins
+import json
+import sys
+import time
+from typing import Dict, List, Optional, TextIO
+
+
+class ImportProfiler:
+    """Mide el tiempo de cada importación nueva mientras está activo.
+
+    Como python -X importtime, separa el tiempo propio de cada módulo del
+    acumulado con los módulos que importa a su vez. Las importaciones
+    relativas se cuentan dentro del módulo que las hace.
+    """
+
+    def __init__(self):
+        self.timings: List[Dict] = []
+        self._stack: List[List[float]] = []
+        self._original = None
+
+    def __enter__(self) -> "ImportProfiler":
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc) -> None:
+        builtins.__import__ = self._original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+        # [tiempo de los hijos] del módulo en curso
+        self._stack.append([0.0])
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = self._stack.pop()[0]
+            if self._stack:
+                self._stack[-1][0] += cumulative
+            self.timings.append({"module": name, "self": cumulative - children,
+                                 "cumulative": cumulative})
+
+    def slowest(self, limit: int = 15) -> List[Dict]:
+        """Importaciones ordenadas de más a menos tiempo acumulado."""
+        return sorted(self.timings, key=lambda t: t["cumulative"], reverse=True)[:limit]
+
+
+def profile_startup(json_output: bool = False, stream: Optional[TextIO] = None) -> Dict:
+    """Arranca la interfaz como main.py, mide el arranque y cierra la ventana."""
+    stream = stream or sys.stderr
+    start = time.perf_counter()
+    with ImportProfiler() as imports:
+        from ui.password_generator_ui import PasswordGeneratorUI
+
+        app = PasswordGeneratorUI(deferred=True)
+        app.window.update()
+        first_window = time.perf_counter() - start
+        app.show_first_frame()
+        app.window.update()
+        ready = time.perf_counter() - start
+    app.window.destroy()
+
+    report = {"time_to_first_window": first_window, "time_to_ready": ready,
+              "imports": imports.slowest()}
+    if json_output:
+        stream.write(json.dumps(report, indent=2) + "\n")
+    else:
+        stream.write(f"Ventana visible:   {first_window * 1000:8.1f} ms\n")
+        stream.write(f"Interfaz completa: {ready * 1000:8.1f} ms\n")
+        stream.write("Importaciones más lentas (ms acumulados / propios):\n")
+        for timing in report["imports"]:
+            stream.write(f"  {timing['cumulative'] * 1000:8.1f} {timing['self'] * 1000:8.1f}  "
+                         f"{timing['module']}\n")
+    return report
@@ -0,0 +1,114 @@
+"""Contraseñas guardadas en un único bytearray que se puede borrar.
+
+Un str no se puede modificar, así que una contraseña generada como str
+queda en memoria hasta que el recolector la libera. PasswordArena guarda
+muchas contraseñas en un solo bytearray, cada una en su ranura seguida
+del separador, y las expone como memoryview: el búfer entero se escribe
+en un archivo o socket sin convertirlo y se pone a cero con wipe().
+
+Las ranuras son de tamaño fijo (contraseñas de caracteres, todas de la
+misma longitud) o se localizan por desplazamientos (frases de contraseña).
+"""
+from array import array
+from typing import Iterator, Optional, Tuple
+
+# Tamaño de los trozos con los que se pone a cero un búfer
+_WIPE_CHUNK = 1 << 16
+_ZEROS = bytes(_WIPE_CHUNK)
+
+
+def wipe(buffer) -> None:
+    """Pone a cero un búfer modificable (bytearray, array...) sin cambiar su tamaño ni copiarlo."""
+    view = memoryview(buffer).cast("B")
+    if view.nbytes <= _WIPE_CHUNK:
+        view[:] = _ZEROS[:view.nbytes]
+        view.release()
+        return
+    for start in range(0, view.nbytes, _WIPE_CHUNK):
+        end = min(start + _WIPE_CHUNK, view.nbytes)
+        view[start:end] = _ZEROS[:end - start]
+    view.release()
+
+
+class PasswordArena:
+    """Contraseñas consecutivas en un bytearray, cada una terminada en separator.
+
+    Con offsets=None todas las ranuras miden stride bytes; si no, la
+    contraseña i ocupa buffer[offsets[i]:offsets[i + 1] - len(separator)].
+    """
+
+    __slots__ = ("buffer", "separator", "stride", "_count", "_offsets")
+
+    def __init__(self, buffer: bytearray, count: int, separator: bytes = b"\n",
+                 stride: int = 0, offsets: Optional[array] = None):
+        self.buffer = buffer
+        self.separator = separator
+        self.stride = stride
+        self._count = count
+        self._offsets = offsets
+
+    @classmethod
+    def fixed(cls, count: int, length: int, separator: bytes = b"\n") -> "PasswordArena":
+        """Reserva count ranuras de length bytes, con los separadores ya escritos."""
+        if count < 0:
+            raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+        stride = length + len(separator)
+        buffer = bytearray(count * stride)
+        for i, byte in enumerate(separator):
+            buffer[length + i::stride] = bytes((byte,)) * count
+        return cls(buffer, count, separator, stride)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def bounds(self, i: int) -> Tuple[int, int]:
+        """Inicio y fin de la contraseña i dentro del búfer."""
+        if not 0 <= i < self._count:
+            raise IndexError("Índice de contraseña fuera de rango.")
+        if self._offsets is None:
+            start = i * self.stride
+            return start, start + self.stride - len(self.separator)
+        return self._offsets[i], self._offsets[i + 1] - len(self.separator)
+
+    def __getitem__(self, i: int) -> memoryview:
+        """Vista (sin copia) de la contraseña i, sin el separador."""
+        if i < 0:
+            i += self._count
+        start, end = self.bounds(i)
+        return memoryview(self.buffer)[start:end]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for i in range(self._count):
+            yield self[i]
+
+    def write_block(self, first: int, block, length: int) -> None:
+        """Copia en las ranuras first, first + 1... las contraseñas consecutivas de block.
+
+        Cada contraseña de block mide length bytes. Se copia columna a
+        columna, con una asignación por posición en lugar de una por
+        contraseña.
+        """
+        if self._offsets is not None or length != self.stride - len(self.separator):
+            raise ValueError("Solo se pueden copiar bloques en ranuras de la misma longitud.")
+        count = len(block) // length
+        if first < 0 or first + count > self._count:
+            raise IndexError("El bloque no cabe en la reserva.")
+        start, end = first * self.stride, (first + count) * self.stride
+        source = memoryview(block)
+        for j in range(length):
+            self.buffer[start + j:end:self.stride] = source[j::length]
+        source.release()
+
+    def view(self) -> memoryview:
+        """Vista de todo el búfer, lista para output.write()."""
+        return memoryview(self.buffer)
+
+    def wipe(self) -> None:
+        """Pone a cero todas las contraseñas (y los separadores)."""
+        wipe(self.buffer)
+
+    def __enter__(self) -> "PasswordArena":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wipe()
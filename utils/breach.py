@@ -0,0 +1,228 @@
+"""Comprobación sin conexión de contraseñas filtradas.
+
+Usa el archivo de Have I Been Pwned ordenado por hash: una línea
+"SHA1:APARICIONES" por contraseña, con el SHA-1 en hexadecimal en mayúsculas.
+El archivo se proyecta en memoria y se busca por bisección, así que solo se
+leen las páginas visitadas. Un índice opcional (RUTA.idx) con el desplazamiento
+de cada prefijo de BreachConfig.INDEX_DIGITS cifras hexadecimales reduce cada búsqueda a
+unas pocas páginas.
+
+Uso: python -m utils.breach RUTA [--build-index] [--digits 5] < contraseñas.txt
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from utils.config import BreachConfig
+
+HASH_LENGTH = 40
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"PWBX"
+_INDEX_VERSION = 1
+# magia, versión, cifras del prefijo, tamaño y fecha del archivo indexado
+_INDEX_HEADER = struct.Struct("=4sIIQQ")
+
+
+def password_hash(password: str) -> bytes:
+    """SHA-1 de la contraseña en hexadecimal en mayúsculas, como en el archivo."""
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper().encode("ascii")
+
+
+def _lower_bound(data, target: bytes, lo: int, hi: int) -> int:
+    """Inicio de la primera línea de data[lo:hi] cuyo hash no es menor que target.
+
+    lo y hi deben ser inicios de línea (o el final del archivo).
+    """
+    while lo < hi:
+        mid = (lo + hi) // 2
+        newline = data.rfind(b"\n", lo, mid)
+        start = newline + 1 if newline >= 0 else lo
+        if data[start:start + HASH_LENGTH] < target:
+            end = data.find(b"\n", start, hi)
+            lo = end + 1 if end >= 0 else hi
+        else:
+            hi = start
+    return lo
+
+
+def build_index(path: str, digits: int = BreachConfig.INDEX_DIGITS,
+                index_path: Optional[str] = None) -> str:
+    """Construye el índice de prefijos del archivo y devuelve su ruta."""
+    if not 1 <= digits <= 8:
+        raise ValueError("El prefijo del índice debe tener entre 1 y 8 cifras.")
+    index_path = index_path or path + INDEX_SUFFIX
+    stat = os.stat(path)
+    tmp_path = index_path + ".tmp"
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        with open(tmp_path, "wb") as out:
+            out.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, digits,
+                                         stat.st_size, stat.st_mtime_ns))
+            # Cada prefijo empieza donde lo haría su hash más pequeño; la
+            # búsqueda parte del prefijo anterior, así que el archivo se
+            # recorre una sola vez hacia delante
+            offset = 0
+            padding = b"0" * (HASH_LENGTH - digits)
+            for prefix in range(16 ** digits):
+                target = f"{prefix:0{digits}X}".encode("ascii") + padding
+                offset = _lower_bound(data, target, offset, len(data))
+                out.write(struct.pack("=Q", offset))
+            out.write(struct.pack("=Q", len(data)))
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+class BreachCorpus:
+    """Archivo de contraseñas filtradas proyectado en memoria."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        stat = os.stat(path)
+        if stat.st_size == 0:
+            raise ValueError("La lista de contraseñas filtradas está vacía.")
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index = None
+        self._offsets = None
+        self.digits = 0
+        self._open_index(stat)
+
+    def _open_index(self, stat: os.stat_result) -> None:
+        """Usa el índice si existe y corresponde a la versión actual del archivo."""
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) != _INDEX_HEADER.size:
+                    return
+                magic, version, digits, size, mtime = _INDEX_HEADER.unpack(header)
+                expected = _INDEX_HEADER.size + (16 ** digits + 1) * 8
+                if (magic != _INDEX_MAGIC or version != _INDEX_VERSION or size != stat.st_size
+                        or mtime != stat.st_mtime_ns or os.fstat(f.fileno()).st_size != expected):
+                    return
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return
+        self._offsets = memoryview(self._index)[_INDEX_HEADER.size:].cast("Q")
+        self.digits = digits
+
+    @property
+    def indexed(self) -> bool:
+        """Indica si las búsquedas usan el índice de prefijos."""
+        return self._offsets is not None
+
+    def _bounds(self, target: bytes) -> Tuple[int, int]:
+        """Zona del archivo en la que puede estar target."""
+        if self._offsets is None:
+            return 0, len(self._data)
+        prefix = int(target[:self.digits], 16)
+        return self._offsets[prefix], self._offsets[prefix + 1]
+
+    def _count_at(self, position: int, target: bytes) -> int:
+        """Apariciones de target si la línea en position es la suya; 0 si no."""
+        data = self._data
+        if data[position:position + HASH_LENGTH] != target:
+            return 0
+        end = data.find(b"\n", position)
+        field = data[position + HASH_LENGTH + 1:end if end >= 0 else len(data)].strip()
+        return int(field) if field else 1
+
+    def count_hash(self, sha1_hex: str) -> int:
+        """Veces que aparece en el archivo el SHA-1 dado (0 si no está)."""
+        target = sha1_hex.upper().encode("ascii")
+        lo, hi = self._bounds(target)
+        return self._count_at(_lower_bound(self._data, target, lo, hi), target)
+
+    def count(self, password: str) -> int:
+        """Veces que aparece la contraseña en las filtraciones (0 si no está)."""
+        return self.count_hash(password_hash(password).decode("ascii"))
+
+    def __contains__(self, password: str) -> bool:
+        return self.count(password) > 0
+
+    def count_many(self, passwords: Sequence[str]) -> List[int]:
+        """Como count(), para un lote: ordena los hashes y recorre el archivo una vez."""
+        hashes = [password_hash(password) for password in passwords]
+        counts = [0] * len(hashes)
+        position = 0
+        for i in sorted(range(len(hashes)), key=hashes.__getitem__):
+            target = hashes[i]
+            lo, hi = self._bounds(target)
+            # Los hashes llegan en orden, así que la búsqueda nunca retrocede
+            position = _lower_bound(self._data, target, max(lo, position), hi)
+            counts[i] = self._count_at(position, target)
+        return counts
+
+    def filter_safe(self, passwords: Iterable[str]) -> List[str]:
+        """Devuelve, en orden, las contraseñas que no aparecen en las filtraciones."""
+        passwords = list(passwords)
+        return [p for p, hits in zip(passwords, self.count_many(passwords)) if not hits]
+
+    def close(self) -> None:
+        """Libera las proyecciones en memoria."""
+        if self._offsets is not None:
+            self._offsets.release()
+            self._index.close()
+        self._data.close()
+
+    def __enter__(self) -> "BreachCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=4)
+def open_corpus(path: str) -> BreachCorpus:
+    """Devuelve el archivo proyectado para path, abriéndolo una sola vez."""
+    return BreachCorpus(path)
+
+
+def load_corpus(path: Optional[str] = None) -> BreachCorpus:
+    """Abre (una sola vez) el archivo indicado o el configurado por defecto."""
+    path = path or BreachConfig.CORPUS_PATH
+    try:
+        return open_corpus(path)
+    except FileNotFoundError:
+        raise ValueError(f"No se encontró la lista de contraseñas filtradas: {path}")
+
+
+def default_corpus() -> Optional[BreachCorpus]:
+    """El archivo configurado por defecto, o None si no está instalado."""
+    if not os.path.exists(BreachConfig.CORPUS_PATH):
+        return None
+    return load_corpus(BreachConfig.CORPUS_PATH)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Escribe "APARICIONES<tab>CONTRASEÑA" para cada contraseña de la entrada estándar."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", default=BreachConfig.CORPUS_PATH,
+                        help="archivo SHA-1 ordenado por hash")
+    parser.add_argument("--build-index", action="store_true",
+                        help="construir el índice de prefijos y salir")
+    parser.add_argument("--digits", type=int, default=BreachConfig.INDEX_DIGITS,
+                        help=f"cifras hexadecimales del prefijo (por defecto: "
+                             f"{BreachConfig.INDEX_DIGITS})")
+    args = parser.parse_args(argv)
+    try:
+        if args.build_index:
+            print(build_index(args.corpus, args.digits))
+            return 0
+        corpus = load_corpus(args.corpus)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    passwords = [line.rstrip("\r\n") for line in sys.stdin]
+    for password, count in zip(passwords, corpus.count_many(passwords)):
+        print(f"{count}\t{password}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
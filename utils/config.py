@@ -1,14 +1,26 @@
+import os
 from dataclasses import dataclass
 
+# Carpeta raíz del proyecto, para localizar los archivos de datos
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 @dataclass
 class UIConfig:
     """Configuración de la interfaz de usuario."""
-    WINDOW_SIZE: str = "500x650"
+    WINDOW_SIZE: str = "500x700"
     FONT_FAMILY: str = "Helvetica Neue"
     DEFAULT_PASSWORD_LENGTH: int = 12
     MIN_PASSWORD_LENGTH: int = 4
     MAX_PASSWORD_LENGTH: int = 32
     PADDING: int = 20
+    PREFETCH_SIZE: int = 8
+    PREFETCH_POLL_MS: int = 10
+    MODE_CHARACTERS: str = "Caracteres"
+    MODE_PASSPHRASE: str = "Frase"
+    # Variante del modo de caracteres que usa el modelo de Markov
+    MODE_PRONOUNCEABLE: str = "Pronunciable"
+    # Tiempo máximo hasta que se ve la ventana (lo comprueban las pruebas)
+    STARTUP_BUDGET_SECONDS: float = 1.5
 
 @dataclass
 class UIColors:
@@ -24,3 +36,52 @@ class MessageColors:
     SUCCESS: str = "green"
     ERROR: str = "red"
     WARNING: str = "orange"
+
+@dataclass
+class PassphraseConfig:
+    """Configuración del modo de frase de contraseña."""
+    WORDLIST_PATH: str = os.path.join(PROJECT_ROOT, "data", "wordlist.txt")
+    DEFAULT_WORDS: int = 6
+    MIN_WORDS: int = 3
+    MAX_WORDS: int = 12
+    SEPARATOR: str = "-"
+
+@dataclass
+class MarkovConfig:
+    """Configuración del modo de contraseñas pronunciables."""
+    MODEL_PATH: str = os.path.join(PROJECT_ROOT, "data", "markov.bin")
+    # Caracteres anteriores que forman el contexto de cada transición
+    ORDER: int = 2
+    ALPHABET: str = "abcdefghijklmnopqrstuvwxyz"
+
+@dataclass
+class MetricsConfig:
+    """Configuración de las métricas de rendimiento de la interfaz."""
+    # Archivo (.json o .prom) donde guardar las métricas al cerrar; vacío las desactiva
+    EXPORT_PATH: str = os.environ.get("PASSWORD_GENERATOR_METRICS", "")
+    # Puerto local para servir /metrics; 0 no abre ninguno
+    HTTP_PORT: int = int(os.environ.get("PASSWORD_GENERATOR_METRICS_PORT", "0"))
+
+@dataclass
+class BreachConfig:
+    """Configuración de la comprobación de contraseñas filtradas."""
+    CORPUS_PATH: str = os.path.join(PROJECT_ROOT, "data", "pwned-passwords-sha1.txt")
+    INDEX_DIGITS: int = 5
+    # Candidatos seguidos encontrados en las filtraciones antes de desistir
+    MAX_CONSECUTIVE_REJECTIONS: int = 512
+
+@dataclass
+class ExportConfig:
+    """Configuración de la exportación de credenciales."""
+    ID_COLUMN: str = "username"
+    PASSWORD_COLUMN: str = "password"
+    GZIP_LEVEL: int = 6
+    ZSTD_LEVEL: int = 3
+    # Texto sin cifrar por trama de la bóveda
+    VAULT_FRAME_SIZE: int = 1 << 20
+    # Parámetros de scrypt para derivar la clave de la bóveda (n = 2 ** VAULT_SCRYPT_LOG_N)
+    VAULT_SCRYPT_LOG_N: int = 15
+    VAULT_SCRYPT_R: int = 8
+    VAULT_SCRYPT_P: int = 1
+    # Variable de entorno con la clave; si no existe se pide por teclado
+    VAULT_KEY_ENV: str = "PASSWORD_GENERATOR_VAULT_KEY"
@@ -0,0 +1,150 @@
+import os
+import threading
+import weakref
+from typing import Dict, MutableSequence, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Tamaño del bloque leído del SO en cada recarga
+POOL_BLOCK_SIZE = 1 << 16
+# Bytes restantes por debajo de los cuales se recarga el búfer
+POOL_REFILL_THRESHOLD = 64
+
+_pools = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    """Descarta la entropía heredada por el proceso hijo tras fork()."""
+    for pool in list(_pools):
+        pool._reseed()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class EntropyPool:
+    """Reserva de bytes aleatorios del SO leída en bloques grandes.
+
+    Agrupa muchas lecturas pequeñas en pocas llamadas a os.urandom. Es segura
+    entre hilos y, tras un fork(), el proceso hijo descarta los bytes heredados
+    para no repetir los del padre.
+    """
+
+    # Apta para credenciales reales (ver utils.rng.require_secure)
+    secure = True
+
+    def __init__(self, block_size: int = POOL_BLOCK_SIZE,
+                 refill_threshold: int = POOL_REFILL_THRESHOLD):
+        if block_size <= 0:
+            raise ValueError("El tamaño de bloque debe ser mayor que 0.")
+        self.block_size = block_size
+        self.refill_threshold = min(refill_threshold, block_size)
+        self._lock = threading.Lock()
+        self._reset_counters()
+        self._reseed()
+        _pools.add(self)
+
+    def _reset_counters(self) -> None:
+        self.syscalls = 0
+        self.requests = 0
+        self.bytes_drawn = 0
+        self.bytes_consumed = 0
+        self.passwords = 0
+
+    def _reseed(self) -> None:
+        """Vacía el búfer; la siguiente lectura lo recarga desde el SO."""
+        self._lock = threading.Lock()
+        self._buffer = bytearray(self.block_size)
+        self._view = memoryview(self._buffer)
+        self._pos = self.block_size
+        self._pid = os.getpid()
+
+    def _refill(self) -> None:
+        remaining = self.block_size - self._pos
+        # Copia previa: el resto y su destino pueden solaparse en el mismo búfer
+        tail = bytes(self._view[self._pos:])
+        self._buffer[:remaining] = tail
+        self._buffer[remaining:] = os.urandom(self.block_size - remaining)
+        self.syscalls += 1
+        self.bytes_drawn += self.block_size - remaining
+        self._pos = 0
+
+    def read(self, n: int) -> bytes:
+        """Devuelve n bytes aleatorios."""
+        if os.getpid() != self._pid:
+            # Respaldo para plataformas sin os.register_at_fork
+            self._reseed()
+        with self._lock:
+            self.requests += 1
+            self.bytes_consumed += n
+            if n > self.block_size - self.refill_threshold:
+                self.syscalls += 1
+                self.bytes_drawn += n
+                return os.urandom(n)
+            pos = self._pos
+            if self.block_size - pos < n + self.refill_threshold:
+                self._refill()
+                pos = 0
+            self._pos = pos + n
+            return self._view[pos:pos + n].tobytes()
+
+    def randbelow(self, n: int) -> int:
+        """Devuelve un entero uniforme en [0, n) por muestreo por rechazo."""
+        if n <= 0:
+            raise ValueError("El límite superior debe ser mayor que 0.")
+        bits = n.bit_length()
+        size = (bits + 7) // 8
+        mask = (1 << bits) - 1
+        while True:
+            value = int.from_bytes(self.read(size), "big") & mask
+            if value < n:
+                return value
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """Elige un elemento uniforme de una secuencia no vacía."""
+        if not seq:
+            raise IndexError("No se puede elegir de una secuencia vacía.")
+        return seq[self.randbelow(len(seq))]
+
+    def shuffle(self, items: MutableSequence) -> None:
+        """Mezcla la lista en su lugar con Fisher-Yates."""
+        for i in range(len(items) - 1, 0, -1):
+            j = self.randbelow(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+    def record_passwords(self, count: int) -> None:
+        """Anota contraseñas generadas para calcular los bytes usados por contraseña."""
+        with self._lock:
+            self.passwords += count
+
+    def stats(self) -> Dict[str, float]:
+        """Devuelve los contadores de uso de la reserva."""
+        with self._lock:
+            return {
+                "syscalls": self.syscalls,
+                "syscalls_saved": max(self.requests - self.syscalls, 0),
+                "bytes_drawn": self.bytes_drawn,
+                "bytes_consumed": self.bytes_consumed,
+                "passwords": self.passwords,
+                "bytes_per_password": self.bytes_consumed / self.passwords if self.passwords else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        """Pone a cero los contadores sin tocar el búfer."""
+        with self._lock:
+            self._reset_counters()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> EntropyPool:
+    """Devuelve la reserva compartida por todo el proceso."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = EntropyPool()
+    return _default_pool
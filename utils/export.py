@@ -0,0 +1,328 @@
+"""Exportación en flujo de credenciales: cada identificador con una contraseña nueva.
+
+Lee los identificadores de un CSV fila a fila, genera las contraseñas por
+bloques con PasswordGenerator y escribe cada bloque de una vez en CSV o JSON
+Lines, opcionalmente comprimido (gzip o zstd) y cifrado. La memoria usada no
+depende del número de filas.
+
+La bóveda cifrada empieza con una cabecera con la sal y los parámetros de
+scrypt, y sigue con tramas AES-256-GCM de hasta ExportConfig.VAULT_FRAME_SIZE
+bytes. El nonce de cada trama es su número y la última va marcada, así que
+se detecta cualquier trama cambiada de orden, quitada o truncada. El cifrado
+requiere el paquete cryptography, y zstd el paquete zstandard.
+
+Uso: python -m utils.export usuarios.csv -o cuentas.csv.gz [--column username]
+"""
+import csv
+import gzip
+import hashlib
+import importlib
+import io
+import os
+import struct
+import sys
+from contextlib import ExitStack
+from itertools import chain, islice, repeat
+from operator import itemgetter
+from json.encoder import encode_basestring
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from utils.arena import wipe
+from utils.config import ExportConfig, UIConfig
+from utils.entropy_pool import get_default_pool
+from utils.password_generator import (BATCH_CHUNK_SIZE, OUTPUT_BUFFER_SIZE, PasswordGenerator,
+                                      add_policy_arguments, policy_constraints)
+from utils.rng import RandomStream, require_secure
+
+FORMATS = ("csv", "jsonl")
+COMPRESSIONS = ("gzip", "zstd")
+VAULT_SUFFIX = ".vault"
+_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+_VAULT_MAGIC = b"PWVAULT1"
+_SALT_SIZE = 16
+# magia, sal y log2(n), r y p de scrypt
+_VAULT_HEADER = struct.Struct(f"=8s{_SALT_SIZE}sBBB")
+# longitud del texto cifrado y 1 si es la última trama
+_FRAME_HEADER = struct.Struct("=IB")
+
+
+def _require(module: str, feature: str):
+    """Importa una dependencia opcional o explica cómo instalarla."""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ValueError(f"{feature} requiere el paquete {module.split('.')[0]} "
+                         f"(pip install {module.split('.')[0]}).")
+
+
+def _aead(passphrase: str, salt: bytes, log_n: int, r: int, p: int):
+    """AES-256-GCM con la clave derivada de passphrase mediante scrypt."""
+    aead = _require("cryptography.hazmat.primitives.ciphers.aead", "El cifrado")
+    key = hashlib.scrypt(passphrase.encode("utf-8"), salt=salt, n=2 ** log_n, r=r, p=p,
+                         maxmem=256 * r * 2 ** log_n, dklen=32)
+    return aead.AESGCM(key)
+
+
+def _frame_nonce(frame: int) -> bytes:
+    return frame.to_bytes(12, "big")
+
+
+class VaultWriter:
+    """Archivo binario de solo escritura que cifra lo que recibe por tramas.
+
+    No cierra fileobj al cerrarse, igual que gzip.GzipFile.
+    """
+
+    def __init__(self, fileobj: BinaryIO, passphrase: str):
+        salt = os.urandom(_SALT_SIZE)
+        params = (ExportConfig.VAULT_SCRYPT_LOG_N, ExportConfig.VAULT_SCRYPT_R,
+                  ExportConfig.VAULT_SCRYPT_P)
+        self._aead = _aead(passphrase, salt, *params)
+        self._fileobj = fileobj
+        self._buffer = bytearray()
+        self._frame = 0
+        fileobj.write(_VAULT_HEADER.pack(_VAULT_MAGIC, salt, *params))
+
+    def _write_frame(self, data, final: bool) -> None:
+        flag = bytes((final,))
+        ciphertext = self._aead.encrypt(_frame_nonce(self._frame), data, flag)
+        self._fileobj.write(_FRAME_HEADER.pack(len(ciphertext), final))
+        self._fileobj.write(ciphertext)
+        self._frame += 1
+
+    def write(self, data) -> int:
+        self._buffer += data
+        size = ExportConfig.VAULT_FRAME_SIZE
+        if len(self._buffer) >= size:
+            view = memoryview(self._buffer)
+            frames = len(self._buffer) // size
+            for start in range(0, frames * size, size):
+                self._write_frame(view[start:start + size], final=False)
+            wipe(view[:frames * size])
+            view.release()
+            del self._buffer[:frames * size]
+        return len(data)
+
+    def close(self) -> None:
+        if self._buffer is None:
+            return
+        self._write_frame(self._buffer, final=True)
+        wipe(self._buffer)
+        self._buffer = None
+
+    def __enter__(self) -> "VaultWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._buffer is not None:
+            # Una exportación interrumpida no se marca como completa: sin la
+            # trama final, read_vault() la rechaza por truncada
+            wipe(self._buffer)
+            self._buffer = None
+
+
+def read_vault(fileobj: BinaryIO, passphrase: str) -> Iterator[bytes]:
+    """Produce, trama a trama, el contenido descifrado de una bóveda."""
+    header = fileobj.read(_VAULT_HEADER.size)
+    if len(header) != _VAULT_HEADER.size or header[:len(_VAULT_MAGIC)] != _VAULT_MAGIC:
+        raise ValueError("El archivo no es una bóveda de contraseñas.")
+    _, salt, log_n, r, p = _VAULT_HEADER.unpack(header)
+    aead = _aead(passphrase, salt, log_n, r, p)
+    invalid_tag = _require("cryptography.exceptions", "El cifrado").InvalidTag
+    frame = 0
+    while True:
+        frame_header = fileobj.read(_FRAME_HEADER.size)
+        if len(frame_header) != _FRAME_HEADER.size:
+            raise ValueError("La bóveda está truncada.")
+        size, final = _FRAME_HEADER.unpack(frame_header)
+        ciphertext = fileobj.read(size)
+        try:
+            yield aead.decrypt(_frame_nonce(frame), ciphertext, bytes((final,)))
+        except invalid_tag:
+            raise ValueError("Clave incorrecta o bóveda dañada.")
+        if final:
+            return
+        frame += 1
+
+
+def read_identifiers(rows: Iterable[str], column: str = ExportConfig.ID_COLUMN) -> Iterator[str]:
+    """Iterador perezoso sobre la columna column de un CSV; la cabecera se lee al llamar."""
+    reader = csv.reader(rows)
+    header = next(reader, None)
+    if header is None or column not in header:
+        raise ValueError(f"El CSV de entrada no tiene la columna '{column}'.")
+    return _column_values(reader, header.index(column), column)
+
+
+def _column_values(reader, index: int, column: str) -> Iterator[str]:
+    # Se salta las filas vacías sin pasar por código Python en cada fila
+    try:
+        yield from map(itemgetter(index), filter(None, reader))
+    except IndexError:
+        raise ValueError(f"La fila {reader.line_num} del CSV de entrada no tiene la "
+                         f"columna '{column}'.") from None
+
+
+def _format_csv(rows: Iterable[Tuple[str, str]]) -> bytes:
+    text = io.StringIO()
+    csv.writer(text, lineterminator="\n").writerows(rows)
+    return text.getvalue().encode("utf-8")
+
+
+def _format_jsonl(identifiers: Sequence[str], passwords: Sequence[str], id_column: str) -> bytes:
+    prefix = "{" + encode_basestring(id_column) + ": "
+    middle = ", " + encode_basestring(ExportConfig.PASSWORD_COLUMN) + ": "
+    # Las piezas de cada línea se intercalan sin ejecutar código Python por fila
+    parts = zip(repeat(prefix), map(encode_basestring, identifiers), repeat(middle),
+                map(encode_basestring, passwords), repeat("}\n"))
+    return "".join(chain.from_iterable(parts)).encode("utf-8")
+
+
+def infer_output(path: str) -> Tuple[str, Optional[str], bool]:
+    """Formato, compresión y cifrado que indica el nombre de archivo (cuentas.jsonl.gz.vault)."""
+    root, suffix = os.path.splitext(path)
+    encrypted = suffix == VAULT_SUFFIX
+    if encrypted:
+        root, suffix = os.path.splitext(root)
+    compression = _SUFFIXES.get(suffix)
+    if compression:
+        root, suffix = os.path.splitext(root)
+    return ("jsonl" if suffix == ".jsonl" else "csv"), compression, encrypted
+
+
+def _open_layers(stack: ExitStack, output: BinaryIO, compression: Optional[str],
+                 passphrase: Optional[str]) -> BinaryIO:
+    """Apila sobre output el cifrado y, encima, la compresión."""
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Compresión desconocida: {compression}.")
+    stream = output
+    if passphrase is not None:
+        stream = stack.enter_context(VaultWriter(stream, passphrase))
+    if compression == "gzip":
+        stream = stack.enter_context(gzip.GzipFile(fileobj=stream, mode="wb",
+                                                   compresslevel=ExportConfig.GZIP_LEVEL))
+    elif compression == "zstd":
+        zstandard = _require("zstandard", "La compresión zstd")
+        compressor = zstandard.ZstdCompressor(level=ExportConfig.ZSTD_LEVEL)
+        stream = stack.enter_context(compressor.stream_writer(stream, closefd=False))
+    return stream
+
+
+def export_credentials(identifiers: Iterable[str], output: BinaryIO, fmt: str = "csv",
+                       length: int = UIConfig.DEFAULT_PASSWORD_LENGTH, use_symbols: bool = True,
+                       use_numbers: bool = True, use_uppercase: bool = True,
+                       use_lowercase: bool = True, compression: Optional[str] = None,
+                       passphrase: Optional[str] = None,
+                       id_column: str = ExportConfig.ID_COLUMN,
+                       chunk_size: int = BATCH_CHUNK_SIZE,
+                       pool: Optional[RandomStream] = None, **constraints) -> int:
+    """Escribe en output cada identificador con una contraseña generada y devuelve cuántos.
+
+    Los identificadores se consumen de chunk_size en chunk_size; cada bloque
+    se genera y se escribe de una sola vez. Con passphrase la salida es una
+    bóveda cifrada. pool debe ser un flujo seguro: las credenciales
+    exportadas son reales. constraints se pasa a compile_policy().
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconocido: {fmt}.")
+    pool = require_secure(pool or get_default_pool())
+    identifiers = iter(identifiers)
+    rows = 0
+    with ExitStack() as stack:
+        stream = _open_layers(stack, output, compression, passphrase)
+        if fmt == "csv":
+            stream.write(_format_csv([(id_column, ExportConfig.PASSWORD_COLUMN)]))
+        while True:
+            chunk: List[str] = list(islice(identifiers, chunk_size))
+            if not chunk:
+                break
+            passwords = PasswordGenerator.generate_batch(len(chunk), length, use_symbols,
+                                                         use_numbers, use_uppercase,
+                                                         use_lowercase, pool=pool, **constraints)
+            stream.write(_format_csv(zip(chunk, passwords)) if fmt == "csv"
+                         else _format_jsonl(chunk, passwords, id_column))
+            rows += len(chunk)
+    return rows
+
+
+def _vault_key(prompt: str) -> str:
+    """Clave de la bóveda: de la variable de entorno o pedida por teclado."""
+    key = os.environ.get(ExportConfig.VAULT_KEY_ENV)
+    if key is None:
+        import getpass
+
+        key = getpass.getpass(prompt)
+    if not key:
+        raise ValueError("La clave de la bóveda no puede estar vacía.")
+    return key
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Punto de entrada de consola: exporta credenciales o descifra una bóveda."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.export", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV con cabecera; '-' para la entrada estándar")
+    parser.add_argument("--column", default=ExportConfig.ID_COLUMN,
+                        help=f"columna con los identificadores (por defecto: "
+                             f"{ExportConfig.ID_COLUMN})")
+    parser.add_argument("-o", "--output", default="-",
+                        help="archivo de salida; '-' para la salida estándar (por defecto). "
+                             "La extensión elige el formato: .csv, .jsonl, .gz, .zst, .vault")
+    parser.add_argument("--format", choices=FORMATS, help="formato de las filas")
+    parser.add_argument("--compress", choices=COMPRESSIONS, help="comprimir la salida")
+    parser.add_argument("--encrypt", action="store_true",
+                        help=f"guardar en una bóveda cifrada (clave en "
+                             f"{ExportConfig.VAULT_KEY_ENV} o pedida por teclado)")
+    parser.add_argument("--decrypt", action="store_true",
+                        help="descifrar la bóveda de la entrada en lugar de exportar")
+    add_policy_arguments(parser)
+    args = parser.parse_args(argv)
+    if not UIConfig.MIN_PASSWORD_LENGTH <= args.length <= UIConfig.MAX_PASSWORD_LENGTH:
+        parser.error(f"--length debe estar entre {UIConfig.MIN_PASSWORD_LENGTH} "
+                     f"y {UIConfig.MAX_PASSWORD_LENGTH}")
+    fmt, compression, encrypted = infer_output(args.output)
+    source = args.input if args.input != "-" else sys.stdin.fileno()
+
+    try:
+        with ExitStack() as stack:
+            # La entrada se abre y se valida antes de truncar la salida
+            if args.decrypt:
+                vault = stack.enter_context(open(source, "rb", closefd=args.input != "-"))
+                frames = read_vault(vault, _vault_key("Clave de la bóveda: "))
+                # La primera trama comprueba la clave
+                frames = chain([next(frames)], frames)
+            else:
+                rows = stack.enter_context(open(source, newline="", encoding="utf-8",
+                                                closefd=args.input != "-"))
+                identifiers = read_identifiers(rows, args.column)
+                passphrase = (_vault_key("Clave para la nueva bóveda: ")
+                              if args.encrypt or encrypted else None)
+            if args.output == "-":
+                output = open(sys.stdout.fileno(), "wb", buffering=OUTPUT_BUFFER_SIZE,
+                              closefd=False)
+            else:
+                output = open(args.output, "wb", buffering=OUTPUT_BUFFER_SIZE)
+            output = stack.enter_context(output)
+            if args.decrypt:
+                for data in frames:
+                    output.write(data)
+                return 0
+            export_credentials(identifiers, output, args.format or fmt, args.length,
+                               args.use_symbols, args.use_numbers, args.use_uppercase,
+                               args.use_lowercase, compression=args.compress or compression,
+                               passphrase=passphrase, id_column=args.column,
+                               **policy_constraints(args))
+    except BrokenPipeError:
+        # La salida se cerró antes de tiempo (por ejemplo, con `| head`)
+        sys.stderr.close()
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
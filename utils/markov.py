@@ -0,0 +1,243 @@
+"""Contraseñas pronunciables generadas con un modelo de Markov de caracteres.
+
+El modelo se entrena una vez con un corpus local (por ejemplo, la lista de
+palabras) y se guarda en un archivo binario que se proyecta en memoria. Cada
+contexto (los order caracteres anteriores, o el inicio de palabra) tiene una
+fila con los recuentos acumulados de cada carácter siguiente, así que elegir
+un carácter es un randbelow() y una bisección sobre la fila, sin preparar
+nada en cada llamada. Si un contexto no aparece en el corpus, la contraseña
+continúa como si empezara una palabra nueva.
+
+Cada carácter sale de exactamente un paso del modelo, de modo que la
+probabilidad de una contraseña es el producto de sus transiciones y la
+entropía que se informa es la real de la distribución generada, no una
+estimación.
+
+Uso: python -m utils.markov CORPUS [-o MODELO] [--order 2]
+     python -m utils.markov --entropy 14 [--model MODELO]
+"""
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.config import MarkovConfig
+
+_MODEL_MAGIC = b"PWMK"
+_MODEL_VERSION = 1
+# magia, versión, orden, tamaño del alfabeto y número de contextos; las filas
+# usan el orden de bytes de la máquina
+_MODEL_HEADER = struct.Struct("=4sIIII")
+
+
+def _context_count(order: int, size: int) -> int:
+    # Cada posición del contexto es el inicio de palabra (0) o un carácter (1..size)
+    return (size + 1) ** order
+
+
+def train(lines: Iterable[str], order: int = MarkovConfig.ORDER,
+          alphabet: str = MarkovConfig.ALPHABET) -> array:
+    """Recuentos acumulados de cada carácter tras cada contexto, fila a fila.
+
+    Cada palabra es una secuencia de caracteres del alfabeto (sin distinguir
+    mayúsculas); cualquier otro carácter la termina.
+    """
+    if order < 1:
+        raise ValueError("El orden del modelo debe ser al menos 1.")
+    size = len(alphabet)
+    contexts = _context_count(order, size)
+    symbol = {c: i for i, c in enumerate(alphabet)}
+    counts = array("I", bytes(4 * contexts * size))
+    for line in lines:
+        context = 0
+        for c in line.lower():
+            i = symbol.get(c)
+            if i is None:
+                context = 0
+                continue
+            counts[context * size + i] += 1
+            context = (context * (size + 1) + i + 1) % contexts
+    for base in range(0, len(counts), size):
+        for i in range(base + 1, base + size):
+            counts[i] += counts[i - 1]
+    if counts[size - 1] == 0:
+        raise ValueError("El corpus no contiene ninguna palabra con caracteres del alfabeto.")
+    return counts
+
+
+def build_model(corpus_path: str, model_path: Optional[str] = None,
+                order: int = MarkovConfig.ORDER, alphabet: str = MarkovConfig.ALPHABET) -> str:
+    """Entrena el modelo con el corpus y lo guarda; devuelve la ruta del modelo."""
+    model_path = model_path or MarkovConfig.MODEL_PATH
+    with open(corpus_path, encoding="utf-8", errors="ignore") as corpus:
+        counts = train(corpus, order, alphabet)
+    tmp_path = model_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_MODEL_HEADER.pack(_MODEL_MAGIC, _MODEL_VERSION, order, len(alphabet),
+                                   _context_count(order, len(alphabet))))
+        f.write(alphabet.encode("ascii"))
+        counts.tofile(f)
+    os.replace(tmp_path, model_path)
+    return model_path
+
+
+class MarkovModel:
+    """Modelo de Markov proyectado en memoria."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._data[:_MODEL_HEADER.size]
+        if len(header) != _MODEL_HEADER.size:
+            raise ValueError("El archivo no es un modelo de contraseñas pronunciables.")
+        magic, version, order, size, contexts = _MODEL_HEADER.unpack(header)
+        start = _MODEL_HEADER.size + size
+        if (magic != _MODEL_MAGIC or version != _MODEL_VERSION or size == 0
+                or contexts != _context_count(order, size)
+                or len(self._data) != start + 4 * contexts * size):
+            self._data.close()
+            raise ValueError("El archivo no es un modelo de contraseñas pronunciables.")
+        self.order = order
+        self.alphabet = self._data[_MODEL_HEADER.size:start].decode("ascii")
+        self.contexts = contexts
+        self._rows = memoryview(self._data)[start:].cast("I")
+        self._entropy: Dict[int, Tuple[float, float, int]] = {}
+
+    def _row(self, context: int) -> Tuple[int, int]:
+        """Inicio de la fila del contexto y su total; un contexto sin datos pasa al inicial."""
+        size = len(self.alphabet)
+        total = self._rows[context * size + size - 1]
+        if total == 0:
+            context = 0
+            total = self._rows[size - 1]
+        return context, total
+
+    def sample(self, stream, length: int) -> str:
+        """Genera una contraseña de length caracteres."""
+        size = len(self.alphabet)
+        rows = self._rows
+        context = 0
+        chars: List[str] = []
+        for _ in range(length):
+            context, total = self._row(context)
+            base = context * size
+            i = bisect_right(rows, stream.randbelow(total), base, base + size) - base
+            chars.append(self.alphabet[i])
+            context = (context * (size + 1) + i + 1) % self.contexts
+        return "".join(chars)
+
+    def _transitions(self, context: int):
+        """Pares (contexto siguiente, probabilidad) desde el contexto."""
+        size = len(self.alphabet)
+        context, total = self._row(context)
+        base = context * size
+        previous = 0
+        for i in range(size):
+            count = self._rows[base + i] - previous
+            previous += count
+            if count:
+                yield (context * (size + 1) + i + 1) % self.contexts, count / total
+
+    def _statistics(self, length: int) -> Tuple[float, float, int]:
+        """Entropía de Shannon, min-entropía y número de contraseñas posibles de longitud length."""
+        if length not in self._entropy:
+            # Probabilidad de estar en cada contexto, mejor log2 de la probabilidad
+            # de una contraseña que llega a él y contraseñas distintas que llegan
+            probability = [0.0] * self.contexts
+            best = [-math.inf] * self.contexts
+            paths = [0] * self.contexts
+            probability[0], best[0], paths[0] = 1.0, 0.0, 1
+            shannon = 0.0
+            for _ in range(length):
+                next_probability = [0.0] * self.contexts
+                next_best = [-math.inf] * self.contexts
+                next_paths = [0] * self.contexts
+                for context in range(self.contexts):
+                    if not paths[context]:
+                        continue
+                    for following, p in self._transitions(context):
+                        shannon -= probability[context] * p * math.log2(p)
+                        next_probability[following] += probability[context] * p
+                        next_best[following] = max(next_best[following],
+                                                   best[context] + math.log2(p))
+                        next_paths[following] += paths[context]
+                probability, best, paths = next_probability, next_best, next_paths
+            self._entropy[length] = (shannon, -max(best), sum(paths))
+        return self._entropy[length]
+
+    def entropy_bits(self, length: int) -> float:
+        """Entropía de Shannon exacta de una contraseña de length caracteres."""
+        return self._statistics(length)[0]
+
+    def min_entropy_bits(self, length: int) -> float:
+        """-log2 de la probabilidad de la contraseña más probable: la que primero se adivinaría."""
+        return self._statistics(length)[1]
+
+    def keyspace(self, length: int) -> int:
+        """Número de contraseñas distintas de length caracteres que puede generar el modelo."""
+        return self._statistics(length)[2]
+
+    def close(self) -> None:
+        """Libera la proyección en memoria."""
+        self._rows.release()
+        self._data.close()
+
+    def __enter__(self) -> "MarkovModel":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=4)
+def open_model(path: str) -> MarkovModel:
+    """Devuelve el modelo proyectado para path, abriéndolo una sola vez."""
+    return MarkovModel(path)
+
+
+def load_model(path: Optional[str] = None) -> MarkovModel:
+    """Abre (una sola vez) el modelo indicado o el configurado por defecto."""
+    path = path or MarkovConfig.MODEL_PATH
+    try:
+        return open_model(path)
+    except FileNotFoundError:
+        raise ValueError(f"No se encontró el modelo de contraseñas pronunciables: {path}. "
+                         f"Créelo con python -m utils.markov CORPUS.")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entrena un modelo o muestra la entropía de sus contraseñas."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.markov", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", help="texto o lista de palabras para entrenar")
+    parser.add_argument("-o", "--model", default=MarkovConfig.MODEL_PATH,
+                        help="archivo del modelo (por defecto: data/markov.bin)")
+    parser.add_argument("--order", type=int, default=MarkovConfig.ORDER,
+                        help=f"caracteres de contexto (por defecto: {MarkovConfig.ORDER})")
+    parser.add_argument("--entropy", type=int, metavar="LONGITUD",
+                        help="mostrar la entropía de las contraseñas de esta longitud")
+    args = parser.parse_args(argv)
+    if not args.corpus and args.entropy is None:
+        parser.error("indique un corpus para entrenar o --entropy LONGITUD")
+    try:
+        if args.corpus:
+            print(build_model(args.corpus, args.model, args.order))
+        if args.entropy is not None:
+            model = load_model(args.model)
+            print(f"Entropía:     {model.entropy_bits(args.entropy):.1f} bits")
+            print(f"Min-entropía: {model.min_entropy_bits(args.entropy):.1f} bits")
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
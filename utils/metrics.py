@@ -0,0 +1,211 @@
+"""Métricas de rendimiento: contadores e histogramas de latencia.
+
+Están desactivadas por defecto y entonces solo cuestan una comprobación de
+registry.enabled por llamada. Solo se guardan nombres fijos y números: nunca
+se registra ninguna contraseña ni nada derivado de ella.
+
+Una instantánea se exporta como JSON o en el formato de texto de Prometheus,
+a un archivo (export) o en un servidor HTTP local (serve).
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Tuple, TypeVar
+
+from utils.entropy_pool import get_default_pool
+
+F = TypeVar("F", bound=Callable)
+
+METRIC_PREFIX = "password_generator_"
+# Límites superiores (en segundos) de los intervalos de los histogramas
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    """Histograma de latencias con intervalos fijos."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Un intervalo más para los valores por encima del último límite
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict:
+        return {"buckets": list(self.buckets), "counts": list(self.counts),
+                "sum": self.sum, "count": self.count}
+
+
+class _Timer:
+    """Mide el tiempo de un bloque with y lo anota en el histograma name."""
+
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Contadores e histogramas con nombre, seguros entre hilos."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Pone a cero todas las métricas."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        """Suma amount al contador name."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Anota una latencia en el histograma name."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name: str):
+        """Contexto que mide la duración de su bloque."""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorador que mide cada llamada a la función en el histograma name."""
+        def decorate(func: F) -> F:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def snapshot(self) -> Dict:
+        """Copia de todas las métricas, con el uso de entropía de la reserva por defecto."""
+        stats = get_default_pool().stats()
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {name: h.to_dict() for name, h in self._histograms.items()}
+        counters["entropy_bytes_drawn_total"] = stats["bytes_drawn"]
+        counters["entropy_bytes_consumed_total"] = stats["bytes_consumed"]
+        counters["entropy_syscalls_total"] = stats["syscalls"]
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms}
+
+
+registry = MetricsRegistry()
+
+
+def to_json(snapshot: Dict) -> str:
+    return json.dumps(snapshot, indent=2, sort_keys=True)
+
+
+def to_prometheus(snapshot: Dict) -> str:
+    """Instantánea en el formato de texto de Prometheus."""
+    lines = []
+    for name, value in sorted(snapshot["counters"].items()):
+        name = METRIC_PREFIX + name
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value:g}")
+    for name, histogram in sorted(snapshot["histograms"].items()):
+        name = f"{METRIC_PREFIX}{name}_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(histogram["buckets"] + ["+Inf"], histogram["counts"]):
+            cumulative += count
+            le = bound if isinstance(bound, str) else f"{bound:g}"
+            lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum {histogram['sum']:g}")
+        lines.append(f"{name}_count {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def export(path: str, metrics: MetricsRegistry = registry) -> None:
+    """Guarda una instantánea; en formato Prometheus si path acaba en .prom, si no en JSON."""
+    snapshot = metrics.snapshot()
+    text = to_prometheus(snapshot) if path.endswith(".prom") else to_json(snapshot) + "\n"
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def serve(port: int, host: str = "127.0.0.1", metrics: MetricsRegistry = registry):
+    """Sirve /metrics (Prometheus) y /metrics.json en un hilo en segundo plano."""
+    # Importación diferida: http.server es lento de importar y casi nunca se usa
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = to_prometheus(metrics.snapshot()), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = to_json(metrics.snapshot()), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
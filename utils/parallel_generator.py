@@ -0,0 +1,230 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.breach import load_corpus
+from utils.config import PassphraseConfig
+from utils.markov import load_model
+from utils.password_generator import (BATCH_CHUNK_SIZE, PasswordGenerator, load_wordlist,
+                                      new_unique_filter)
+from utils.policy import compile_policy
+from utils.rng import create_stream, derive_seed
+from utils.template import compile_template
+
+# Bloques pendientes por proceso; limita la memoria usada mientras se fusionan
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _join_lines(lines: List[str]) -> bytearray:
+    return bytearray(("\n".join(lines) + "\n").encode("utf-8")) if lines else bytearray()
+
+
+def _generate_block(count: int, length: int, use_symbols: bool, use_numbers: bool,
+                    use_uppercase: bool, use_lowercase: bool, blocklist_path: Optional[str],
+                    constraints: Dict, seed: Optional[int] = None) -> bytearray:
+    """Genera un bloque de contraseñas separadas por saltos de línea.
+
+    Se ejecuta en el proceso de trabajo. La reserva de entropía descarta los
+    bytes heredados tras el fork, por lo que cada proceso usa su propia
+    entropía leída del SO. Cada proceso abre su propia proyección del archivo
+    de filtraciones. Sin ella, las contraseñas se escriben directamente en
+    una PasswordArena, cuyo búfer se puede borrar tras escribirlo. Con seed
+    el bloque sale de un SeededStream (no seguro, ver utils.rng).
+    """
+    pool = create_stream(seed)
+    if not blocklist_path:
+        return PasswordGenerator.generate_arena(count, length, use_symbols, use_numbers,
+                                                use_uppercase, use_lowercase, pool=pool,
+                                                **constraints).buffer
+    blocklist = load_corpus(blocklist_path)
+    return _join_lines(PasswordGenerator.generate_batch(count, length, use_symbols, use_numbers,
+                                                        use_uppercase, use_lowercase,
+                                                        blocklist=blocklist, pool=pool,
+                                                        **constraints))
+
+
+def _generate_passphrase_block(count: int, word_count: int, separator: str,
+                               wordlist_path: Optional[str],
+                               seed: Optional[int] = None) -> bytearray:
+    """Genera un bloque de frases de contraseña separadas por saltos de línea."""
+    return PasswordGenerator.generate_passphrase_arena(count, word_count, separator,
+                                                       wordlist_path,
+                                                       pool=create_stream(seed)).buffer
+
+
+def _generate_template_block(count: int, template: str, seed: Optional[int] = None) -> bytearray:
+    """Genera un bloque de contraseñas con la plantilla, separadas por saltos de línea."""
+    return PasswordGenerator.generate_template_arena(count, template,
+                                                     pool=create_stream(seed)).buffer
+
+
+def _generate_pronounceable_block(count: int, length: int, model_path: Optional[str],
+                                  seed: Optional[int] = None) -> bytearray:
+    """Genera un bloque de contraseñas pronunciables separadas por saltos de línea."""
+    return _join_lines([password for chunk in PasswordGenerator.iter_pronounceable_chunks(
+        count, length, model_path, pool=create_stream(seed)) for password in chunk])
+
+
+def _block_seeds(seed: Optional[int]) -> Iterator[Optional[int]]:
+    """Semilla de cada bloque sucesivo: derivada de seed, o None para usar la reserva del SO."""
+    if seed is None:
+        return itertools.repeat(None)
+    return (derive_seed(seed, index) for index in itertools.count())
+
+
+def _iter_blocks(block: Callable[..., bytes], count: int, args: Tuple,
+                 workers: Optional[int], ordered: bool, chunk_size: int,
+                 seeds: Optional[Iterator[Optional[int]]] = None) -> Iterator[bytes]:
+    """Reparte count elementos en bloques de chunk_size y los genera con block(size, *args, seed).
+
+    Cada bloque recibe la siguiente semilla de seeds; así un bloque dado
+    sale igual sea cual sea el proceso que lo genere.
+    """
+    if count < 0:
+        raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+    if chunk_size <= 0:
+        raise ValueError("El tamaño de bloque debe ser mayor que 0.")
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("El número de procesos debe ser mayor que 0.")
+    # Valida los parámetros antes de lanzar procesos
+    block(0, *args)
+
+    seeds = seeds or _block_seeds(None)
+    sizes = (min(chunk_size, count - start) for start in range(0, count, chunk_size))
+    if workers == 1:
+        for size in sizes:
+            yield block(size, *args, next(seeds))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        limit = workers * IN_FLIGHT_PER_WORKER
+        for size in sizes:
+            pending.append(executor.submit(block, size, *args, next(seeds)))
+            if len(pending) >= limit:
+                yield from _drain(pending, ordered, keep=limit - 1)
+        yield from _drain(pending, ordered, keep=0)
+
+
+def _iter_unique_blocks(block: Callable[..., bytes], count: int, args: Tuple,
+                        workers: Optional[int], ordered: bool, chunk_size: int,
+                        keyspace: Callable[[], int],
+                        seeds: Optional[Iterator[Optional[int]]] = None) -> Iterator[bytes]:
+    """Como _iter_blocks(), pero descarta en este proceso las líneas ya vistas.
+
+    Los duplicados entre procesos solo se detectan al fusionar, así que se
+    vuelven a pedir tantas líneas como se hayan descartado. Las reposiciones
+    siguen con las semillas de seeds, sin repetir las de bloques anteriores.
+    """
+    block(0, *args)
+    seeds = seeds or _block_seeds(None)
+    seen = new_unique_filter(count, keyspace())
+    remaining = count
+    while remaining > 0:
+        # Las últimas reposiciones son pequeñas y no compensa lanzar procesos
+        pool_size = workers if remaining >= chunk_size else 1
+        for data in _iter_blocks(block, remaining, args, pool_size, ordered, chunk_size, seeds):
+            lines = [line for line in data.decode("utf-8").splitlines() if seen.add(line)]
+            remaining -= len(lines)
+            if lines:
+                yield _join_lines(lines)
+
+
+def iter_parallel_blocks(count: int, length: int, use_symbols: bool, use_numbers: bool,
+                         use_uppercase: bool, use_lowercase: bool,
+                         workers: Optional[int] = None, ordered: bool = True,
+                         chunk_size: int = BATCH_CHUNK_SIZE,
+                         unique: bool = False, blocklist_path: Optional[str] = None,
+                         seed: Optional[int] = None, **constraints) -> Iterator[bytes]:
+    """Reparte la generación entre varios procesos y fusiona sus bloques.
+
+    Cada bloque contiene hasta chunk_size contraseñas terminadas en salto de
+    línea. Con ordered=True los bloques se entregan en el orden en que se
+    pidieron; con ordered=False, en cuanto terminan. Con un único proceso la
+    generación se hace en el proceso actual. Con unique=True no se repite
+    ninguna contraseña en toda la salida; con blocklist_path, ninguna del
+    archivo de filtraciones. Con seed la salida es reproducible pero NO
+    segura (solo para datos de prueba, ver utils.rng). constraints se pasa
+    a compile_policy().
+    """
+    flags = (length, use_symbols, use_numbers, use_uppercase, use_lowercase)
+    args = flags + (blocklist_path, constraints)
+    if unique:
+        return _iter_unique_blocks(_generate_block, count, args, workers, ordered, chunk_size,
+                                   lambda: compile_policy(*flags, **constraints).keyspace,
+                                   _block_seeds(seed))
+    return _iter_blocks(_generate_block, count, args, workers, ordered, chunk_size,
+                        _block_seeds(seed))
+
+
+def iter_parallel_passphrase_blocks(count: int, word_count: int,
+                                    separator: str = PassphraseConfig.SEPARATOR,
+                                    wordlist_path: Optional[str] = None,
+                                    workers: Optional[int] = None, ordered: bool = True,
+                                    chunk_size: int = BATCH_CHUNK_SIZE,
+                                    unique: bool = False,
+                                    seed: Optional[int] = None) -> Iterator[bytes]:
+    """Igual que iter_parallel_blocks(), pero con frases de contraseña."""
+    args = (word_count, separator, wordlist_path)
+    if unique:
+        return _iter_unique_blocks(_generate_passphrase_block, count, args, workers, ordered,
+                                   chunk_size, lambda: len(load_wordlist(wordlist_path)) ** word_count,
+                                   _block_seeds(seed))
+    return _iter_blocks(_generate_passphrase_block, count, args, workers, ordered, chunk_size,
+                        _block_seeds(seed))
+
+
+def iter_parallel_template_blocks(count: int, template: str, workers: Optional[int] = None,
+                                  ordered: bool = True, chunk_size: int = BATCH_CHUNK_SIZE,
+                                  unique: bool = False,
+                                  seed: Optional[int] = None) -> Iterator[bytes]:
+    """Igual que iter_parallel_blocks(), pero con una plantilla (ver utils.template)."""
+    args = (template,)
+    if unique:
+        return _iter_unique_blocks(_generate_template_block, count, args, workers, ordered,
+                                   chunk_size, lambda: compile_template(template).keyspace,
+                                   _block_seeds(seed))
+    return _iter_blocks(_generate_template_block, count, args, workers, ordered, chunk_size,
+                        _block_seeds(seed))
+
+
+def iter_parallel_pronounceable_blocks(count: int, length: int,
+                                       model_path: Optional[str] = None,
+                                       workers: Optional[int] = None, ordered: bool = True,
+                                       chunk_size: int = BATCH_CHUNK_SIZE,
+                                       unique: bool = False,
+                                       seed: Optional[int] = None) -> Iterator[bytes]:
+    """Igual que iter_parallel_blocks(), pero con contraseñas pronunciables (ver utils.markov)."""
+    args = (length, model_path)
+    if unique:
+        return _iter_unique_blocks(_generate_pronounceable_block, count, args, workers, ordered,
+                                   chunk_size, lambda: load_model(model_path).keyspace(length),
+                                   _block_seeds(seed))
+    return _iter_blocks(_generate_pronounceable_block, count, args, workers, ordered, chunk_size,
+                        _block_seeds(seed))
+
+
+def _drain(pending: deque, ordered: bool, keep: int) -> Iterator[bytes]:
+    """Entrega bloques terminados hasta que queden keep pendientes."""
+    while len(pending) > keep:
+        if ordered:
+            yield pending.popleft().result()
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                yield future.result()
+
+
+def generate_parallel(count: int, length: int, use_symbols: bool, use_numbers: bool,
+                      use_uppercase: bool, use_lowercase: bool,
+                      workers: Optional[int] = None, ordered: bool = True) -> List[str]:
+    """Genera count contraseñas usando varios procesos."""
+    passwords = []
+    for block in iter_parallel_blocks(count, length, use_symbols, use_numbers,
+                                      use_uppercase, use_lowercase, workers, ordered):
+        passwords.extend(block.decode("ascii").splitlines())
+    return passwords
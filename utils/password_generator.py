@@ -1,73 +1,528 @@
-import secrets
 import string
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from utils.arena import PasswordArena, wipe
+from utils.breach import BreachCorpus, load_corpus
+from utils.config import BreachConfig, PassphraseConfig, UIConfig
+from utils.entropy_pool import get_default_pool
+from utils.markov import load_model
+from utils.metrics import export as export_metrics, registry
+from utils.policy import AMBIGUOUS_CHARACTERS, compile_constraints, compile_policy
+from utils.rng import RandomStream
+from utils.template import compile_template
+from utils.uniqueness import UniqueFilter
+from utils.wordlist import MappedWordlist, open_wordlist
+
+# Número de contraseñas que se construyen juntas antes de entregarlas
+BATCH_CHUNK_SIZE = 4096
+# Tamaño del búfer de escritura de la línea de comandos
+OUTPUT_BUFFER_SIZE = 1 << 20
 
 class PasswordBuilder:
     """Builder para la generación de contraseñas seguras."""
 
-    def __init__(self, length: int):
+    def __init__(self, length: int, pool: Optional[RandomStream] = None):
         if length <= 0:
             raise ValueError("La longitud de la contraseña debe ser mayor que 0.")
         self.length = length
+        self.pool = pool or get_default_pool()
         self.character_set = ""
-        self.forced_chars = []
+        # Mínimo de caracteres de cada clase añadida
+        self.minimums: Dict[str, int] = {}
+        self.excluded = ""
+        self.no_repeat = False
 
-    def add_lowercase(self):
-        """Agrega caracteres en minúscula al conjunto."""
-        self.character_set += string.ascii_lowercase
-        if len(self.forced_chars) < self.length:
-            self.forced_chars.append(secrets.choice(string.ascii_lowercase))
+    def _add_class(self, characters: str, minimum: int):
+        self.character_set += characters
+        # Con más clases que posiciones solo se exigen las primeras
+        if minimum == 1 and sum(self.minimums.values()) >= self.length:
+            minimum = 0
+        self.minimums[characters] = minimum
         return self
 
-    def add_uppercase(self):
-        """Agrega caracteres en mayúscula al conjunto."""
-        self.character_set += string.ascii_uppercase
-        if len(self.forced_chars) < self.length:
-            self.forced_chars.append(secrets.choice(string.ascii_uppercase))
-        return self
+    def add_lowercase(self, minimum: int = 1):
+        """Agrega caracteres en minúscula al conjunto, con al menos minimum en la contraseña."""
+        return self._add_class(string.ascii_lowercase, minimum)
+
+    def add_uppercase(self, minimum: int = 1):
+        """Agrega caracteres en mayúscula al conjunto, con al menos minimum en la contraseña."""
+        return self._add_class(string.ascii_uppercase, minimum)
 
-    def add_numbers(self):
-        """Agrega dígitos al conjunto."""
-        self.character_set += string.digits
-        if len(self.forced_chars) < self.length:
-            self.forced_chars.append(secrets.choice(string.digits))
+    def add_numbers(self, minimum: int = 1):
+        """Agrega dígitos al conjunto, con al menos minimum en la contraseña."""
+        return self._add_class(string.digits, minimum)
+
+    def add_symbols(self, minimum: int = 1):
+        """Agrega símbolos al conjunto, con al menos minimum en la contraseña."""
+        return self._add_class(string.punctuation, minimum)
+
+    def exclude_ambiguous(self):
+        """Quita los caracteres que se confunden entre sí (0O1lI)."""
+        self.excluded = AMBIGUOUS_CHARACTERS
         return self
 
-    def add_symbols(self):
-        """Agrega símbolos al conjunto."""
-        self.character_set += string.punctuation
-        if len(self.forced_chars) < self.length:
-            self.forced_chars.append(secrets.choice(string.punctuation))
+    def forbid_repeats(self):
+        """Impide que un carácter aparezca dos veces seguidas."""
+        self.no_repeat = True
         return self
 
+    @registry.timed("build")
     def build(self) -> str:
-        """Genera la contraseña con los caracteres especificados."""
+        """Genera una contraseña uniforme entre todas las que cumplen las restricciones."""
         if not self.character_set:
             raise ValueError("Debe seleccionar al menos un tipo de caracteres.")
-        
-        # Truncar forced_chars si excede la longitud
-        password = self.forced_chars[:self.length]  # Asegura que no exceda la longitud especificada
-        if len(password) < self.length:
-            password += [secrets.choice(self.character_set) for _ in range(self.length - len(password))]
-        
-        # Mezclar los caracteres para evitar que los forzados estén siempre al inicio
-        secrets.SystemRandom().shuffle(password)
-        return ''.join(password)
+        policy = compile_constraints(self.length, tuple(self.minimums.items()), self.excluded,
+                                     self.no_repeat)
+        password = policy.sample(self.pool, 1)[0]
+        self.pool.record_passwords(1)
+        registry.inc("passwords_generated_total")
+        return password
 
 class PasswordGenerator:
-    """Generador de contraseñas usando PasswordBuilder."""
+    """Generador de contraseñas a partir de políticas compiladas y memorizadas."""
 
     @staticmethod
+    @registry.timed("generate")
     def generate(length: int, use_symbols: bool, use_numbers: bool,
-                 use_uppercase: bool, use_lowercase: bool) -> str:
-        """Genera una contraseña segura según los parámetros especificados."""
-        builder = PasswordBuilder(length)
-        if use_lowercase:
-            builder.add_lowercase()
-        if use_uppercase:
-            builder.add_uppercase()
-        if use_numbers:
-            builder.add_numbers()
-        if use_symbols:
-            builder.add_symbols()
-
-        return builder.build()
+                 use_uppercase: bool, use_lowercase: bool,
+                 blocklist: Optional[BreachCorpus] = None, **constraints) -> str:
+        """Genera una contraseña segura según los parámetros especificados.
+
+        constraints admite las restricciones adicionales de compile_policy()
+        (min_numbers, exclude_ambiguous, no_repeat...). Si se indica blocklist,
+        se vuelve a generar cualquier contraseña que aparezca en ella.
+        """
+        if blocklist is not None:
+            return next(PasswordGenerator.iter_chunks(1, length, use_symbols, use_numbers,
+                                                      use_uppercase, use_lowercase,
+                                                      blocklist=blocklist, **constraints))[0]
+        policy = compile_policy(length, use_symbols, use_numbers, use_uppercase, use_lowercase,
+                                **constraints)
+        pool = get_default_pool()
+        password = policy.sample(pool, 1)[0]
+        pool.record_passwords(1)
+        registry.inc("passwords_generated_total")
+        return password
+
+    @staticmethod
+    def generate_batch(count: int, length: int, use_symbols: bool, use_numbers: bool,
+                       use_uppercase: bool, use_lowercase: bool,
+                       unique: bool = False, blocklist: Optional[BreachCorpus] = None,
+                       pool: Optional[RandomStream] = None, **constraints) -> List[str]:
+        """Genera count contraseñas de una vez leyendo la entropía en bloques."""
+        return list(PasswordGenerator.iter_batch(count, length, use_symbols, use_numbers,
+                                                 use_uppercase, use_lowercase, unique=unique,
+                                                 blocklist=blocklist, pool=pool, **constraints))
+
+    @staticmethod
+    def iter_batch(count: int, length: int, use_symbols: bool, use_numbers: bool,
+                   use_uppercase: bool, use_lowercase: bool,
+                   chunk_size: int = BATCH_CHUNK_SIZE, unique: bool = False,
+                   blocklist: Optional[BreachCorpus] = None,
+                   pool: Optional[RandomStream] = None, **constraints) -> Iterator[str]:
+        """Genera count contraseñas de forma perezosa, por bloques de chunk_size.
+
+        Produce la misma distribución que generate(): uniforme entre todas las
+        contraseñas que cumplen la política. Con unique=True no se repite
+        ninguna contraseña; con blocklist, ninguna que aparezca en ella. pool
+        es el flujo aleatorio (por defecto, la reserva del SO; ver utils.rng).
+        """
+        for chunk in PasswordGenerator.iter_chunks(count, length, use_symbols, use_numbers,
+                                                   use_uppercase, use_lowercase, chunk_size,
+                                                   unique, blocklist, pool, **constraints):
+            yield from chunk
+
+    @staticmethod
+    def iter_chunks(count: int, length: int, use_symbols: bool, use_numbers: bool,
+                    use_uppercase: bool, use_lowercase: bool,
+                    chunk_size: int = BATCH_CHUNK_SIZE, unique: bool = False,
+                    blocklist: Optional[BreachCorpus] = None,
+                    pool: Optional[RandomStream] = None,
+                    **constraints) -> Iterator[List[str]]:
+        """Igual que iter_batch(), pero entrega listas de hasta chunk_size contraseñas."""
+        if count < 0:
+            raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+        policy = compile_policy(length, use_symbols, use_numbers, use_uppercase, use_lowercase,
+                                **constraints)
+        seen = new_unique_filter(count, policy.keyspace) if unique else None
+        pool = pool or get_default_pool()
+        remaining = count
+        rejections = 0
+        while remaining > 0:
+            chunk = min(remaining, chunk_size)
+            passwords = policy.sample(pool, chunk)
+            pool.record_passwords(chunk)
+            if blocklist is not None:
+                # Las filtradas se descartan y las siguientes vueltas reponen solo esas
+                passwords = blocklist.filter_safe(passwords)
+                registry.inc("breach_rejections_total", chunk - len(passwords))
+                rejections = 0 if passwords else rejections + chunk
+                if rejections >= BreachConfig.MAX_CONSECUTIVE_REJECTIONS:
+                    raise ValueError("Todas las contraseñas generadas aparecen en la lista de "
+                                     "filtraciones; use una configuración más amplia.")
+            if seen is not None:
+                drawn = len(passwords)
+                passwords = list(seen.filter_new(passwords))
+                registry.inc("duplicate_rejections_total", drawn - len(passwords))
+            remaining -= len(passwords)
+            registry.inc("passwords_generated_total", len(passwords))
+            if passwords:
+                yield passwords
+
+    @staticmethod
+    def generate_arena(count: int, length: int, use_symbols: bool, use_numbers: bool,
+                       use_uppercase: bool, use_lowercase: bool, separator: bytes = b"\n",
+                       chunk_size: int = BATCH_CHUNK_SIZE, pool: Optional[RandomStream] = None,
+                       **constraints) -> PasswordArena:
+        """Genera count contraseñas directamente en una PasswordArena, sin crear un str por cada una.
+
+        Misma distribución que generate_batch(). Los bloques intermedios se
+        ponen a cero en cuanto se copian; la reserva se borra con wipe().
+        """
+        if count < 0:
+            raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+        policy = compile_policy(length, use_symbols, use_numbers, use_uppercase, use_lowercase,
+                                **constraints)
+        return _fill_arena(policy, count, separator, chunk_size, pool)
+
+    @staticmethod
+    def generate_from_template(template: str) -> str:
+        """Genera una contraseña con la estructura de la plantilla (ver utils.template)."""
+        return next(PasswordGenerator.iter_template_chunks(1, template))[0]
+
+    @staticmethod
+    def iter_template_chunks(count: int, template: str, chunk_size: int = BATCH_CHUNK_SIZE,
+                             unique: bool = False,
+                             pool: Optional[RandomStream] = None) -> Iterator[List[str]]:
+        """Genera count contraseñas con la plantilla, en listas de hasta chunk_size."""
+        if count < 0:
+            raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+        compiled = compile_template(template)
+        seen = new_unique_filter(count, compiled.keyspace) if unique else None
+        pool = pool or get_default_pool()
+        remaining = count
+        while remaining > 0:
+            chunk = min(remaining, chunk_size)
+            passwords = compiled.sample(pool, chunk)
+            pool.record_passwords(chunk)
+            if seen is not None:
+                passwords = list(seen.filter_new(passwords))
+                registry.inc("duplicate_rejections_total", chunk - len(passwords))
+            remaining -= len(passwords)
+            registry.inc("passwords_generated_total", len(passwords))
+            if passwords:
+                yield passwords
+
+    @staticmethod
+    def generate_template_arena(count: int, template: str, separator: bytes = b"\n",
+                                chunk_size: int = BATCH_CHUNK_SIZE,
+                                pool: Optional[RandomStream] = None) -> PasswordArena:
+        """Como generate_arena(), pero con la estructura de la plantilla."""
+        if count < 0:
+            raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+        return _fill_arena(compile_template(template), count, separator, chunk_size, pool)
+
+    @staticmethod
+    def generate_pronounceable(length: int, model_path: Optional[str] = None) -> str:
+        """Genera una contraseña pronunciable con el modelo de Markov (ver utils.markov)."""
+        return next(PasswordGenerator.iter_pronounceable_chunks(1, length, model_path))[0]
+
+    @staticmethod
+    def iter_pronounceable_chunks(count: int, length: int, model_path: Optional[str] = None,
+                                  chunk_size: int = BATCH_CHUNK_SIZE, unique: bool = False,
+                                  pool: Optional[RandomStream] = None) -> Iterator[List[str]]:
+        """Genera count contraseñas pronunciables, en listas de hasta chunk_size."""
+        if count < 0:
+            raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+        if length <= 0:
+            raise ValueError("La longitud de la contraseña debe ser mayor que 0.")
+        model = load_model(model_path)
+        seen = new_unique_filter(count, model.keyspace(length)) if unique else None
+        pool = pool or get_default_pool()
+        remaining = count
+        while remaining > 0:
+            chunk = min(remaining, chunk_size)
+            passwords = [model.sample(pool, length) for _ in range(chunk)]
+            pool.record_passwords(chunk)
+            if seen is not None:
+                passwords = list(seen.filter_new(passwords))
+                registry.inc("duplicate_rejections_total", chunk - len(passwords))
+            remaining -= len(passwords)
+            registry.inc("passwords_generated_total", len(passwords))
+            if passwords:
+                yield passwords
+
+    @staticmethod
+    def generate_passphrase(word_count: int, separator: str = PassphraseConfig.SEPARATOR,
+                            wordlist_path: Optional[str] = None) -> str:
+        """Genera una frase de contraseña con word_count palabras de la lista."""
+        return next(PasswordGenerator.iter_passphrase_chunks(1, word_count, separator,
+                                                             wordlist_path))[0]
+
+    @staticmethod
+    def generate_passphrase_batch(count: int, word_count: int,
+                                  separator: str = PassphraseConfig.SEPARATOR,
+                                  wordlist_path: Optional[str] = None,
+                                  unique: bool = False) -> List[str]:
+        """Genera count frases de contraseña de una vez."""
+        return [phrase for chunk in PasswordGenerator.iter_passphrase_chunks(
+            count, word_count, separator, wordlist_path, unique=unique) for phrase in chunk]
+
+    @staticmethod
+    def iter_passphrase_chunks(count: int, word_count: int,
+                               separator: str = PassphraseConfig.SEPARATOR,
+                               wordlist_path: Optional[str] = None,
+                               chunk_size: int = BATCH_CHUNK_SIZE, unique: bool = False,
+                               pool: Optional[RandomStream] = None) -> Iterator[List[str]]:
+        """Genera count frases de forma perezosa, en listas de hasta chunk_size."""
+        if count < 0:
+            raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+        if word_count <= 0:
+            raise ValueError("La frase debe tener al menos una palabra.")
+        wordlist = load_wordlist(wordlist_path)
+        size = len(wordlist)
+        seen = new_unique_filter(count, size ** word_count) if unique else None
+        pool = pool or get_default_pool()
+        remaining = count
+        while remaining > 0:
+            chunk = min(remaining, chunk_size)
+            phrases = [separator.join(wordlist[pool.randbelow(size)] for _ in range(word_count))
+                       for _ in range(chunk)]
+            pool.record_passwords(chunk)
+            if seen is not None:
+                phrases = list(seen.filter_new(phrases))
+                registry.inc("duplicate_rejections_total", chunk - len(phrases))
+            remaining -= len(phrases)
+            registry.inc("passwords_generated_total", len(phrases))
+            if phrases:
+                yield phrases
+
+    @staticmethod
+    def generate_passphrase_arena(count: int, word_count: int,
+                                  separator: str = PassphraseConfig.SEPARATOR,
+                                  wordlist_path: Optional[str] = None,
+                                  line_separator: bytes = b"\n",
+                                  pool: Optional[RandomStream] = None) -> PasswordArena:
+        """Genera count frases directamente en una PasswordArena con ranuras por desplazamientos."""
+        if count < 0:
+            raise ValueError("La cantidad de contraseñas no puede ser negativa.")
+        if word_count <= 0:
+            raise ValueError("La frase debe tener al menos una palabra.")
+        wordlist = load_wordlist(wordlist_path)
+        size = len(wordlist)
+        pool = pool or get_default_pool()
+        words = array("I", (pool.randbelow(size) for _ in range(count * word_count)))
+        joiner = separator.encode("utf-8")
+        # El tamaño total se conoce de antemano: el búfer se reserva una sola
+        # vez y nunca deja copias parciales al crecer
+        total = (sum(len(wordlist.word_bytes(i)) for i in words)
+                 + count * ((word_count - 1) * len(joiner) + len(line_separator)))
+        buffer = bytearray(total)
+        offsets = array("Q", [0])
+        position = 0
+        for k, i in enumerate(words):
+            if k % word_count:
+                buffer[position:position + len(joiner)] = joiner
+                position += len(joiner)
+            word = wordlist.word_bytes(i)
+            buffer[position:position + len(word)] = word
+            position += len(word)
+            if k % word_count == word_count - 1:
+                buffer[position:position + len(line_separator)] = line_separator
+                position += len(line_separator)
+                offsets.append(position)
+        wipe(words)
+        pool.record_passwords(count)
+        registry.inc("passwords_generated_total", count)
+        return PasswordArena(buffer, count, line_separator, offsets=offsets)
+
+
+def _fill_arena(policy, count: int, separator: bytes, chunk_size: int,
+                pool: Optional[RandomStream] = None) -> PasswordArena:
+    """Escribe count contraseñas de policy (política o plantilla compilada) en una PasswordArena."""
+    arena = PasswordArena.fixed(count, policy.length, separator)
+    pool = pool or get_default_pool()
+    for first in range(0, count, chunk_size):
+        block = policy.sample_bytes(pool, min(chunk_size, count - first))
+        arena.write_block(first, block, policy.length)
+        wipe(block)
+    pool.record_passwords(count)
+    registry.inc("passwords_generated_total", count)
+    return arena
+
+
+def new_unique_filter(count: int, keyspace: int) -> UniqueFilter:
+    """Crea el filtro de duplicados, comprobando antes que caben count elementos distintos."""
+    if count > keyspace:
+        raise ValueError(f"Se pidieron {count} contraseñas únicas, pero la configuración "
+                         f"solo admite {keyspace} distintas.")
+    return UniqueFilter(max(count, 1))
+
+
+def load_wordlist(path: Optional[str] = None) -> MappedWordlist:
+    """Abre (una sola vez) la lista de palabras indicada o la configurada por defecto."""
+    path = path or PassphraseConfig.WORDLIST_PATH
+    try:
+        return open_wordlist(path)
+    except FileNotFoundError:
+        raise ValueError(f"No se encontró la lista de palabras: {path}")
+
+
+def add_policy_arguments(parser: "argparse.ArgumentParser") -> None:
+    """Añade las opciones de longitud, clases y restricciones de las contraseñas."""
+    parser.add_argument("-l", "--length", type=int, default=UIConfig.DEFAULT_PASSWORD_LENGTH,
+                        help=f"longitud entre {UIConfig.MIN_PASSWORD_LENGTH} y "
+                             f"{UIConfig.MAX_PASSWORD_LENGTH} (por defecto: "
+                             f"{UIConfig.DEFAULT_PASSWORD_LENGTH})")
+    parser.add_argument("--no-symbols", dest="use_symbols", action="store_false",
+                        help="excluir símbolos (@#$%%)")
+    parser.add_argument("--no-numbers", dest="use_numbers", action="store_false",
+                        help="excluir números (0-9)")
+    parser.add_argument("--no-uppercase", dest="use_uppercase", action="store_false",
+                        help="excluir mayúsculas (A-Z)")
+    parser.add_argument("--no-lowercase", dest="use_lowercase", action="store_false",
+                        help="excluir minúsculas (a-z)")
+    for name, label in (("symbols", "símbolos"), ("numbers", "números"),
+                        ("uppercase", "mayúsculas"), ("lowercase", "minúsculas")):
+        parser.add_argument(f"--min-{name}", type=int, default=1, metavar="N",
+                            help=f"mínimo de {label} en cada contraseña (por defecto: 1)")
+    parser.add_argument("--no-ambiguous", dest="exclude_ambiguous", action="store_true",
+                        help="excluir caracteres que se confunden (0O1lI)")
+    parser.add_argument("--no-repeat", action="store_true",
+                        help="no repetir un carácter dos veces seguidas")
+
+
+def policy_constraints(args: "argparse.Namespace") -> Dict:
+    """Restricciones de compile_policy() elegidas con add_policy_arguments()."""
+    return {"min_symbols": args.min_symbols, "min_numbers": args.min_numbers,
+            "min_uppercase": args.min_uppercase, "min_lowercase": args.min_lowercase,
+            "exclude_ambiguous": args.exclude_ambiguous, "no_repeat": args.no_repeat}
+
+
+def build_parser() -> "argparse.ArgumentParser":
+    """Crea el analizador de argumentos de la línea de comandos."""
+    # Importación diferida: la interfaz gráfica no usa la línea de comandos
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.password_generator",
+        description="Genera contraseñas seguras sin abrir la interfaz gráfica.",
+    )
+    parser.add_argument("-n", "--count", type=int, default=1,
+                        help="número de contraseñas a generar (por defecto: 1)")
+    add_policy_arguments(parser)
+    parser.add_argument("--breach-corpus", nargs="?", const=BreachConfig.CORPUS_PATH, metavar="RUTA",
+                        help="volver a generar las contraseñas que aparezcan en este archivo "
+                             "de filtraciones (SHA-1 ordenado por hash); no admite --template, "
+                             "--passphrase ni --pronounceable")
+    parser.add_argument("--template", metavar="PLANTILLA",
+                        help="generar con una estructura fija, por ejemplo 'Aaaa-9999-$$' "
+                             "(ver python -m utils.template -h)")
+    parser.add_argument("--pronounceable", action="store_true",
+                        help="generar contraseñas pronunciables con el modelo de Markov")
+    parser.add_argument("--markov-model", metavar="RUTA",
+                        help="modelo de Markov (por defecto: data/markov.bin)")
+    parser.add_argument("--passphrase", action="store_true",
+                        help="generar frases de palabras en lugar de contraseñas de caracteres")
+    parser.add_argument("--words", type=int, default=PassphraseConfig.DEFAULT_WORDS,
+                        help=f"palabras por frase, entre {PassphraseConfig.MIN_WORDS} y "
+                             f"{PassphraseConfig.MAX_WORDS} (por defecto: "
+                             f"{PassphraseConfig.DEFAULT_WORDS})")
+    parser.add_argument("--wordlist", help="lista de palabras (por defecto: data/wordlist.txt)")
+    parser.add_argument("--separator", default=PassphraseConfig.SEPARATOR,
+                        help=f"separador entre palabras (por defecto: '{PassphraseConfig.SEPARATOR}')")
+    parser.add_argument("--unique", action="store_true",
+                        help="no repetir ninguna contraseña en la salida")
+    parser.add_argument("--seed", type=int, metavar="N",
+                        help="generador reproducible con esta semilla; NO es seguro, "
+                             "solo para datos de prueba y pruebas de carga")
+    parser.add_argument("--metrics", metavar="RUTA",
+                        help="guardar métricas de rendimiento al terminar (.prom para "
+                             "Prometheus, si no JSON)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="archivo de salida; '-' para la salida estándar (por defecto)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="procesos de generación; 0 usa todos los núcleos (por defecto: 1)")
+    parser.add_argument("--unordered", dest="ordered", action="store_false",
+                        help="con varios procesos, escribir los bloques según terminan")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Punto de entrada de consola: escribe una contraseña por línea."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.count < 0:
+        parser.error("--count no puede ser negativo")
+    if not UIConfig.MIN_PASSWORD_LENGTH <= args.length <= UIConfig.MAX_PASSWORD_LENGTH:
+        parser.error(f"--length debe estar entre {UIConfig.MIN_PASSWORD_LENGTH} "
+                     f"y {UIConfig.MAX_PASSWORD_LENGTH}")
+
+    if not PassphraseConfig.MIN_WORDS <= args.words <= PassphraseConfig.MAX_WORDS:
+        parser.error(f"--words debe estar entre {PassphraseConfig.MIN_WORDS} "
+                     f"y {PassphraseConfig.MAX_WORDS}")
+    if args.workers < 0:
+        parser.error("--workers no puede ser negativo")
+    if args.metrics:
+        if args.workers != 1:
+            parser.error("--metrics solo mide la generación en un único proceso (--workers 1)")
+        registry.enable()
+    # Importación diferida: evita el ciclo entre ambos módulos
+    from utils.parallel_generator import (iter_parallel_blocks, iter_parallel_passphrase_blocks,
+                                          iter_parallel_pronounceable_blocks,
+                                          iter_parallel_template_blocks)
+
+    if (args.template is not None) + args.passphrase + args.pronounceable > 1:
+        parser.error("--template, --passphrase y --pronounceable no se pueden usar juntas")
+    if args.breach_corpus is not None and (args.template is not None or args.passphrase
+                                           or args.pronounceable):
+        parser.error("--breach-corpus solo comprueba las contraseñas de caracteres; no se "
+                     "puede usar con --template, --passphrase ni --pronounceable")
+    if args.seed is not None:
+        print("AVISO: con --seed las contraseñas son predecibles; no las use como credenciales.",
+              file=sys.stderr)
+    if args.pronounceable:
+        blocks = iter_parallel_pronounceable_blocks(args.count, args.length, args.markov_model,
+                                                    workers=args.workers or None,
+                                                    ordered=args.ordered, unique=args.unique,
+                                                    seed=args.seed)
+    elif args.template is not None:
+        blocks = iter_parallel_template_blocks(args.count, args.template,
+                                               workers=args.workers or None,
+                                               ordered=args.ordered, unique=args.unique,
+                                               seed=args.seed)
+    elif args.passphrase:
+        blocks = iter_parallel_passphrase_blocks(args.count, args.words, args.separator,
+                                                 args.wordlist, workers=args.workers or None,
+                                                 ordered=args.ordered, unique=args.unique,
+                                                 seed=args.seed)
+    else:
+        blocks = iter_parallel_blocks(args.count, args.length, args.use_symbols, args.use_numbers,
+                                      args.use_uppercase, args.use_lowercase,
+                                      workers=args.workers or None, ordered=args.ordered,
+                                      unique=args.unique, blocklist_path=args.breach_corpus,
+                                      seed=args.seed, **policy_constraints(args))
+    try:
+        if args.output == "-":
+            output = open(sys.stdout.fileno(), "wb", buffering=OUTPUT_BUFFER_SIZE, closefd=False)
+        else:
+            output = open(args.output, "wb", buffering=OUTPUT_BUFFER_SIZE)
+        with output:
+            for block in blocks:
+                output.write(block)
+                # Las contraseñas solo quedan en el búfer de escritura del archivo
+                wipe(block)
+    except ValueError as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        # La salida se cerró antes de tiempo (por ejemplo, con `| head`)
+        sys.stderr.close()
+    if args.metrics:
+        export_metrics(args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
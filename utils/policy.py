@@ -0,0 +1,417 @@
+import math
+import string
+from functools import lru_cache
+from itertools import product
+from typing import Iterator, List, Optional, Tuple
+
+from utils.arena import wipe
+from utils.metrics import registry
+
+# Hay 16 combinaciones de opciones; el resto de entradas cubre distintas longitudes
+POLICY_CACHE_SIZE = 128
+# Las políticas con tablas de conteo ocupan más; se guardan menos
+CONSTRAINT_CACHE_SIZE = 32
+# Por debajo de esta probabilidad de aceptar un candidato se usan las tablas
+MIN_ACCEPTANCE = 0.5
+# Las tablas crecen con el cuadrado de la longitud
+MAX_TABLE_LENGTH = 256
+# Candidatos a partir de los cuales se comprueban los mínimos de todos a la
+# vez (y nunca menos que la longitud): con pocos, contar uno a uno es más rápido
+MIN_BATCH_CHECK = 16
+# Hasta este mínimo se buscan las primeras apariciones en vez de contarlas todas
+MAX_FIND_MINIMUM = 32
+# Caracteres que se confunden fácilmente entre sí
+AMBIGUOUS_CHARACTERS = "0O1lI"
+
+
+def _has_at_least(flags: bytes, minimum: int) -> bool:
+    """Indica si los indicadores 0/1 de flags suman al menos minimum.
+
+    Con mínimos pequeños basta con buscar con find() los primeros unos, sin
+    recorrer el resto. count() lo recorre todo y, con indicadores aleatorios,
+    falla la predicción de saltos en uno de cada dos bytes.
+    """
+    if minimum > MAX_FIND_MINIMUM:
+        return flags.count(1) >= minimum
+    position = -1
+    for _ in range(minimum):
+        position = flags.find(1, position + 1)
+        if position < 0:
+            return False
+    return True
+
+
+def _sampling_table(alphabet: bytes) -> Tuple[bytes, bytes, int]:
+    """Calcula la tabla de traducción, los bytes rechazados y el umbral de un alfabeto.
+
+    Los bytes por debajo del umbral (el mayor múltiplo de len(alphabet) que cabe
+    en un byte) se asignan a alphabet[b % len(alphabet)]; el resto se descartan,
+    de modo que cada carácter resulta equiprobable.
+    """
+    size = len(alphabet)
+    threshold = 256 - 256 % size
+    table = bytes(alphabet[b % size] if b < threshold else 0 for b in range(256))
+    return table, bytes(range(threshold, 256)), threshold
+
+
+class SampledAlphabet:
+    """Alfabeto con su tabla de muestreo por rechazo precalculada."""
+
+    __slots__ = ("chars", "table", "rejected", "threshold")
+
+    def __init__(self, chars: bytes):
+        table, rejected, threshold = _sampling_table(chars)
+        object.__setattr__(self, "chars", chars)
+        object.__setattr__(self, "table", table)
+        object.__setattr__(self, "rejected", rejected)
+        object.__setattr__(self, "threshold", threshold)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SampledAlphabet es inmutable.")
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def sample(self, stream, n: int) -> bytearray:
+        """Devuelve n caracteres (en ASCII) elegidos uniformemente del alfabeto."""
+        out = bytearray()
+        while len(out) < n:
+            missing = n - len(out)
+            # Se piden bytes de más para compensar los rechazos esperados
+            out += stream.read(missing * 256 // self.threshold + 16).translate(self.table, self.rejected)
+        del out[n:]
+        return out
+
+
+class CompiledPolicy:
+    """Política de generación precompilada: longitud, clases con su mínimo y restricciones.
+
+    Muestrea de forma uniforme entre todas las contraseñas que cumplen la
+    política. Se obtiene con compile_policy() o compile_constraints(), que la
+    memorizan; es inmutable y puede compartirse entre hilos.
+    """
+
+    __slots__ = ("length", "alphabet", "class_alphabets", "minimums", "forced_alphabets",
+                 "no_repeat", "_required", "_others", "_following", "_start", "_tables",
+                 "_keyspace")
+
+    def __init__(self, length: int, class_alphabets: Tuple[bytes, ...],
+                 minimums: Tuple[int, ...], no_repeat: bool = False):
+        if sum(minimums) > length:
+            raise ValueError("Los mínimos de cada clase suman más que la longitud.")
+        alphabet = b"".join(class_alphabets)
+        if len(set(alphabet)) != len(alphabet):
+            raise ValueError("Las clases de caracteres no pueden solaparse.")
+        if no_repeat and len(alphabet) == 1 and length > 1:
+            raise ValueError("Hace falta más de un carácter para no repetir caracteres seguidos.")
+        object.__setattr__(self, "length", length)
+        object.__setattr__(self, "alphabet", SampledAlphabet(alphabet))
+        object.__setattr__(self, "class_alphabets",
+                           tuple(SampledAlphabet(chars) for chars in class_alphabets))
+        object.__setattr__(self, "minimums", minimums)
+        object.__setattr__(self, "forced_alphabets", tuple(
+            chars for chars, minimum in zip(self.class_alphabets, minimums) if minimum))
+        object.__setattr__(self, "no_repeat", no_repeat)
+        # Para cada clase con mínimo: tabla que marca sus caracteres con 1, tabla
+        # que marca con 1 los recuentos suficientes, caracteres y mínimo
+        object.__setattr__(self, "_required", tuple(
+            (bytes(b in chars for b in range(256)), bytes(n >= minimum for n in range(256)),
+             chars, minimum)
+            for chars, minimum in zip(class_alphabets, minimums) if minimum))
+        # Desplazamientos para elegir un carácter distinto del anterior
+        object.__setattr__(self, "_others", SampledAlphabet(bytes(range(len(alphabet) - 1)))
+                           if no_repeat and len(alphabet) > 1 else None)
+        following = self._need_transitions()
+        states = self._previous_states()
+        object.__setattr__(self, "_following", following)
+        # Todos los mínimos pendientes (último vector) y sin carácter anterior
+        object.__setattr__(self, "_start", (len(following) - 1) * states + states - 1)
+        tables = None
+        if self._acceptance_bound() < MIN_ACCEPTANCE:
+            # Con el rechazo se repetiría demasiadas veces: se construye la
+            # contraseña a partir de las tablas de conteo
+            if length > MAX_TABLE_LENGTH:
+                raise ValueError("La política es demasiado restrictiva para esta longitud.")
+            tables = list(self._count_rows())
+            if tables[-1][self._start] == 0:
+                raise ValueError("Ninguna contraseña cumple la política.")
+        object.__setattr__(self, "_tables", tables)
+        object.__setattr__(self, "_keyspace", tables[-1][self._start] if tables else None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledPolicy es inmutable.")
+
+    @property
+    def character_set(self) -> str:
+        """Conjunto completo de caracteres permitidos."""
+        return self.alphabet.chars.decode("ascii")
+
+    @property
+    def keyspace(self) -> int:
+        """Número exacto de contraseñas que cumplen la política."""
+        if self._keyspace is None:
+            for row in self._count_rows():
+                pass
+            object.__setattr__(self, "_keyspace", row[self._start])
+        return self._keyspace
+
+    def _acceptance_bound(self) -> float:
+        """Cota inferior de la probabilidad de que un candidato aleatorio cumpla los mínimos.
+
+        Sin repeticiones, cada carácter es de la clase c con probabilidad al
+        menos (|c| - 1) / (|alfabeto| - 1), así que su número de apariciones
+        domina a una binomial con esa probabilidad.
+        """
+        total = len(self.alphabet)
+        failure = 0.0
+        for chars, minimum in zip(self.class_alphabets, self.minimums):
+            if minimum:
+                if self._others is not None:
+                    p = (len(chars) - 1) / (total - 1)
+                else:
+                    p = len(chars) / total
+                failure += _binomial_below(self.length, p, minimum)
+        return 1.0 - failure
+
+    # Estados de las tablas: (mínimos que faltan por cumplir, clase del carácter
+    # anterior). La clase anterior solo importa si no se permiten repeticiones.
+
+    def _need_transitions(self) -> List[List[int]]:
+        """Para cada vector de mínimos pendientes, el vector al que pasa al usar cada clase.
+
+        Los vectores se numeran en orden lexicográfico: el 0 es el de ningún
+        mínimo pendiente y el último, el de todos.
+        """
+        needs = list(product(*(range(minimum + 1) for minimum in self.minimums)))
+        index = {need: i for i, need in enumerate(needs)}
+        return [[index[need[:c] + (max(need[c] - 1, 0),) + need[c + 1:]]
+                 for c in range(len(need))] for need in needs]
+
+    def _previous_states(self) -> int:
+        return len(self.class_alphabets) + 1 if self.no_repeat else 1
+
+    def _count_rows(self) -> Iterator[List[int]]:
+        """Produce, para r = 0..length, cuántas formas hay de completar r posiciones desde cada estado."""
+        following = self._following
+        states = self._previous_states()
+        sizes = [len(chars) for chars in self.class_alphabets]
+        row = [int(n == 0) for n in range(len(following)) for _ in range(states)]
+        yield row
+        for _ in range(self.length):
+            previous_row, row = row, []
+            for n in range(len(following)):
+                for prev in range(states):
+                    total = 0
+                    for c, size in enumerate(sizes):
+                        if self.no_repeat:
+                            total += (size - (prev == c)) * previous_row[following[n][c] * states + c]
+                        else:
+                            total += size * previous_row[following[n][c]]
+                    row.append(total)
+            yield row
+
+    def class_counts(self) -> Tuple[int, List[int], List[List[int]]]:
+        """Cuenta contraseñas válidas para calcular las frecuencias esperadas de cada carácter.
+
+        Devuelve el total, cuántas tienen un carácter dado de la clase a en
+        una posición dada y cuántas tienen caracteres dados de las clases a
+        y b en dos posiciones dadas. Los mínimos solo dependen de cuántos
+        caracteres hay de cada clase, así que estos números no dependen de
+        las posiciones elegidas; con no_repeat sí, y no se admite.
+        """
+        if self.no_repeat:
+            raise ValueError("Las frecuencias esperadas no se calculan con no_repeat.")
+        # Las tres últimas filas: length - 2, length - 1 y length posiciones
+        rows = [[0] * len(self._following)] * 2
+        for row in self._count_rows():
+            rows = rows[-2:] + [row]
+        following, start = self._following, self._start
+        classes = range(len(self.class_alphabets))
+        single = [rows[1][following[start][a]] for a in classes]
+        pairs = [[rows[0][following[following[start][a]][b]] for b in classes] for a in classes]
+        return rows[2][start], single, pairs
+
+    def sample(self, stream, count: int) -> List[str]:
+        """Genera count contraseñas uniformes entre las que cumplen la política.
+
+        Si un candidato aleatorio cumple los mínimos con probabilidad de al
+        menos MIN_ACCEPTANCE, se generan candidatos en bloque y se descartan
+        los que no los cumplen. Si no, cada contraseña se construye a partir
+        de un único número uniforme en [0, keyspace) con las tablas de conteo.
+        """
+        block = self.sample_bytes(stream, count)
+        text = block.decode("ascii")
+        wipe(block)
+        if count == 1:
+            return [text]
+        length = self.length
+        return [text[i:i + length] for i in range(0, len(text), length)]
+
+    @registry.timed("sample")
+    def sample_bytes(self, stream, count: int) -> bytearray:
+        """Como sample(), pero devuelve las count contraseñas seguidas en un único bytearray."""
+        length = self.length
+        if self._tables is not None:
+            out = bytearray(count * length)
+            for i in range(0, count * length, length):
+                out[i:i + length] = self._unrank(stream.randbelow(self._keyspace))
+            return out
+        out = bytearray()
+        while len(out) < count * length:
+            missing = count - len(out) // length
+            if self._others is None:
+                candidates = self.alphabet.sample(stream, missing * length)
+            else:
+                candidates = bytearray()
+                for _ in range(missing):
+                    candidates += self._draw_without_repeats(stream)
+            accepted = self._accepted(candidates, missing)
+            if accepted is None and not out:
+                # Sin rechazos en el primer intento los candidatos ya son la salida
+                return candidates
+            if accepted is None:
+                out += candidates
+            else:
+                view = memoryview(candidates)
+                for i in range(missing):
+                    if accepted[i]:
+                        out += view[i * length:(i + 1) * length]
+                view.release()
+                registry.inc("policy_rejections_total", missing - sum(accepted))
+            wipe(candidates)
+        return out
+
+    def _accepted(self, candidates: bytearray, count: int) -> Optional[bytearray]:
+        """Para cada uno de los count candidatos seguidos, 1 si cumple los mínimos y 0 si no.
+
+        Devuelve None si los cumplen todos. Con muchos candidatos y longitudes
+        de menos de 256 las apariciones de cada clase se cuentan para todos a
+        la vez: cada columna de indicadores 0/1 se lee como un entero con un
+        byte por candidato y las columnas se suman sin acarreos. Con pocos
+        (una contraseña suelta, por ejemplo) se comprueban los indicadores de
+        cada candidato con translate() y _has_at_least().
+        """
+        if not self._required:
+            return None
+        length = self.length
+        if length < 256 and count >= max(length, MIN_BATCH_CHECK):
+            mask = -1
+            for flags, enough, _, _ in self._required:
+                flags = candidates.translate(flags)
+                total = 0
+                for j in range(length):
+                    total += int.from_bytes(flags[j::length], "little")
+                mask &= int.from_bytes(total.to_bytes(count, "little").translate(enough), "little")
+            accepted = mask.to_bytes(count, "little")
+        else:
+            accepted = bytearray(count)
+            for k in range(count):
+                candidate = candidates[k * length:(k + 1) * length]
+                for flags, _, _, minimum in self._required:
+                    if not _has_at_least(candidate.translate(flags), minimum):
+                        break
+                else:
+                    accepted[k] = 1
+        return None if accepted.count(0) == 0 else accepted
+
+    def _unrank(self, rank: int) -> bytearray:
+        """Devuelve la contraseña número rank en el orden que definen las tablas."""
+        following = self._following
+        states = self._previous_states()
+        need = len(following) - 1
+        prev = prev_index = -1
+        password = bytearray()
+        for remaining in range(self.length - 1, -1, -1):
+            row = self._tables[remaining]
+            for c, chars in enumerate(self.class_alphabets):
+                completions = row[following[need][c] * states + c * self.no_repeat]
+                repeat = self.no_repeat and prev == c
+                weight = (len(chars) - repeat) * completions
+                if rank < weight:
+                    index, rank = divmod(rank, completions)
+                    if repeat and index >= prev_index:
+                        index += 1
+                    password.append(chars.chars[index])
+                    need, prev, prev_index = following[need][c], c, index
+                    break
+                rank -= weight
+        return password
+
+    def _draw_without_repeats(self, stream) -> bytearray:
+        """Contraseña uniforme entre las que no repiten un carácter seguido."""
+        chars = self.alphabet.chars
+        index = stream.randbelow(len(chars))
+        password = bytearray((chars[index],))
+        for offset in self._others.sample(stream, self.length - 1):
+            index = offset if offset < index else offset + 1
+            password.append(chars[index])
+        return password
+
+
+def _binomial_below(n: int, p: float, k: int) -> float:
+    """Probabilidad de que una binomial(n, p) sea menor que k."""
+    if p <= 0.0:
+        return 1.0
+    if p >= 1.0:
+        return 0.0 if k <= n else 1.0
+    log_p, log_q = math.log(p), math.log1p(-p)
+    return sum(math.exp(math.lgamma(n + 1) - math.lgamma(j + 1) - math.lgamma(n - j + 1)
+                        + j * log_p + (n - j) * log_q) for j in range(min(k, n + 1)))
+
+
+@lru_cache(maxsize=CONSTRAINT_CACHE_SIZE)
+def compile_constraints(length: int, classes: Tuple[Tuple[str, int], ...],
+                        exclude: str = "", no_repeat: bool = False) -> CompiledPolicy:
+    """Devuelve la política compilada (y memorizada) para clases (alfabeto, mínimo).
+
+    Los caracteres de exclude se quitan de todas las clases; no se repiten dos
+    caracteres iguales seguidos si no_repeat es True.
+    """
+    if length <= 0:
+        raise ValueError("La longitud de la contraseña debe ser mayor que 0.")
+    alphabets, minimums = [], []
+    for chars, minimum in classes:
+        if minimum < 0:
+            raise ValueError("Los mínimos de cada clase no pueden ser negativos.")
+        chars = "".join(c for c in chars if c not in exclude)
+        if not chars:
+            if minimum:
+                raise ValueError("Una clase con mínimo se quedó sin caracteres tras las exclusiones.")
+            continue
+        alphabets.append(chars.encode("ascii"))
+        minimums.append(minimum)
+    if not alphabets:
+        raise ValueError("Debe seleccionar al menos un tipo de caracteres.")
+    return CompiledPolicy(length, tuple(alphabets), tuple(minimums), no_repeat)
+
+
+@lru_cache(maxsize=POLICY_CACHE_SIZE)
+def compile_policy(length: int, use_symbols: bool, use_numbers: bool,
+                   use_uppercase: bool, use_lowercase: bool,
+                   min_symbols: int = 1, min_numbers: int = 1, min_uppercase: int = 1,
+                   min_lowercase: int = 1, exclude_ambiguous: bool = False,
+                   no_repeat: bool = False) -> CompiledPolicy:
+    """Devuelve la política compilada (y memorizada) para estas opciones.
+
+    Cada clase seleccionada aparece al menos su mínimo de veces. Si hay más
+    clases con mínimo 1 que posiciones, solo se exigen las primeras.
+    """
+    if length <= 0:
+        raise ValueError("La longitud de la contraseña debe ser mayor que 0.")
+    classes = []
+    required = 0
+    for alphabet, selected, minimum in (
+        (string.ascii_lowercase, use_lowercase, min_lowercase),
+        (string.ascii_uppercase, use_uppercase, min_uppercase),
+        (string.digits, use_numbers, min_numbers),
+        (string.punctuation, use_symbols, min_symbols),
+    ):
+        if selected:
+            if minimum == 1 and required >= length:
+                minimum = 0
+            required += minimum
+            classes.append((alphabet, minimum))
+    if not classes:
+        raise ValueError("Debe seleccionar al menos un tipo de caracteres.")
+    return compile_constraints(length, tuple(classes),
+                               AMBIGUOUS_CHARACTERS if exclude_ambiguous else "", no_repeat)
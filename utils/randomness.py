@@ -0,0 +1,278 @@
+"""Verificación estadística de la salida del generador, para auditorías y CI.
+
+Genera millones de caracteres con la misma política que PasswordBuilder y
+comprueba que se distribuyen como deben. La distribución esperada es la
+exacta de la política, de modo que los mínimos por clase no provocan falsos
+rechazos. Las pruebas son:
+
+- frecuencia de cada carácter en cada posición y en total (chi-cuadrado)
+- frecuencia de cada clase en cada posición (chi-cuadrado)
+- pares de caracteres seguidos dentro de una contraseña (chi-cuadrado)
+- independencia entre contraseñas consecutivas: pares en la misma posición
+  (chi-cuadrado) y correlación serie
+
+Los recuentos se guardan en arrays de tamaño fijo y se hacen con operaciones
+sobre bloques enteros: bytes.count() por columna y, para los pares, la
+ordenación de códigos de 16 bits. Cada prueba usa un nivel alpha / número de
+pruebas (Bonferroni), así que el informe falla con probabilidad de como
+mucho alpha si el generador es correcto.
+
+Uso: python -m utils.randomness --characters 100000000 --length 16 [--json]
+"""
+import math
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from utils.entropy_pool import get_default_pool
+from utils.policy import CompiledPolicy, compile_policy
+
+DEFAULT_CHARACTERS = 10_000_000
+DEFAULT_ALPHA = 1e-3
+# Contraseñas por bloque analizado
+CHUNK_PASSWORDS = 1 << 16
+_PAIR_CODES = 1 << 16
+
+
+def chi2_sf(x: float, dof: int) -> float:
+    """Probabilidad de que una chi-cuadrado con dof grados de libertad sea al menos x."""
+    return _gamma_q(dof / 2.0, x / 2.0)
+
+
+def _gamma_q(a: float, x: float) -> float:
+    """Función gamma incompleta superior regularizada Q(a, x)."""
+    if x <= 0.0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1.0:
+        # Serie de P(a, x)
+        term = total = 1.0 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1.0
+            term *= x / n
+            total += term
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+    # Fracción continua de Q(a, x) por el método de Lentz
+    tiny = 1e-300
+    b = x + 1.0 - a
+    c = 1.0 / tiny
+    d = 1.0 / b
+    h = d
+    i = 0
+    while True:
+        i += 1
+        an = -i * (i - a)
+        b += 2.0
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-15:
+            break
+    return math.exp(log_prefix) * h
+
+
+def _chi_square(observed: Sequence[int], expected: Sequence[float]) -> float:
+    return sum((o - e) ** 2 / e for o, e in zip(observed, expected) if e > 0)
+
+
+def _count_pairs(first, second, counts: array) -> None:
+    """Suma en counts[a + 256 * b] las apariciones de cada par (first[i], second[i])."""
+    # Cada par se empaqueta en un entero de 16 bits y se ordenan todos: los
+    # iguales quedan juntos y se cuentan de un salto con bisect
+    low, high = (first, second) if sys.byteorder == "little" else (second, first)
+    packed = bytearray(2 * len(first))
+    packed[0::2] = low
+    packed[1::2] = high
+    codes = sorted(memoryview(packed).cast("H"))
+    i = 0
+    while i < len(codes):
+        code = codes[i]
+        j = bisect_right(codes, code, i)
+        counts[code] += j - i
+        i = j
+
+
+class RandomnessVerifier:
+    """Acumula los recuentos de bloques de contraseñas de una política y los evalúa."""
+
+    def __init__(self, policy: CompiledPolicy):
+        total, single, pairs = policy.class_counts()
+        self.policy = policy
+        self.length = length = policy.length
+        self.passwords = 0
+        self.alphabet = policy.alphabet.chars
+        # Probabilidad de cada carácter (por código) en una posición y de cada par seguido
+        self._class_of = {}
+        self._p_char = [0.0] * 256
+        for k, chars in enumerate(policy.class_alphabets):
+            for c in chars.chars:
+                self._class_of[c] = k
+                self._p_char[c] = single[k] / total
+        self._p_pair = pairs
+        self._total = total
+        self._position_counts = array("Q", bytes(8 * 256 * length))
+        self._pair_counts = array("Q", bytes(8 * _PAIR_CODES))
+        self._lag_counts = array("Q", bytes(8 * _PAIR_CODES))
+        self._last = None
+
+    def update(self, block) -> None:
+        """Añade un bloque de contraseñas seguidas, de policy.length bytes cada una."""
+        length = self.length
+        block = bytes(block)
+        counts = self._position_counts
+        for p in range(length):
+            column = block[p::length]
+            base = 256 * p
+            for c in self.alphabet:
+                counts[base + c] += column.count(c)
+        if length > 1:
+            _count_pairs(b"".join(block[p::length] for p in range(length - 1)),
+                         b"".join(block[p + 1::length] for p in range(length - 1)),
+                         self._pair_counts)
+        # La contraseña anterior (la última del bloque previo) también cuenta
+        previous = (self._last or b"") + block[:-length]
+        following = block if self._last else block[length:]
+        _count_pairs(previous, following, self._lag_counts)
+        self._last = block[-length:]
+        self.passwords += len(block) // length
+
+    def report(self, alpha: float = DEFAULT_ALPHA) -> Dict:
+        """Evalúa las pruebas y devuelve el informe con el resultado de cada una."""
+        length, alphabet = self.length, self.alphabet
+        n = self.passwords
+        tests: List[Dict] = []
+
+        def add(name: str, statistic: float, dof: int, p_value: float) -> None:
+            tests.append({"test": name, "statistic": statistic, "dof": dof, "p_value": p_value})
+
+        expected = [n * self._p_char[c] for c in alphabet]
+        overall = [0] * len(alphabet)
+        classes = self.policy.class_alphabets
+        for p in range(length):
+            observed = [self._position_counts[256 * p + c] for c in alphabet]
+            overall = [a + b for a, b in zip(overall, observed)]
+            x = _chi_square(observed, expected)
+            add(f"posición {p}: caracteres", x, len(alphabet) - 1, chi2_sf(x, len(alphabet) - 1))
+            if len(classes) > 1:
+                class_observed = [sum(self._position_counts[256 * p + c] for c in k.chars)
+                                  for k in classes]
+                class_expected = [sum(expected[alphabet.index(c)] for c in k.chars)
+                                  for k in classes]
+                x = _chi_square(class_observed, class_expected)
+                add(f"posición {p}: clases", x, len(classes) - 1, chi2_sf(x, len(classes) - 1))
+        x = _chi_square(overall, [e * length for e in expected])
+        add("todas las posiciones: caracteres", x, len(alphabet) - 1,
+            chi2_sf(x, len(alphabet) - 1))
+
+        cells = len(alphabet) ** 2 - 1
+        if length > 1:
+            pairs = n * (length - 1)
+            observed = [self._pair_counts[a + 256 * b] for a in alphabet for b in alphabet]
+            expected_pairs = [pairs * self._p_pair[self._class_of[a]][self._class_of[b]]
+                              / self._total for a in alphabet for b in alphabet]
+            x = _chi_square(observed, expected_pairs)
+            add("pares seguidos en una contraseña", x, cells, chi2_sf(x, cells))
+
+        lags = (n - 1) * length
+        observed = [self._lag_counts[a + 256 * b] for a in alphabet for b in alphabet]
+        x = _chi_square(observed, [lags * self._p_char[a] * self._p_char[b]
+                                   for a in alphabet for b in alphabet])
+        add("pares entre contraseñas consecutivas", x, cells, chi2_sf(x, cells))
+        add("correlación serie entre contraseñas consecutivas", *self._serial_correlation(lags))
+
+        threshold = alpha / len(tests)
+        for test in tests:
+            test["passed"] = test["p_value"] >= threshold
+        return {"passwords": n, "characters": n * length, "length": length,
+                "alphabet_size": len(alphabet), "alpha": alpha,
+                "passed": all(test["passed"] for test in tests), "tests": tests}
+
+    def _serial_correlation(self, lags: int):
+        """Coeficiente de correlación entre códigos de caracteres de contraseñas consecutivas."""
+        sum_a = sum_b = sum_aa = sum_bb = sum_ab = 0
+        for a in self.alphabet:
+            for b in self.alphabet:
+                count = self._lag_counts[a + 256 * b]
+                sum_a += a * count
+                sum_b += b * count
+                sum_aa += a * a * count
+                sum_bb += b * b * count
+                sum_ab += a * b * count
+        denominator = math.sqrt(max(lags * sum_aa - sum_a ** 2, 0) * max(lags * sum_bb - sum_b ** 2, 0))
+        r = (lags * sum_ab - sum_a * sum_b) / denominator if denominator else 0.0
+        # Sin correlación, r * sqrt(n) sigue aproximadamente una normal estándar
+        z = r * math.sqrt(lags)
+        return z, 1, math.erfc(abs(z) / math.sqrt(2.0))
+
+
+def verify_blocks(policy: CompiledPolicy, blocks: Iterable[bytes],
+                  alpha: float = DEFAULT_ALPHA) -> Dict:
+    """Evalúa bloques de contraseñas que deberían seguir la distribución de policy."""
+    verifier = RandomnessVerifier(policy)
+    for block in blocks:
+        verifier.update(block)
+    return verifier.report(alpha)
+
+
+def verify(policy: CompiledPolicy, characters: int = DEFAULT_CHARACTERS,
+           alpha: float = DEFAULT_ALPHA, stream=None) -> Dict:
+    """Genera al menos characters caracteres con policy y evalúa su distribución."""
+    stream = stream or get_default_pool()
+    passwords = max(-(-characters // policy.length), 2)
+    sizes = (min(CHUNK_PASSWORDS, passwords - first)
+             for first in range(0, passwords, CHUNK_PASSWORDS))
+    start = time.perf_counter()
+    report = verify_blocks(policy, (policy.sample_bytes(stream, size) for size in sizes), alpha)
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"{report['characters']} caracteres en {report['passwords']} contraseñas de "
+             f"{report['length']} (alfabeto de {report['alphabet_size']}), "
+             f"alpha = {report['alpha']:g}"]
+    for test in report["tests"]:
+        mark = "ok   " if test["passed"] else "FALLO"
+        lines.append(f"  {mark} {test['test']:<50} estadístico {test['statistic']:12.3f}  "
+                     f"p = {test['p_value']:.4g}")
+    lines.append("RESULTADO: " + ("correcto" if report["passed"] else "FALLO"))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Punto de entrada de consola; termina con código 1 si alguna prueba falla."""
+    import argparse
+    import json
+
+    from utils.password_generator import add_policy_arguments, policy_constraints
+
+    parser = argparse.ArgumentParser(prog="python -m utils.randomness", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=DEFAULT_CHARACTERS,
+                        help=f"caracteres a generar (por defecto: {DEFAULT_CHARACTERS})")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help=f"probabilidad de falso fallo (por defecto: {DEFAULT_ALPHA:g})")
+    parser.add_argument("--json", action="store_true", help="informe en JSON")
+    add_policy_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.characters <= 0 or not 0 < args.alpha < 1:
+        parser.error("--characters debe ser positivo y --alpha estar entre 0 y 1")
+    try:
+        policy = compile_policy(args.length, args.use_symbols, args.use_numbers,
+                                args.use_uppercase, args.use_lowercase, **policy_constraints(args))
+        report = verify(policy, args.characters, args.alpha)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
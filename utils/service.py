@@ -0,0 +1,192 @@
+"""Servicio local de generación de contraseñas sobre asyncio.
+
+Escucha en un socket Unix o en TCP sobre localhost y habla JSON por líneas:
+cada petición es un objeto con los parámetros de PasswordGenerator.generate()
+(las clases y las restricciones min_symbols, min_numbers, min_uppercase,
+min_lowercase, exclude_ambiguous y no_repeat, como en la línea de comandos)
+más un "count" y un "id" opcionales, y cada respuesta es
+{"id": ..., "passwords": [...]} o {"id": ..., "error": "..."}.
+
+Uso: python -m utils.service (--unix RUTA | --port PUERTO)
+"""
+import asyncio
+import json
+import sys
+from functools import partial
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.password_generator import PasswordGenerator, policy_constraints
+
+# Peticiones aceptadas a la vez antes de dejar de leer de las conexiones
+MAX_IN_FLIGHT = 256
+# Contraseñas máximas por petición
+MAX_COUNT_PER_REQUEST = 10_000
+# Longitud máxima admitida por petición
+MAX_LENGTH = 4096
+# Tiempo que se esperan más peticiones con la misma política antes de generar
+COALESCE_WINDOW = 0.001
+# Tamaño máximo de una línea de petición
+MAX_REQUEST_SIZE = 4096
+
+# Longitud, las cuatro clases y las restricciones de policy_constraints()
+Policy = Tuple[int, bool, bool, bool, bool, Tuple[Tuple[str, object], ...]]
+
+_FLAGS = ("use_symbols", "use_numbers", "use_uppercase", "use_lowercase")
+# Restricciones admitidas con su valor por defecto, el mismo que en la línea de comandos
+_CONSTRAINTS = {"min_symbols": 1, "min_numbers": 1, "min_uppercase": 1, "min_lowercase": 1,
+                "exclude_ambiguous": False, "no_repeat": False}
+_FIELDS = {"id", "count", "length", *_FLAGS, *_CONSTRAINTS}
+
+
+def parse_request(line: bytes) -> Tuple[object, Policy, int]:
+    """Valida una petición JSON y devuelve su id, su política y la cantidad pedida."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        raise ValueError("La petición no es JSON válido.")
+    if not isinstance(request, dict):
+        raise ValueError("La petición debe ser un objeto JSON.")
+    unknown = set(request) - _FIELDS
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(unknown))}.")
+    length = request.get("length")
+    count = request.get("count", 1)
+    for name, value in (("length", length), ("count", count)):
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"El campo '{name}' debe ser un entero.")
+    if not 1 <= length <= MAX_LENGTH:
+        raise ValueError(f"El campo 'length' debe estar entre 1 y {MAX_LENGTH}.")
+    if not 1 <= count <= MAX_COUNT_PER_REQUEST:
+        raise ValueError(f"El campo 'count' debe estar entre 1 y {MAX_COUNT_PER_REQUEST}.")
+    flags = tuple(request.get(name, True) for name in _FLAGS)
+    if not all(isinstance(flag, bool) for flag in flags):
+        raise ValueError("Las opciones de caracteres deben ser booleanas.")
+    options = {name: request.get(name, default) for name, default in _CONSTRAINTS.items()}
+    for name, value in options.items():
+        if isinstance(_CONSTRAINTS[name], bool):
+            if not isinstance(value, bool):
+                raise ValueError(f"El campo '{name}' debe ser booleano.")
+        elif not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= length:
+            raise ValueError(f"El campo '{name}' debe ser un entero entre 0 y la longitud.")
+    constraints = policy_constraints(SimpleNamespace(**options))
+    return request.get("id"), (length, *flags, tuple(constraints.items())), count
+
+
+class GenerationService:
+    """Atiende peticiones agrupando las que comparten política en un solo lote."""
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT,
+                 coalesce_window: float = COALESCE_WINDOW):
+        self.coalesce_window = coalesce_window
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pending: Dict[Policy, List[Tuple[int, asyncio.Future]]] = {}
+        self.batches = 0
+        self.requests = 0
+
+    async def generate(self, policy: Policy, count: int = 1) -> List[str]:
+        """Devuelve count contraseñas, compartiendo lote con peticiones simultáneas."""
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            waiting = self._pending.setdefault(policy, [])
+            if not waiting:
+                loop.call_later(self.coalesce_window, self._schedule_flush, policy)
+            waiting.append((count, future))
+            self.requests += 1
+            return await future
+
+    def _schedule_flush(self, policy: Policy) -> None:
+        asyncio.get_running_loop().create_task(self._flush(policy))
+
+    async def _flush(self, policy: Policy) -> None:
+        waiting = self._pending.pop(policy, [])
+        total = sum(count for count, _ in waiting)
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        *options, constraints = policy
+        try:
+            passwords = await loop.run_in_executor(
+                None, partial(PasswordGenerator.generate_batch, total, *options,
+                              **dict(constraints)))
+        except Exception as e:
+            for _, future in waiting:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for count, future in waiting:
+            if not future.done():
+                future.set_result(passwords[start:start + count])
+            start += count
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Atiende una conexión petición a petición.
+
+        Cada petición se responde antes de leer la siguiente, así que un cliente
+        que no consume sus respuestas deja de ser leído (contrapresión).
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    response = {"id": None, "error": "La petición es demasiado grande."}
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                request_id = None
+                try:
+                    request_id, policy, count = parse_request(line)
+                    response = {"id": request_id, "passwords": await self.generate(policy, count)}
+                except ValueError as e:
+                    response = {"id": request_id, "error": str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, unix_path: Optional[str] = None, port: Optional[int] = None,
+                    host: str = "127.0.0.1") -> asyncio.AbstractServer:
+        """Abre el servidor en un socket Unix o en un puerto TCP local."""
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix_path,
+                                                   limit=MAX_REQUEST_SIZE)
+        if port is None:
+            raise ValueError("Debe indicar un socket Unix o un puerto.")
+        return await asyncio.start_server(self.handle_connection, host=host, port=port,
+                                          limit=MAX_REQUEST_SIZE)
+
+
+async def serve(unix_path: Optional[str], port: Optional[int], max_in_flight: int) -> None:
+    """Ejecuta el servicio hasta que se interrumpa."""
+    server = await GenerationService(max_in_flight).start(unix_path, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Punto de entrada de consola: atiende peticiones hasta que se interrumpa."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.service", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--unix", metavar="RUTA", help="ruta del socket Unix")
+    target.add_argument("--port", type=int, help="puerto TCP en 127.0.0.1")
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT,
+                        help=f"peticiones simultáneas admitidas (por defecto: {MAX_IN_FLIGHT})")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.unix, args.port, args.max_in_flight))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Estimación incremental de la fortaleza de una contraseña.
+
+Combina la entropía del conjunto de caracteres con la detección de patrones
+al estilo de zxcvbn (secuencias, repeticiones, recorridos de teclado y
+palabras de diccionario). La fortaleza es el mínimo, en bits, entre todas las
+formas de descomponer la contraseña en patrones y caracteres sueltos.
+"""
+import math
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Ningún patrón se extiende más allá de esta longitud; acota lo que se
+# vuelve a analizar tras una edición
+MAX_MATCH_LENGTH = 24
+MIN_MATCH_LENGTH = 3
+
+# Palabras y contraseñas muy comunes, ordenadas de más a menos frecuentes
+COMMON_WORDS = (
+    "password", "123456", "qwerty", "admin", "welcome", "letmein", "monkey", "dragon",
+    "master", "login", "princess", "sunshine", "shadow", "football", "baseball", "iloveyou",
+    "trustno1", "superman", "batman", "starwars", "hello", "secret", "freedom", "whatever",
+    "contraseña", "contrasena", "clave", "hola", "amor", "teamo", "mariposa", "futbol",
+    "estrella", "tequiero", "familia", "dios", "jesus", "barcelona", "madrid", "real",
+    "love", "summer", "winter", "spring", "autumn", "computer", "internet", "server",
+    "user", "root", "test", "guest", "access", "pass", "word", "key", "open", "change",
+)
+
+# Sustituciones habituales de caracteres por letras
+_UNLEET = str.maketrans("4@3105$7+!", "aaeiosstti")
+
+_KEYBOARD_ROWS = ("`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./")
+_SHIFTED_ROWS = ("~!@#$%^&*()_+", "QWERTYUIOP{}|", "ASDFGHJKL:\"", "ZXCVBNM<>?")
+
+_SCORE_LABELS = ("Muy débil", "Débil", "Aceptable", "Fuerte", "Muy fuerte")
+_SCORE_THRESHOLDS = (28, 36, 60, 128)
+
+
+class Match(NamedTuple):
+    """Patrón encontrado en text[start:end] y el logaritmo de los intentos para adivinarlo."""
+    start: int
+    end: int
+    pattern: str
+    bits: float
+
+
+class StrengthResult(NamedTuple):
+    """Resultado de la estimación."""
+    bits: float
+    charset_bits: float
+    score: int
+    label: str
+    matches: Tuple[Match, ...]
+
+
+def _keyboard_graph() -> Dict[str, frozenset]:
+    """Vecinos de cada tecla en un teclado QWERTY, con y sin mayúsculas."""
+    positions = {}
+    for rows in (_KEYBOARD_ROWS, _SHIFTED_ROWS):
+        for row, keys in enumerate(rows):
+            for col, key in enumerate(keys):
+                positions[key] = (row, col)
+    graph = {}
+    for key, (row, col) in positions.items():
+        graph[key] = frozenset(
+            other for other, (r, c) in positions.items()
+            if other != key and abs(r - row) <= 1 and abs(c - col) <= 1
+        )
+    return graph
+
+
+_KEYBOARD = _keyboard_graph()
+_KEYBOARD_DEGREE = sum(len(n) for n in _KEYBOARD.values()) / len(_KEYBOARD)
+
+
+class WordTrie:
+    """Trie de palabras con su posición en la lista de frecuencias."""
+
+    __slots__ = ("root", "size")
+
+    def __init__(self, words: Iterable[str]):
+        self.root: Dict = {}
+        self.size = 0
+        for rank, word in enumerate(words, start=1):
+            node = self.root
+            for char in word.lower():
+                node = node.setdefault(char, {})
+            node.setdefault("", rank)
+            self.size = rank
+
+    def prefixes(self, text: str, start: int, limit: int) -> Iterable[Tuple[int, int]]:
+        """Devuelve (fin, posición) de cada palabra que empieza en text[start]."""
+        node = self.root
+        for end in range(start, min(len(text), start + limit)):
+            node = node.get(text[end])
+            if node is None:
+                return
+            rank = node.get("")
+            if rank is not None and end + 1 - start >= MIN_MATCH_LENGTH:
+                yield end + 1, rank
+
+
+@lru_cache(maxsize=4)
+def load_dictionary(path: Optional[str] = None) -> WordTrie:
+    """Carga una vez el diccionario (una palabra por línea, de más a menos común)."""
+    if path is None:
+        return WordTrie(COMMON_WORDS)
+    with open(path, encoding="utf-8") as f:
+        return WordTrie(line.strip() for line in f if line.strip())
+
+
+def charset_size(text: str) -> int:
+    """Tamaño del conjunto de caracteres que sugiere el texto."""
+    size = 0
+    if any(c in string.ascii_lowercase for c in text):
+        size += len(string.ascii_lowercase)
+    if any(c in string.ascii_uppercase for c in text):
+        size += len(string.ascii_uppercase)
+    if any(c in string.digits for c in text):
+        size += len(string.digits)
+    if any(c in string.punctuation for c in text):
+        size += len(string.punctuation)
+    if any(not c.isascii() or not c.isprintable() or c == " " for c in text):
+        size += 100
+    return size
+
+
+def character_set_entropy(character_set: str, length: int) -> float:
+    """Entropía en bits de una contraseña aleatoria uniforme sobre character_set."""
+    size = len(set(character_set))
+    return length * math.log2(size) if size > 1 else 0.0
+
+
+def _char_pool(char: str) -> int:
+    if char in string.ascii_lowercase or char in string.ascii_uppercase:
+        return 26
+    if char in string.digits:
+        return 10
+    if char in string.punctuation:
+        return len(string.punctuation)
+    return 100
+
+
+def _matches_at(text: str, lowered: str, unleeted: str, start: int,
+                trie: WordTrie) -> List[Match]:
+    """Patrones que empiezan en start, mirando como mucho MAX_MATCH_LENGTH caracteres."""
+    matches = []
+    limit = min(len(text), start + MAX_MATCH_LENGTH)
+
+    # Palabras de diccionario, con y sin sustituciones
+    for variant, extra in ((lowered, 0.0), (unleeted, 1.0)):
+        if extra and variant[start:limit] == lowered[start:limit]:
+            break
+        for end, rank in trie.prefixes(variant, start, limit - start):
+            word = text[start:end]
+            bits = math.log2(rank) + extra
+            if word != word.lower():
+                bits += 1.0 if word[0].isupper() and word[1:] == word[1:].lower() else 2.0
+            matches.append(Match(start, end, "diccionario", max(bits, 1.0)))
+
+    # Repeticiones del mismo carácter
+    end = start + 1
+    while end < limit and text[end] == text[start]:
+        end += 1
+    if end - start >= MIN_MATCH_LENGTH:
+        bits = math.log2(_char_pool(text[start]) * (end - start))
+        matches.append(Match(start, end, "repetición", bits))
+
+    # Secuencias con paso constante de ±1 (abc, 987)
+    if start + 1 < limit:
+        delta = ord(text[start + 1]) - ord(text[start])
+        if delta in (1, -1):
+            end = start + 2
+            while end < limit and ord(text[end]) - ord(text[end - 1]) == delta:
+                end += 1
+            if end - start >= MIN_MATCH_LENGTH:
+                base = 4 if text[start] in "aA019zZ" else _char_pool(text[start])
+                bits = math.log2(base * (end - start) * (2 if delta < 0 else 1))
+                matches.append(Match(start, end, "secuencia", bits))
+
+    # Recorridos de teclado (qwer, asdf, 1qaz)
+    end = start + 1
+    while end < limit and text[end] in _KEYBOARD.get(text[end - 1], ()):
+        end += 1
+    if end - start >= MIN_MATCH_LENGTH:
+        bits = math.log2(len(_KEYBOARD)) + (end - start - 1) * math.log2(_KEYBOARD_DEGREE)
+        matches.append(Match(start, end, "teclado", bits))
+    return matches
+
+
+def score_for_bits(bits: float) -> int:
+    """Puntuación de 0 (muy débil) a 4 (muy fuerte)."""
+    return sum(bits >= threshold for threshold in _SCORE_THRESHOLDS)
+
+
+class StrengthEstimator:
+    """Estimador incremental: al editar el texto solo reanaliza la zona cambiada."""
+
+    def __init__(self, dictionary: Optional[WordTrie] = None):
+        self.trie = dictionary or load_dictionary()
+        self._text = ""
+        self._matches: List[List[Match]] = []
+        self.rescanned = 0
+
+    def estimate(self, text: str) -> StrengthResult:
+        """Estima la fortaleza de text reutilizando el análisis del texto anterior."""
+        old, self._text = self._text, text
+        # Zona sin cambios al principio y al final del texto
+        prefix = 0
+        shortest = min(len(old), len(text))
+        while prefix < shortest and old[prefix] == text[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < shortest - prefix and old[-1 - suffix] == text[-1 - suffix]:
+            suffix += 1
+
+        # Los patrones que empiezan en i solo dependen de text[i:i + MAX_MATCH_LENGTH]
+        keep_head = max(0, prefix - MAX_MATCH_LENGTH + 1)
+        tail_start = len(text) - suffix
+        shift = len(text) - len(old)
+        lowered = text.lower()
+        unleeted = lowered.translate(_UNLEET)
+        rescanned = [_matches_at(text, lowered, unleeted, i, self.trie)
+                     for i in range(keep_head, tail_start)]
+        tail = [[m._replace(start=m.start + shift, end=m.end + shift) for m in starts]
+                for starts in self._matches[len(old) - suffix:]] if shift else \
+            self._matches[len(old) - suffix:]
+        self._matches = self._matches[:keep_head] + rescanned + tail
+        self.rescanned = len(rescanned)
+        return self._result(text)
+
+    def _result(self, text: str) -> StrengthResult:
+        size = charset_size(text)
+        char_bits = math.log2(size) if size > 1 else 0.0
+        # best[i]: mínimo de bits para adivinar text[:i]
+        best = [0.0] + [math.inf] * len(text)
+        choice: List[Optional[Match]] = [None] * (len(text) + 1)
+        by_end: Dict[int, List[Match]] = {}
+        for starts in self._matches:
+            for match in starts:
+                by_end.setdefault(match.end, []).append(match)
+        for i in range(1, len(text) + 1):
+            best[i] = best[i - 1] + char_bits
+            for match in by_end.get(i, ()):
+                bits = best[match.start] + match.bits
+                if bits < best[i]:
+                    best[i] = bits
+                    choice[i] = match
+        used = []
+        i = len(text)
+        while i > 0:
+            match = choice[i]
+            if match is None:
+                i -= 1
+            else:
+                used.append(match)
+                i = match.start
+        bits = best[-1]
+        score = score_for_bits(bits)
+        return StrengthResult(bits, len(text) * char_bits, score, _SCORE_LABELS[score],
+                              tuple(reversed(used)))
+
+
+def estimate_strength(text: str, dictionary: Optional[WordTrie] = None) -> StrengthResult:
+    """Estima la fortaleza de una contraseña sin estado previo."""
+    return StrengthEstimator(dictionary).estimate(text)
@@ -0,0 +1,197 @@
+"""Contraseñas con una estructura fija, descrita por una plantilla.
+
+Cada elemento de la plantilla ocupa una posición:
+
+    A  mayúscula          a  minúscula          9  dígito
+    $  símbolo            *  cualquiera de los anteriores
+    [A-Z0-9]  uno de los caracteres o rangos indicados
+    \\x  el carácter x tal cual          {n}  repite n veces el elemento anterior
+
+Cualquier otro carácter aparece tal cual. Por ejemplo, "Aaaa-9999-$$" o
+"[A-Z]{2}[0-9]{6}". Cada plantilla se compila una vez (y se memoriza) en una
+tabla con el alfabeto de cada posición; un lote entero se genera leyendo de
+una vez los caracteres de cada alfabeto y copiándolos columna a columna.
+
+Uso: python -m utils.template PLANTILLA  (muestra su tamaño y su entropía)
+"""
+import math
+import string
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.arena import wipe
+from utils.policy import SampledAlphabet
+
+TEMPLATE_CACHE_SIZE = 64
+# Longitud máxima de una plantilla una vez expandidas las repeticiones
+MAX_TEMPLATE_LENGTH = 4096
+PLACEHOLDERS = {
+    "A": string.ascii_uppercase,
+    "a": string.ascii_lowercase,
+    "9": string.digits,
+    "$": string.punctuation,
+    "*": string.ascii_letters + string.digits + string.punctuation,
+}
+
+
+def _check_character(c: str) -> str:
+    if not " " <= c <= "~":
+        raise ValueError("Las plantillas solo admiten caracteres ASCII imprimibles.")
+    return c
+
+
+def _parse_class(template: str, start: int) -> Tuple[str, int]:
+    """Lee la clase [...] que empieza en start; devuelve sus caracteres y dónde termina."""
+    chars: List[str] = []
+    i = start + 1
+    while True:
+        if i >= len(template):
+            raise ValueError("Falta el ] de cierre en la plantilla.")
+        c = template[i]
+        if c == "]":
+            break
+        if c == "\\":
+            i += 1
+            if i >= len(template):
+                raise ValueError("La plantilla termina con un \\ sin carácter.")
+            c = template[i]
+        _check_character(c)
+        # Rango x-y, salvo que el guion sea el último carácter de la clase
+        if i + 2 < len(template) and template[i + 1] == "-" and template[i + 2] != "]":
+            end = _check_character(template[i + 2])
+            if end < c:
+                raise ValueError(f"Rango no válido en la plantilla: {c}-{end}.")
+            chars.extend(chr(code) for code in range(ord(c), ord(end) + 1))
+            i += 3
+        else:
+            chars.append(c)
+            i += 1
+    if not chars:
+        raise ValueError("Las clases de la plantilla no pueden estar vacías.")
+    return "".join(dict.fromkeys(chars)), i + 1
+
+
+def parse_template(template: str) -> List[str]:
+    """Devuelve los caracteres posibles de cada posición de la plantilla."""
+    positions: List[str] = []
+    i = 0
+    while i < len(template):
+        c = template[i]
+        if c == "{":
+            end = template.find("}", i)
+            if end < 0 or not template[i + 1:end].isdigit():
+                raise ValueError("Las repeticiones de la plantilla se escriben {n}.")
+            times = int(template[i + 1:end])
+            if not positions or times < 1:
+                raise ValueError("{n} debe seguir a un elemento y repetirlo al menos una vez.")
+            if len(positions) + times - 1 > MAX_TEMPLATE_LENGTH:
+                raise ValueError(f"La plantilla genera más de {MAX_TEMPLATE_LENGTH} caracteres.")
+            positions.extend([positions[-1]] * (times - 1))
+            i = end + 1
+            continue
+        if c == "[":
+            chars, i = _parse_class(template, i)
+        elif c == "\\":
+            if i + 1 >= len(template):
+                raise ValueError("La plantilla termina con un \\ sin carácter.")
+            chars, i = _check_character(template[i + 1]), i + 2
+        else:
+            chars, i = PLACEHOLDERS.get(c) or _check_character(c), i + 1
+        positions.append(chars)
+        if len(positions) > MAX_TEMPLATE_LENGTH:
+            raise ValueError(f"La plantilla genera más de {MAX_TEMPLATE_LENGTH} caracteres.")
+    if not positions:
+        raise ValueError("La plantilla no puede estar vacía.")
+    return positions
+
+
+class CompiledTemplate:
+    """Plantilla compilada: alfabeto de cada posición, agrupado por alfabetos.
+
+    Se obtiene con compile_template(), que la memoriza; es inmutable y puede
+    compartirse entre hilos.
+    """
+
+    __slots__ = ("template", "length", "positions", "keyspace", "_groups")
+
+    def __init__(self, template: str):
+        positions = parse_template(template)
+        # Posiciones de cada alfabeto distinto, en orden de aparición
+        columns: Dict[str, List[int]] = {}
+        for p, chars in enumerate(positions):
+            columns.setdefault(chars, []).append(p)
+        object.__setattr__(self, "template", template)
+        object.__setattr__(self, "length", len(positions))
+        object.__setattr__(self, "positions", tuple(positions))
+        object.__setattr__(self, "keyspace", math.prod(len(chars) for chars in positions))
+        object.__setattr__(self, "_groups", tuple(
+            (SampledAlphabet(chars.encode("ascii")), tuple(p))
+            for chars, p in columns.items()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledTemplate es inmutable.")
+
+    @property
+    def entropy_bits(self) -> float:
+        """Entropía exacta en bits de una contraseña generada con la plantilla."""
+        return math.log2(self.keyspace)
+
+    def sample(self, stream, count: int) -> List[str]:
+        """Genera count contraseñas uniformes entre las que describe la plantilla."""
+        block = self.sample_bytes(stream, count)
+        text = block.decode("ascii")
+        wipe(block)
+        length = self.length
+        return [text[i:i + length] for i in range(0, len(text), length)]
+
+    def sample_bytes(self, stream, count: int) -> bytearray:
+        """Como sample(), pero devuelve las count contraseñas seguidas en un único bytearray.
+
+        Para cada alfabeto se leen de una vez los caracteres de todas sus
+        posiciones en todo el lote, y cada posición se copia como una
+        columna con una sola asignación.
+        """
+        length = self.length
+        out = bytearray(count * length)
+        for alphabet, columns in self._groups:
+            if len(alphabet) == 1:
+                fill = alphabet.chars * count
+                for p in columns:
+                    out[p::length] = fill
+                continue
+            chars = alphabet.sample(stream, count * len(columns))
+            view = memoryview(chars)
+            for j, p in enumerate(columns):
+                out[p::length] = view[j * count:(j + 1) * count]
+            view.release()
+            wipe(chars)
+        return out
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> CompiledTemplate:
+    """Devuelve la plantilla compilada (y memorizada)."""
+    return CompiledTemplate(template)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Muestra la longitud, el número de contraseñas posibles y la entropía de una plantilla."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.template", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("template", help="plantilla, por ejemplo 'Aaaa-9999-$$'")
+    args = parser.parse_args(argv)
+    try:
+        compiled = compile_template(args.template)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Longitud:      {compiled.length}")
+    print(f"Combinaciones: {compiled.keyspace}")
+    print(f"Entropía:      {compiled.entropy_bits:.1f} bits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
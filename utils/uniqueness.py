@@ -0,0 +1,70 @@
+"""Filtro de duplicados con memoria acotada para las generaciones masivas.
+
+En lugar de guardar cada contraseña en un set, se guarda un resumen de 8 bytes
+(BLAKE2b con una clave aleatoria por filtro) en una tabla hash compacta de
+direccionamiento abierto. Dos contraseñas distintas con el mismo resumen se
+tratan como repetidas: la segunda se descarta y se genera otra, así que la
+salida nunca contiene duplicados.
+"""
+import os
+from hashlib import blake2b
+from typing import Iterable, Iterator, Union
+
+# Fracción máxima de la tabla ocupada antes de considerarla llena
+MAX_LOAD_FACTOR = 0.75
+_DIGEST_SIZE = 8
+
+
+class UniqueFilter:
+    """Conjunto aproximado por resúmenes de 64 bits, sin falsos negativos."""
+
+    __slots__ = ("capacity", "_key", "_table", "_slots", "_mask", "_count")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("La capacidad del filtro debe ser mayor que 0.")
+        self.capacity = capacity
+        size = 1
+        while size * MAX_LOAD_FACTOR < capacity:
+            size *= 2
+        self._key = os.urandom(16)
+        self._table = bytearray(size * _DIGEST_SIZE)
+        self._slots = memoryview(self._table).cast("Q")
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes ocupados por la tabla."""
+        return len(self._table)
+
+    def add(self, item: Union[str, bytes]) -> bool:
+        """Añade item y devuelve True si no estaba ya en el filtro."""
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        digest = int.from_bytes(blake2b(item, digest_size=_DIGEST_SIZE, key=self._key).digest(),
+                                "little")
+        # El 0 marca las posiciones vacías
+        digest = digest or 1
+        slots, mask = self._slots, self._mask
+        slot = digest & mask
+        while True:
+            current = slots[slot]
+            if current == 0:
+                break
+            if current == digest:
+                return False
+            slot = (slot + 1) & mask
+        if self._count >= self.capacity:
+            raise OverflowError("El filtro de unicidad está lleno.")
+        slots[slot] = digest
+        self._count += 1
+        return True
+
+    def filter_new(self, items: Iterable[str]) -> Iterator[str]:
+        """Devuelve, en orden, los elementos que no se habían visto antes."""
+        add = self.add
+        return (item for item in items if add(item))
@@ -0,0 +1,146 @@
+"""Listas de palabras proyectadas en memoria con un índice de desplazamientos.
+
+El índice se guarda junto a la lista (RUTA.idx) y contiene el inicio y el fin
+de cada palabra, de modo que cualquier palabra se lee en O(1) sin cargar la
+lista en cadenas de Python. Se reconstruye solo si la lista cambia.
+"""
+import math
+import mmap
+import os
+import struct
+from array import array
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"PWIX"
+_INDEX_VERSION = 1
+# magia, versión, número de palabras, tamaño y fecha de la lista indexada; el
+# índice usa el orden de bytes de la máquina y se reconstruye si no coincide
+_INDEX_HEADER = struct.Struct("=4sIQQQ")
+
+
+def _scan_words(data) -> Iterator[Tuple[int, int]]:
+    """Recorre las líneas y devuelve (inicio, fin) de la palabra de cada una.
+
+    Admite listas con una palabra por línea y el formato diceware
+    "11111<tab>palabra", del que se toma el último campo.
+    """
+    start = 0
+    size = len(data)
+    while start < size:
+        end = data.find(b"\n", start)
+        if end < 0:
+            end = size
+        line_end = end
+        while line_end > start and data[line_end - 1] in b"\r \t":
+            line_end -= 1
+        word_start = max(data.rfind(b"\t", start, line_end), data.rfind(b" ", start, line_end)) + 1
+        word_start = max(word_start, start)
+        if line_end > word_start:
+            yield word_start, line_end
+        start = end + 1
+
+
+def _word_offsets(path: str) -> array:
+    """Desplazamientos (inicio, fin) de cada palabra, intercalados."""
+    offsets = array("Q")
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in _scan_words(data):
+                offsets.append(start)
+                offsets.append(end)
+    if not offsets:
+        raise ValueError("La lista de palabras está vacía.")
+    return offsets
+
+
+def build_index(path: str, index_path: Optional[str] = None) -> str:
+    """Construye el índice de desplazamientos de la lista y devuelve su ruta."""
+    index_path = index_path or path + INDEX_SUFFIX
+    stat = os.stat(path)
+    offsets = _word_offsets(path)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, len(offsets) // 2,
+                                   stat.st_size, stat.st_mtime_ns))
+        offsets.tofile(f)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+class MappedWordlist:
+    """Lista de palabras proyectada en memoria con acceso O(1) por posición."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        stat = os.stat(path)
+        if stat.st_size == 0:
+            raise ValueError("La lista de palabras está vacía.")
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index = None
+        try:
+            if not self._index_is_current(stat):
+                build_index(path, self.index_path)
+        except OSError:
+            # Directorio de solo lectura: el índice se mantiene en memoria
+            offsets = _word_offsets(path)
+            self._offsets = memoryview(offsets)
+            self._count = len(offsets) // 2
+            return
+        with open(self.index_path, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, count, _, _ = _INDEX_HEADER.unpack_from(self._index)
+        self._offsets = memoryview(self._index)[_INDEX_HEADER.size:].cast("Q")
+        self._count = count
+
+    def _index_is_current(self, stat: os.stat_result) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+        except OSError:
+            return False
+        if len(header) != _INDEX_HEADER.size:
+            return False
+        magic, version, count, size, mtime = _INDEX_HEADER.unpack(header)
+        return (magic == _INDEX_MAGIC and version == _INDEX_VERSION
+                and size == stat.st_size and mtime == stat.st_mtime_ns
+                and os.path.getsize(self.index_path) == _INDEX_HEADER.size + count * 16)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        return self.word_bytes(i).decode("utf-8")
+
+    def word_bytes(self, i: int) -> bytes:
+        """Palabra i en UTF-8, tal como aparece en el archivo."""
+        if not 0 <= i < self._count:
+            raise IndexError("Índice de palabra fuera de rango.")
+        return self._data[self._offsets[2 * i]:self._offsets[2 * i + 1]]
+
+    @property
+    def bits_per_word(self) -> float:
+        """Entropía en bits de una palabra elegida uniformemente."""
+        return math.log2(self._count) if self._count > 1 else 0.0
+
+    def close(self) -> None:
+        """Libera las proyecciones en memoria."""
+        self._offsets.release()
+        if self._index is not None:
+            self._index.close()
+        self._data.close()
+
+    def __enter__(self) -> "MappedWordlist":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=4)
+def open_wordlist(path: str) -> MappedWordlist:
+    """Devuelve la lista proyectada para path, abriéndola una sola vez."""
+    return MappedWordlist(path)